@@ -0,0 +1,111 @@
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.ai_engine.llm_client import InstrumentedLLMClient
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchJobError(RuntimeError):
+    """Raised when a batch job ends without results or does not finish in time"""
+
+
+class LLMBatchRunner:
+    """
+    Runs chat completion requests through an OpenAI-compatible Batch API
+    Requests are written to JSONL files (at most ``max_requests_per_file`` lines each),
+    submitted, polled until they finish, and their results merged back by custom id.
+    """
+
+    def __init__(self, llm: InstrumentedLLMClient, poll_interval: float = 30.0,
+                 timeout: float = 24 * 3600, max_requests_per_file: int = 50000,
+                 completion_window: str = "24h"):
+        self.llm = llm
+        self.client = llm.client
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.max_requests_per_file = max_requests_per_file
+        self.completion_window = completion_window
+
+    @staticmethod
+    def build_batch_file(requests: Sequence[Tuple[str, Dict]]) -> bytes:
+        """Serialize (custom_id, chat completion params) pairs into batch JSONL"""
+        lines = (json.dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body})
+                 for custom_id, body in requests)
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def submit(self, requests: Sequence[Tuple[str, Dict]], call_site: str):
+        """Upload one batch file and create the batch job"""
+        uploaded = self.client.files.create(
+            file=(f"{self.llm.component}.{call_site}.jsonl", self.build_batch_file(requests)),
+            purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id, endpoint=BATCH_ENDPOINT, completion_window=self.completion_window,
+            metadata={"call_site": f"{self.llm.component}.{call_site}"})
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} requests ({call_site})")
+        return batch
+
+    def wait(self, batch_ids: List[str]) -> List:
+        """Poll until every batch reaches a terminal status"""
+        deadline = time.monotonic() + self.timeout
+        pending = list(batch_ids)
+        finished = {}
+        while pending:
+            for batch_id in list(pending):
+                batch = self.client.batches.retrieve(batch_id)
+                if batch.status in TERMINAL_STATUSES:
+                    finished[batch_id] = batch
+                    pending.remove(batch_id)
+            if not pending:
+                break
+            if time.monotonic() > deadline:
+                raise BatchJobError(f"Batches did not finish within {self.timeout}s: {pending}")
+            time.sleep(self.poll_interval)
+        return [finished[batch_id] for batch_id in batch_ids]
+
+    def _read_results(self, file_id: Optional[str]) -> List[Dict]:
+        if not file_id:
+            return []
+        text = self.client.files.content(file_id).text
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    def run(self, requests: Sequence[Tuple[str, Dict]], call_site: str) -> Dict[str, Optional[str]]:
+        """
+        Run requests as batch jobs
+        Returns: {custom_id: completion text}, with None for requests that failed
+        """
+        if not requests:
+            return {}
+        start = time.perf_counter()
+        models = {custom_id: body.get("model", "") for custom_id, body in requests}
+        chunks = [requests[i:i + self.max_requests_per_file]
+                  for i in range(0, len(requests), self.max_requests_per_file)]
+        batches = self.wait([self.submit(chunk, call_site).id for chunk in chunks])
+
+        results: Dict[str, Optional[str]] = dict.fromkeys(models)
+        completed = []
+        for batch in batches:
+            if batch.status != "completed":
+                logger.warning(f"Batch {batch.id} ended with status {batch.status}")
+            for line in self._read_results(batch.output_file_id) + self._read_results(batch.error_file_id):
+                response = line.get("response") or {}
+                body = response.get("body") or {}
+                if line.get("error") or response.get("status_code") != 200 or not body.get("choices"):
+                    continue
+                results[line["custom_id"]] = body["choices"][0]["message"]["content"]
+                completed.append((line["custom_id"], body.get("usage")))
+
+        # Batch latency is amortized over the requests it carried
+        latency = (time.perf_counter() - start) / len(requests)
+        batch_site = f"{call_site}.batch"
+        for custom_id, usage in completed:
+            self.llm.record(batch_site, models[custom_id], latency, usage)
+        for custom_id in (cid for cid, text in results.items() if text is None):
+            self.llm.record(batch_site, models[custom_id], latency, None, success=False)
+        logger.info(f"Batch {call_site}: {len(completed)}/{len(requests)} requests succeeded")
+        return results
@@ -0,0 +1,79 @@
+import re
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Multi-pattern substring matcher
+    Finds every keyword that occurs anywhere in a text with a single regex pass,
+    instead of one ``keyword in text`` test per keyword.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = frozenset(k for k in keywords if k)
+        # Longest alternative first so each position reports its longest match;
+        # every shorter keyword matching at that position is a prefix of it.
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        self._pattern = re.compile("(?=(" + "|".join(re.escape(k) for k in ordered) + "))") if ordered else None
+        self._prefixes = {
+            keyword: frozenset(other for other in self.keywords if keyword.startswith(other))
+            for keyword in self.keywords
+        }
+
+    def find_all(self, text: str) -> FrozenSet[str]:
+        """Return the set of keywords occurring in ``text``"""
+        if not self._pattern or not text:
+            return frozenset()
+        found = set()
+        for match in self._pattern.finditer(text):
+            found |= self._prefixes[match.group(1)]
+        return frozenset(found)
+
+
+class ICPMatcher:
+    """ICP criteria compiled into keyword sets and one shared automaton"""
+
+    def __init__(self, icp_criteria: Dict, graphics_keywords: List[str], innovation_keywords: List[str],
+                 cache_size: int = 10000):
+        self.signature = self.signature_of(icp_criteria)
+        self.industry_words = self._phrase_words(icp_criteria.get("target_industries", []))
+        self.focus_words = self._phrase_words(icp_criteria.get("technology_focus", []))
+        self.graphics_words = frozenset(graphics_keywords)
+        self.innovation_words = frozenset(innovation_keywords)
+        self.automaton = KeywordAutomaton(
+            self.industry_words | self.focus_words | self.graphics_words | self.innovation_words)
+        self.cache_size = cache_size
+        self._cache: Dict[str, FrozenSet[str]] = {}
+
+    @staticmethod
+    def signature_of(icp_criteria: Dict) -> Tuple:
+        """Snapshot of the criteria the matcher is compiled from (used to detect changes)"""
+        return (tuple(icp_criteria.get("target_industries", [])),
+                tuple(icp_criteria.get("technology_focus", [])))
+
+    @staticmethod
+    def _phrase_words(phrases: List[str]) -> FrozenSet[str]:
+        return frozenset(word for phrase in phrases for word in phrase.lower().split())
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """Keywords (from any ICP list) occurring in the lowercased text, memoized"""
+        found = self._cache.get(text)
+        if found is None:
+            found = self.automaton.find_all(text.lower())
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[text] = found
+        return found
+
+    def industry_level(self, industry: str) -> int:
+        """2 = target industry match, 1 = graphics keyword match, 0 = no match"""
+        found = self.scan(industry)
+        if found & self.industry_words:
+            return 2
+        return 1 if found & self.graphics_words else 0
+
+    def is_focus_technology(self, technology: str) -> bool:
+        return bool(self.scan(technology) & self.focus_words)
+
+    def is_innovation_news(self, news: str) -> bool:
+        return bool(self.scan(news) & self.innovation_words)
@@ -1,26 +1,45 @@
 import openai
 import os
 import json
+import hashlib
 import logging
 from typing import List, Dict, Tuple, Optional
 from dataclasses import asdict
 import time
 import re
 import sys
+import numpy as np
+import pandas as pd
 
 # Import our models
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.ai_engine.batch_runner import LLMBatchRunner
+from backend.ai_engine.icp_matcher import ICPMatcher
+from backend.ai_engine.llm_client import InstrumentedLLMClient
+from backend.scoring import vectorized
 from database.models import Company, Event, Stakeholder, Lead
 
+# Keywords used by rule-based scoring (shared by the per-company and batch scorers)
+GRAPHICS_KEYWORDS = ['graphics', 'printing', 'visual', 'display', 'sign']
+INNOVATION_KEYWORDS = ['launch', 'new', 'expand', 'partnership', 'investment', 'growth']
+# Rationale used when the AI assessment failed and only rule-based scoring applies
+AI_UNAVAILABLE_RATIONALE = "AI analysis unavailable, using rule-based scoring"
+# Model and prompt revision of the qualification request; bump the version whenever
+# the prompt changes so cached qualifications from the old prompt are not reused
+QUALIFICATION_MODEL = "gpt-4"
+QUALIFICATION_PROMPT_VERSION = 1
+
 class LeadQualifier:
     def __init__(self, api_key: str = None):
         self.logger = self._setup_logging()
-        # Initialize OpenAI client
+        # Initialize OpenAI client (retries are handled by the instrumented wrapper)
         if api_key:
-            self.client = openai.OpenAI(api_key=api_key)
+            self.client = openai.OpenAI(api_key=api_key, max_retries=0)
         else:
             # Try to get from environment
-            self.client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            self.client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'), max_retries=0)
+        self.llm = InstrumentedLLMClient(self.client, component="lead_qualifier")
 
         # DuPont Tedlar ICP criteria
         self.icp_criteria = {
@@ -46,6 +65,30 @@ class LeadQualifier:
         logging.basicConfig(level=logging.INFO)
         return logging.getLogger(__name__)
 
+    @property
+    def icp_criteria(self) -> Dict:
+        return self._icp_criteria
+
+    @icp_criteria.setter
+    def icp_criteria(self, criteria: Dict):
+        self._icp_criteria = criteria
+        self._icp_matcher = ICPMatcher(criteria, GRAPHICS_KEYWORDS, INNOVATION_KEYWORDS)
+
+    @property
+    def icp_matcher(self) -> ICPMatcher:
+        """Compiled ICP matcher, recompiled if the criteria lists were modified in place"""
+        if self._icp_matcher.signature != ICPMatcher.signature_of(self._icp_criteria):
+            self._icp_matcher = ICPMatcher(self._icp_criteria, GRAPHICS_KEYWORDS, INNOVATION_KEYWORDS)
+        return self._icp_matcher
+
+    @property
+    def qualification_signature(self) -> str:
+        """Hash of the ICP criteria, model and prompt version qualifications depend on"""
+        payload = {"icp_criteria": self._icp_criteria, "model": QUALIFICATION_MODEL,
+                   "prompt_version": QUALIFICATION_PROMPT_VERSION}
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
     def qualify_company(self, company: Company, event: Event = None) -> Tuple[float, str]:
         """
         Qualify a company using AI analysis and rule-based scoring
@@ -56,35 +99,36 @@ class LeadQualifier:
             base_score, base_rationale = self._calculate_base_score(company)
             # Enhanced AI analysis
             ai_score, ai_rationale = self._ai_qualify_company(company, event)
-            # Combine scores (weighted average)
-            final_score = (base_score * 0.4) + (ai_score * 0.6)
-            # Combine rationales
-            final_rationale = f"{ai_rationale}\n\nScoring Details: {base_rationale}"
-            return min(final_score, 1.0), final_rationale
+            return self._combine_scores(base_score, base_rationale, ai_score, ai_rationale)
         except Exception as e:
             self.logger.error(f"Error qualifying company {company.name}: {e}")
             # Fallback to rule-based only
             return self._calculate_base_score(company)
 
+    def _combine_scores(self, base_score: float, base_rationale: str,
+                        ai_score: float, ai_rationale: str) -> Tuple[float, str]:
+        """Weighted average of rule-based and AI scores, with combined rationales"""
+        final_score = (base_score * 0.4) + (ai_score * 0.6)
+        final_rationale = f"{ai_rationale}\n\nScoring Details: {base_rationale}"
+        return min(final_score, 1.0), final_rationale
+
     def _calculate_base_score(self, company: Company) -> Tuple[float, str]:
         """Rule-based qualification scoring"""
         score = 0.0
         rationale_points = []
+        matcher = self.icp_matcher
 
         # Industry fit (25% of score)
         industry_score = 0.0
         if company.industry:
-            for target_industry in self.icp_criteria["target_industries"]:
-                if any(word in company.industry.lower() for word in target_industry.lower().split()):
-                    industry_score = 0.25
-                    rationale_points.append(f"Strong industry alignment ({company.industry})")
-                    break
-            if industry_score == 0:
+            industry_level = matcher.industry_level(company.industry)
+            if industry_level == 2:
+                industry_score = 0.25
+                rationale_points.append(f"Strong industry alignment ({company.industry})")
+            elif industry_level == 1:
                 # Partial matches
-                graphics_keywords = ['graphics', 'printing', 'visual', 'display', 'sign']
-                if any(word in company.industry.lower() for word in graphics_keywords):
-                    industry_score = 0.15
-                    rationale_points.append(f"Moderate industry relevance ({company.industry})")
+                industry_score = 0.15
+                rationale_points.append(f"Moderate industry relevance ({company.industry})")
         score += industry_score
 
         # Company size (20% of score)
@@ -126,12 +170,7 @@ class LeadQualifier:
         # Technology alignment (15% of score)
         tech_score = 0.0
         if company.technologies:
-            relevant_tech_count = 0
-            for tech in company.technologies:
-                for focus_area in self.icp_criteria["technology_focus"]:
-                    if any(word in tech.lower() for word in focus_area.lower().split()):
-                        relevant_tech_count += 1
-                        break
+            relevant_tech_count = sum(1 for tech in company.technologies if matcher.is_focus_technology(tech))
             if relevant_tech_count > 0:
                 tech_score = min(relevant_tech_count * 0.05, 0.15)
                 rationale_points.append(f"Technology alignment: {relevant_tech_count} relevant technologies")
@@ -140,11 +179,7 @@ class LeadQualifier:
         # Market activity (10% of score)
         activity_score = 0.0
         if company.recent_news:
-            innovation_keywords = ['launch', 'new', 'expand', 'partnership', 'investment', 'growth']
-            relevant_news = 0
-            for news in company.recent_news:
-                if any(keyword in news.lower() for keyword in innovation_keywords):
-                    relevant_news += 1
+            relevant_news = sum(1 for news in company.recent_news if matcher.is_innovation_news(news))
             if relevant_news > 0:
                 activity_score = min(relevant_news * 0.03, 0.10)
                 rationale_points.append(f"Recent market activity: {relevant_news} relevant developments")
@@ -165,10 +200,89 @@ class LeadQualifier:
         rationale = ". ".join(rationale_points)
         return score, rationale
 
-    def _ai_qualify_company(self, company: Company, event: Event = None) -> Tuple[float, str]:
-        """Use AI to analyze company qualification with enhanced context"""
-        try:
-            dupont_context = """
+    def score_companies_batch(self, companies) -> pd.DataFrame:
+        """
+        Vectorized equivalent of _calculate_base_score for a whole batch
+        Args:
+            companies: DataFrame, dict of columns or list of company dicts
+        Returns: DataFrame with 'score' and 'rationale' columns, one row per company
+        """
+        df = vectorized.to_frame(companies)
+        matcher = self.icp_matcher
+        industry_level = matcher.industry_level
+
+        def size_level(size: str) -> int:
+            # 3 = ideal, 2 = good, 1 = adequate, 0 = unknown
+            if 'large' in size.lower():
+                return 3
+            if 'medium' in size.lower():
+                return 2
+            return 1 if any(num in size for num in ['100+', '500+', '1000+']) else 0
+
+        def revenue_level(revenue: str) -> int:
+            # 5 = billions, 1-4 = millions by amount band, 0 = unknown
+            revenue_lower = revenue.lower()
+            if '$' not in revenue_lower:
+                return 0
+            if 'b' in revenue_lower:
+                return 5
+            if 'm' not in revenue_lower:
+                return 0
+            numbers = re.findall(r'\d+', revenue)
+            amount = int(numbers[0]) if numbers else 0
+            return 4 if amount >= 100 else 3 if amount >= 50 else 2 if amount >= 10 else 1
+
+        industry_codes, industries = vectorized.factorize_text(df, 'industry')
+        size_codes, sizes = vectorized.factorize_text(df, 'size')
+        revenue_codes, revenues = vectorized.factorize_text(df, 'revenue')
+        industry_levels = vectorized.evaluate(industry_codes, industries, industry_level, dtype=np.int8)
+        size_levels = vectorized.evaluate(size_codes, sizes, size_level, dtype=np.int8)
+        revenue_levels = vectorized.evaluate(revenue_codes, revenues, revenue_level, dtype=np.int8)
+        tech_count = vectorized.count_list_matches(df, 'technologies', matcher.is_focus_technology)
+        news_count = vectorized.count_list_matches(df, 'recent_news', matcher.is_innovation_news)
+        has_linkedin = vectorized.truthy(df, 'linkedin_url')
+
+        presence_score = np.where(vectorized.truthy(df, 'website'), 0.03, 0.0)
+        presence_score = presence_score + np.where(has_linkedin, 0.07, 0.0)
+        score = (0.0
+                 + np.array([0.0, 0.15, 0.25])[industry_levels]
+                 + np.array([0.0, 0.12, 0.15, 0.20])[size_levels]
+                 + np.array([0.0, 0.0, 0.12, 0.15, 0.18, 0.20])[revenue_levels]
+                 + np.minimum(tech_count * 0.05, 0.15)
+                 + np.minimum(news_count * 0.03, 0.10)
+                 + presence_score)
+
+        def build_rationale(industry_code, size_code, revenue_code, techs, news, linkedin) -> str:
+            points = []
+            industry_text = industries[industry_code]
+            points.append({2: f"Strong industry alignment ({industry_text})",
+                           1: f"Moderate industry relevance ({industry_text})"}.get(industry_level(industry_text)))
+            size_text = sizes[size_code]
+            points.append({3: f"Ideal company size ({size_text})", 2: f"Good company size ({size_text})",
+                           1: f"Adequate company size ({size_text})"}.get(size_level(size_text)))
+            revenue_text = revenues[revenue_code]
+            level = revenue_level(revenue_text)
+            if level == 5:
+                points.append(f"High revenue potential ({revenue_text})")
+            elif level:
+                points.append(f"Revenue meets threshold ({revenue_text})")
+            if techs:
+                points.append(f"Technology alignment: {techs} relevant technologies")
+            if news:
+                points.append(f"Recent market activity: {news} relevant developments")
+            if linkedin:
+                points.append("Strong digital presence")
+            points = [point for point in points if point]
+            return ". ".join(points) if points else "Limited qualification data available"
+
+        rationale = vectorized.evaluate_combinations(
+            [industry_codes, size_codes, revenue_codes, tech_count, news_count, has_linkedin.astype(np.intp)],
+            build_rationale, dtype=object)
+        return pd.DataFrame({"score": score, "rationale": rationale}, index=df.index)
+
+    def _qualification_request(self, company: Company, event: Event = None) -> Dict:
+        """Chat completion parameters for the AI qualification of a company"""
+        dupont_context = """
 DuPont Tedlar is a high-performance protective film used in graphics and signage applications.
 Key value propositions:
 - Superior weather resistance and UV protection
@@ -183,25 +297,25 @@ Target customers are companies that:
 - Value premium performance over low cost
 """
 
-            # Prepare company data
-            company_data = {
-                "name": company.name,
-                "industry": company.industry,
-                "size": company.size,
-                "revenue": company.revenue,
-                "location": company.location,
-                "description": company.description,
-                "technologies": company.technologies,
-                "recent_news": company.recent_news
-            }
-            event_context = ""
-            if event:
-                event_context = f"""
+        # Prepare company data
+        company_data = {
+            "name": company.name,
+            "industry": company.industry,
+            "size": company.size,
+            "revenue": company.revenue,
+            "location": company.location,
+            "description": company.description,
+            "technologies": company.technologies,
+            "recent_news": company.recent_news
+        }
+        event_context = ""
+        if event:
+            event_context = f"""
 Event Context: This company is being evaluated for outreach at {event.name}
 ({event.date}) in {event.location}. Event focus: {event.industry}.
 """
 
-            prompt = f"""
+        prompt = f"""
 {dupont_context}
 {event_context}
 Analyze this company for qualification as a lead for DuPont Tedlar's Graphics & Signage team:
@@ -222,41 +336,47 @@ Format your response as JSON:
 "rationale": "Detailed explanation of qualification assessment..."
 }}
 """
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a B2B sales qualification expert specializing in the graphics and signage industry. Provide accurate, data-driven assessments."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=500
-            )
-            # Parse response
-            response_text = response.choices[0].message.content
+        return {
+            "model": QUALIFICATION_MODEL,
+            "messages": [
+                {"role": "system", "content": "You are a B2B sales qualification expert specializing in the graphics and signage industry. Provide accurate, data-driven assessments."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 500
+        }
+
+    def _parse_qualification_response(self, response_text: str) -> Tuple[float, str]:
+        """Extract (score, rationale) from an AI qualification response"""
+        try:
             # Try to extract JSON
             json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
             if json_match:
                 result = json.loads(json_match.group())
                 return float(result.get("score", 0.5)), result.get("rationale", "AI analysis completed")
-            else:
-                # Fallback parsing
-                lines = response_text.split('\n')
-                score = 0.5
-                rationale = response_text
-                for line in lines:
-                    if 'score' in line.lower() and any(char.isdigit() for char in line):
-                        numbers = re.findall(r'\d+\.?\d*', line)
-                        if numbers:
-                            score = min(float(numbers[0]), 1.0)
-                            break
-                return score, rationale
-
-        except json.JSONDecodeError:
-            # Fallback to simple parsing
+            # Fallback parsing
+            lines = response_text.split('\n')
+            score = 0.5
+            rationale = response_text
+            for line in lines:
+                if 'score' in line.lower() and any(char.isdigit() for char in line):
+                    numbers = re.findall(r'\d+\.?\d*', line)
+                    if numbers:
+                        score = min(float(numbers[0]), 1.0)
+                        break
+            return score, rationale
+        except (ValueError, TypeError):
+            # Unparseable JSON or a score that is not a number (e.g. "high", null): neutral score
             return 0.5, response_text
+
+    def _ai_qualify_company(self, company: Company, event: Event = None) -> Tuple[float, str]:
+        """Use AI to analyze company qualification with enhanced context"""
+        try:
+            response = self.llm.chat_completion("qualify_company", **self._qualification_request(company, event))
+            return self._parse_qualification_response(response.choices[0].message.content)
         except Exception as e:
             self.logger.warning(f"AI qualification failed for {company.name}: {e}")
-            return 0.5, "AI analysis unavailable, using rule-based scoring"
+            return 0.5, AI_UNAVAILABLE_RATIONALE
 
     def identify_decision_makers(self, company: Company) -> List[Stakeholder]:
         """Identify likely decision makers at the company"""
@@ -282,7 +402,8 @@ Format as JSON array:
 ]
 """
 
-            response = self.client.chat.completions.create(
+            response = self.llm.chat_completion(
+                "identify_decision_makers",
                 model="gpt-4",
                 messages=[
                     {
@@ -324,22 +445,25 @@ Format as JSON array:
             self.logger.warning(f"Failed to identify decision makers for {company.name}: {e}")
             return []
 
+    def _company_from_dict(self, company_dict: Dict) -> Company:
+        return Company(
+            name=company_dict.get("name", ""),
+            website=company_dict.get("website", ""),
+            industry=company_dict.get("industry", ""),
+            size=company_dict.get("size", ""),
+            revenue=company_dict.get("revenue", ""),
+            location=company_dict.get("location", ""),
+            description=company_dict.get("description", ""),
+            linkedin_url=company_dict.get("linkedin_url", ""),
+            technologies=company_dict.get("technologies", []),
+            recent_news=company_dict.get("recent_news", []),
+            key_contacts=company_dict.get("key_contacts", [])
+        )
+
     def qualify_lead(self, company_dict: Dict, event: Optional[Event] = None) -> Dict:
         """Convert dict to Company, qualify it, return score/rationale/is_qualified"""
         try:
-            company = Company(
-                name=company_dict.get("name", ""),
-                website=company_dict.get("website", ""),
-                industry=company_dict.get("industry", ""),
-                size=company_dict.get("size", ""),
-                revenue=company_dict.get("revenue", ""),
-                location=company_dict.get("location", ""),
-                description=company_dict.get("description", ""),
-                linkedin_url=company_dict.get("linkedin_url", ""),
-                technologies=company_dict.get("technologies", []),
-                recent_news=company_dict.get("recent_news", []),
-                key_contacts=company_dict.get("key_contacts", [])
-            )
+            company = self._company_from_dict(company_dict)
 
             score, rationale = self.qualify_company(company, event)
 
@@ -347,7 +471,8 @@ Format as JSON array:
                 "score": score,
                 "rationale": rationale,
                 "is_qualified": score >= 0.7,
-                "industry_alignment": company.industry
+                "industry_alignment": company.industry,
+                "ai_assessed": not rationale.startswith(AI_UNAVAILABLE_RATIONALE)
             }
 
         except Exception as e:
@@ -356,5 +481,43 @@ Format as JSON array:
                 "score": 0.0,
                 "rationale": "Error during qualification",
                 "is_qualified": False,
-                "industry_alignment": ""
-            }
\ No newline at end of file
+                "industry_alignment": "",
+                "ai_assessed": False
+            }
+
+    def qualify_leads_batch(self, company_dicts: List[Dict], events: Optional[List[Optional[Event]]] = None,
+                            runner: Optional[LLMBatchRunner] = None) -> List[Dict]:
+        """
+        Batch-mode equivalent of qualify_lead for bulk (e.g. nightly) runs
+        All AI qualification prompts are submitted as one batch job; results are
+        merged back by custom id and combined with the vectorized rule-based scores.
+        Returns: one qualify_lead-style dict per company, in input order
+        """
+        if not company_dicts:
+            return []
+        runner = runner or LLMBatchRunner(self.llm)
+        events = events or [None] * len(company_dicts)
+        companies = [self._company_from_dict(company_dict) for company_dict in company_dicts]
+        base = self.score_companies_batch(company_dicts)
+        responses = runner.run(
+            [(f"company-{i}", self._qualification_request(company, event))
+             for i, (company, event) in enumerate(zip(companies, events))],
+            call_site="qualify_company")
+
+        results = []
+        for i, company in enumerate(companies):
+            response_text = responses.get(f"company-{i}")
+            if response_text is None:
+                ai_score, ai_rationale = 0.5, AI_UNAVAILABLE_RATIONALE
+            else:
+                ai_score, ai_rationale = self._parse_qualification_response(response_text)
+            score, rationale = self._combine_scores(
+                float(base["score"].iat[i]), base["rationale"].iat[i], ai_score, ai_rationale)
+            results.append({
+                "score": score,
+                "rationale": rationale,
+                "is_qualified": score >= 0.7,
+                "industry_alignment": company.industry,
+                "ai_assessed": response_text is not None
+            })
+        return results
@@ -0,0 +1,168 @@
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import openai
+
+from backend.monitoring.metrics import REGISTRY, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# USD per 1K tokens: (prompt, completion)
+MODEL_PRICING = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate the USD cost of a call from the pricing table (0.0 for unknown models)"""
+    prompt_price, completion_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+
+class LLMUsageSummary:
+    """Accumulates LLM calls made while a job is being tracked"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.latency_seconds = 0.0
+        self.by_call_site: Dict[str, Dict] = {}
+
+    def record(self, call_site: str, latency: float, prompt_tokens: int, completion_tokens: int,
+               cost: float, retries: int, success: bool):
+        with self._lock:
+            self.calls += 1
+            self.errors += 0 if success else 1
+            self.retries += retries
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost_usd += cost
+            self.latency_seconds += latency
+            site = self.by_call_site.setdefault(call_site, {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0, "latency_seconds": 0.0
+            })
+            site["calls"] += 1
+            site["prompt_tokens"] += prompt_tokens
+            site["completion_tokens"] += completion_tokens
+            site["cost_usd"] += cost
+            site["latency_seconds"] += latency
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "retries": self.retries,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "estimated_cost_usd": round(self.cost_usd, 6),
+                "total_latency_seconds": round(self.latency_seconds, 3),
+                "by_call_site": {
+                    site: {**values, "cost_usd": round(values["cost_usd"], 6),
+                           "latency_seconds": round(values["latency_seconds"], 3)}
+                    for site, values in self.by_call_site.items()
+                },
+            }
+
+
+_current_usage: contextvars.ContextVar[Optional[LLMUsageSummary]] = contextvars.ContextVar(
+    "llm_usage", default=None)
+
+
+@contextmanager
+def track_llm_usage() -> Iterator[LLMUsageSummary]:
+    """Collect every instrumented LLM call made inside the block (and tasks/threads it spawns)"""
+    summary = LLMUsageSummary()
+    token = _current_usage.set(summary)
+    try:
+        yield summary
+    finally:
+        _current_usage.reset(token)
+
+
+class InstrumentedLLMClient:
+    """
+    Wrapper around an OpenAI client used by every LLM call site
+    Retries transient failures and records latency, token usage, model and retry
+    count as process metrics and into the current job's usage summary.
+    """
+
+    RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+    def __init__(self, client, component: str, max_retries: int = 2, backoff_seconds: float = 0.5,
+                 registry: MetricsRegistry = REGISTRY):
+        self.client = client
+        self.component = component
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.latency = registry.histogram(
+            "llm_request_duration_seconds", "Latency of LLM API calls", ["model", "call_site", "status"])
+        self.requests = registry.counter(
+            "llm_requests_total", "LLM API calls", ["model", "call_site", "status"])
+        self.tokens = registry.counter(
+            "llm_tokens_total", "Tokens consumed by LLM API calls", ["model", "call_site", "type"])
+        self.retries = registry.counter(
+            "llm_retries_total", "Retried LLM API attempts", ["model", "call_site"])
+        self.cost = registry.counter(
+            "llm_estimated_cost_usd_total", "Estimated LLM spend in USD", ["model", "call_site"])
+
+    def chat_completion(self, call_site: str, **kwargs):
+        """Call chat.completions.create with retries and instrumentation"""
+        model = kwargs.get("model", "")
+        attempt = 0
+        start = time.perf_counter()
+        while True:
+            try:
+                response = self.client.chat.completions.create(**kwargs)
+            except self.RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    self.record(call_site, model, time.perf_counter() - start, None, attempt, success=False)
+                    raise
+                attempt += 1
+                logger.warning(f"Retrying {self.component}.{call_site} ({attempt}/{self.max_retries}): {e}")
+                time.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+                continue
+            except Exception:
+                self.record(call_site, model, time.perf_counter() - start, None, attempt, success=False)
+                raise
+            self.record(call_site, model, time.perf_counter() - start, getattr(response, "usage", None), attempt)
+            return response
+
+    def record(self, call_site: str, model: str, latency: float, usage, retries: int = 0, success: bool = True):
+        """Record one completed (or failed) call; ``usage`` may be an SDK object or a dict"""
+        site = f"{self.component}.{call_site}"
+        status = "success" if success else "error"
+        prompt_tokens = _usage_field(usage, "prompt_tokens")
+        completion_tokens = _usage_field(usage, "completion_tokens")
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+
+        self.latency.observe(latency, model=model, call_site=site, status=status)
+        self.requests.inc(model=model, call_site=site, status=status)
+        self.tokens.inc(prompt_tokens, model=model, call_site=site, type="prompt")
+        self.tokens.inc(completion_tokens, model=model, call_site=site, type="completion")
+        self.cost.inc(cost, model=model, call_site=site)
+        if retries:
+            self.retries.inc(retries, model=model, call_site=site)
+
+        summary = _current_usage.get()
+        if summary is not None:
+            summary.record(site, latency, prompt_tokens, completion_tokens, cost, retries, success)
+
+
+def _usage_field(usage, field: str) -> int:
+    if usage is None:
+        return 0
+    value = usage.get(field) if isinstance(usage, dict) else getattr(usage, field, 0)
+    return int(value or 0)
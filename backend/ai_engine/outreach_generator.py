@@ -4,15 +4,25 @@ from typing import Dict, List, Optional
 import json
 from datetime import datetime
 import time
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from backend.ai_engine.batch_runner import LLMBatchRunner
+from backend.ai_engine.llm_client import InstrumentedLLMClient
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class OutreachGenerator:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, request_delay: float = 1.0):
         """Initialize the outreach message generator"""
         openai.api_key = api_key
-        self.client = openai.OpenAI(api_key=api_key)
+        # Delay between leads in generate_bulk_outreach to respect API limits
+        self.request_delay = request_delay
+        # Retries are handled by the instrumented wrapper
+        self.client = openai.OpenAI(api_key=api_key, max_retries=0)
+        self.llm = InstrumentedLLMClient(self.client, component="outreach_generator")
 
     def generate_personalized_outreach(self, lead_data: Dict) -> Dict:
         """
@@ -32,46 +42,13 @@ class OutreachGenerator:
             Dictionary with generated outreach content
         """
         try:
-            # Create context-aware prompt
-            prompt = self._build_outreach_prompt(lead_data)
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert sales outreach specialist for DuPont Tedlar,
-specializing in protective films for graphics and signage applications.
-Your goal is to create compelling, personalized outreach messages that:
-1. Reference specific industry context
-2. Highlight relevant Tedlar benefits
-3. Are professional but not overly salesy
-4. Include a clear but soft call-to-action
-5. Are concise (under 200 words)"""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=300
-            )
+            response = self.llm.chat_completion("primary_message", **self._outreach_request(lead_data))
             outreach_content = response.choices[0].message.content.strip()
             # Generate subject line
             subject_line = self._generate_subject_line(lead_data)
             # Generate follow-up sequence
             follow_ups = self._generate_follow_up_sequence(lead_data, outreach_content)
-            return {
-                "success": True,
-                "data": {
-                    "primary_message": outreach_content,
-                    "subject_line": subject_line,
-                    "follow_up_sequence": follow_ups,
-                    "personalization_elements": self._extract_personalization_elements(lead_data),
-                    "generated_at": datetime.now().isoformat(),
-                    "message_type": "cold_outreach"
-                }
-            }
+            return self._outreach_result(lead_data, outreach_content, subject_line, follow_ups)
         except Exception as e:
             logger.error(f"Error generating outreach for {lead_data.get('company_name', 'Unknown')}: {str(e)}")
             return {
@@ -80,6 +57,47 @@ Your goal is to create compelling, personalized outreach messages that:
                 "fallback_message": self._generate_fallback_message(lead_data)
             }
 
+    def _outreach_request(self, lead_data: Dict) -> Dict:
+        """Chat completion parameters for the primary outreach message"""
+        # Create context-aware prompt
+        prompt = self._build_outreach_prompt(lead_data)
+        return {
+            "model": "gpt-4",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": """You are an expert sales outreach specialist for DuPont Tedlar,
+specializing in protective films for graphics and signage applications.
+Your goal is to create compelling, personalized outreach messages that:
+1. Reference specific industry context
+2. Highlight relevant Tedlar benefits
+3. Are professional but not overly salesy
+4. Include a clear but soft call-to-action
+5. Are concise (under 200 words)"""
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 300
+        }
+
+    def _outreach_result(self, lead_data: Dict, outreach_content: str, subject_line: str,
+                         follow_ups: List[Dict]) -> Dict:
+        return {
+            "success": True,
+            "data": {
+                "primary_message": outreach_content,
+                "subject_line": subject_line,
+                "follow_up_sequence": follow_ups,
+                "personalization_elements": self._extract_personalization_elements(lead_data),
+                "generated_at": datetime.now().isoformat(),
+                "message_type": "cold_outreach"
+            }
+        }
+
     def _build_outreach_prompt(self, lead_data: Dict) -> str:
         """Build context-rich prompt for outreach generation"""
         company_name = lead_data.get('company_name', 'the company')
@@ -114,12 +132,11 @@ Generate the outreach message:
 """
         return prompt
 
-    def _generate_subject_line(self, lead_data: Dict) -> str:
-        """Generate compelling subject line"""
-        try:
-            company_name = lead_data.get('company_name', 'your company')
-            event_context = lead_data.get('event_context', '')
-            subject_prompt = f"""
+    def _subject_line_request(self, lead_data: Dict) -> Dict:
+        """Chat completion parameters for subject line generation"""
+        company_name = lead_data.get('company_name', 'your company')
+        event_context = lead_data.get('event_context', '')
+        subject_prompt = f"""
 Generate 3 compelling email subject lines for outreach to {company_name}.
 Context: {event_context}
 Make them:
@@ -129,18 +146,20 @@ Make them:
 4. Avoid spam trigger words
 Return only the 3 subject lines, numbered 1-3.
 """
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": subject_prompt}],
-                temperature=0.8,
-                max_tokens=100
-            )
-            subject_lines = response.choices[0].message.content.strip().split('\n')
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [{"role": "user", "content": subject_prompt}],
+            "temperature": 0.8,
+            "max_tokens": 100
+        }
+
+    def _parse_subject_line(self, content: Optional[str], lead_data: Dict) -> str:
+        """Pick the first generated subject line, or a fallback"""
+        if content:
+            subject_lines = content.strip().split('\n')
             # Return the first subject line (remove numbering)
             if subject_lines:
                 return subject_lines[0].split('. ', 1)[-1] if '. ' in subject_lines[0] else subject_lines[0]
-        except Exception as e:
-            logger.error(f"Error generating subject line: {str(e)}")
         # Fallback subject lines
         fallbacks = [
             f"Enhancing durability for {lead_data.get('company_name', 'your graphics')}",
@@ -149,10 +168,19 @@ Return only the 3 subject lines, numbered 1-3.
         ]
         return fallbacks[0]
 
-    def _generate_follow_up_sequence(self, lead_data: Dict, initial_message: str) -> List[Dict]:
-        """Generate a sequence of follow-up messages"""
+    def _generate_subject_line(self, lead_data: Dict) -> str:
+        """Generate compelling subject line"""
+        content = None
         try:
-            follow_up_prompt = f"""
+            response = self.llm.chat_completion("subject_line", **self._subject_line_request(lead_data))
+            content = response.choices[0].message.content
+        except Exception as e:
+            logger.error(f"Error generating subject line: {str(e)}")
+        return self._parse_subject_line(content, lead_data)
+
+    def _follow_up_request(self, lead_data: Dict, initial_message: str) -> Dict:
+        """Chat completion parameters for the follow-up sequence"""
+        follow_up_prompt = f"""
 Based on this initial outreach message to {lead_data.get('company_name', '')}:
 "{initial_message}"
 Generate 2 brief follow-up messages for if they don't respond:
@@ -169,25 +197,33 @@ FOLLOW-UP 1:
 FOLLOW-UP 2:
 [message]
 """
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": follow_up_prompt}],
-                temperature=0.7,
-                max_tokens=200
-            )
-            content = response.choices[0].message.content.strip()
-            # Parse follow-ups
-            follow_ups = []
-            parts = content.split('FOLLOW-UP')
-            for i, part in enumerate(parts[1:], 1):  # Skip first empty part
-                message = part.split(':', 1)[-1].strip()
-                follow_ups.append({
-                    "sequence": i,
-                    "timing": f"{i} week{'s' if i > 1 else ''} after initial",
-                    "message": message,
-                    "type": "follow_up"
-                })
-            return follow_ups
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [{"role": "user", "content": follow_up_prompt}],
+            "temperature": 0.7,
+            "max_tokens": 200
+        }
+
+    def _parse_follow_ups(self, content: str) -> List[Dict]:
+        """Split a FOLLOW-UP formatted response into sequence entries"""
+        follow_ups = []
+        parts = content.strip().split('FOLLOW-UP')
+        for i, part in enumerate(parts[1:], 1):  # Skip first empty part
+            message = part.split(':', 1)[-1].strip()
+            follow_ups.append({
+                "sequence": i,
+                "timing": f"{i} week{'s' if i > 1 else ''} after initial",
+                "message": message,
+                "type": "follow_up"
+            })
+        return follow_ups
+
+    def _generate_follow_up_sequence(self, lead_data: Dict, initial_message: str) -> List[Dict]:
+        """Generate a sequence of follow-up messages"""
+        try:
+            response = self.llm.chat_completion(
+                "follow_up_sequence", **self._follow_up_request(lead_data, initial_message))
+            return self._parse_follow_ups(response.choices[0].message.content)
         except Exception as e:
             logger.error(f"Error generating follow-ups: {str(e)}")
             return []
@@ -226,8 +262,45 @@ DuPont Tedlar Team"""
             result['lead_id'] = lead.get('id', i)
             results.append(result)
             # Add delay to respect API limits
-            if i < len(leads) - 1:
-                time.sleep(1)  # 1 second delay between requests
+            if i < len(leads) - 1 and self.request_delay:
+                time.sleep(self.request_delay)
+        return results
+
+    def generate_bulk_outreach_batch(self, leads: List[Dict], runner: Optional[LLMBatchRunner] = None) -> List[Dict]:
+        """
+        Batch-mode equivalent of generate_bulk_outreach for large lead lists
+        Runs two batch jobs: primary messages and subject lines first, then the
+        follow-up sequences (which need the primary message as input).
+        """
+        if not leads:
+            return []
+        runner = runner or LLMBatchRunner(self.llm)
+        first_round = runner.run(
+            [(f"primary-{i}", self._outreach_request(lead)) for i, lead in enumerate(leads)]
+            + [(f"subject-{i}", self._subject_line_request(lead)) for i, lead in enumerate(leads)],
+            call_site="outreach")
+        messages = {i: first_round[f"primary-{i}"].strip() for i in range(len(leads))
+                    if first_round[f"primary-{i}"] is not None}
+        follow_up_round = runner.run(
+            [(f"follow-up-{i}", self._follow_up_request(leads[i], message)) for i, message in messages.items()],
+            call_site="follow_up_sequence")
+
+        results = []
+        for i, lead in enumerate(leads):
+            if i in messages:
+                follow_up_text = follow_up_round.get(f"follow-up-{i}")
+                result = self._outreach_result(
+                    lead, messages[i], self._parse_subject_line(first_round[f"subject-{i}"], lead),
+                    self._parse_follow_ups(follow_up_text) if follow_up_text else [])
+            else:
+                logger.error(f"Batch outreach failed for {lead.get('company_name', 'Unknown')}")
+                result = {
+                    "success": False,
+                    "error": "Failed to generate outreach: batch request failed",
+                    "fallback_message": self._generate_fallback_message(lead)
+                }
+            result['lead_id'] = lead.get('id', i)
+            results.append(result)
         return results
 
     def validate_outreach_content(self, outreach_data: Dict) -> Dict:
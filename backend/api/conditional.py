@@ -0,0 +1,81 @@
+"""
+Conditional GET support for read endpoints.
+
+Every write to the in-memory stores bumps a shared DataVersion. Read endpoints
+derive their ETag and Last-Modified headers from it and answer a matching
+``If-None-Match`` (or a not-newer ``If-Modified-Since``) with 304 before
+building the response, so idle dashboards revalidating their data cost almost
+nothing. ETags carry a random per-process epoch, so a restarted server (whose
+counter starts over) never matches a tag issued by a previous process.
+"""
+import secrets
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+
+class DataVersion:
+    """Monotonic counter of writes to the API's data, with the time of the last write"""
+
+    def __init__(self):
+        self.epoch = secrets.token_hex(4)
+        self.value = 0
+        self.modified_at = time.time()
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.value += 1
+            self.modified_at = time.time()
+
+    @property
+    def etag(self) -> str:
+        # Weak: the same version may be sent with different content encodings
+        return f'W/"{self.epoch}-{self.value}"'
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "ETag": self.etag,
+            # Cache, but revalidate on every use
+            "Cache-Control": "no-cache",
+        }
+        # HTTP dates have one-second resolution: while the last write's second is
+        # still running, a later write could share its Last-Modified, so none is sent
+        if int(time.time()) > int(self.modified_at):
+            headers["Last-Modified"] = formatdate(int(self.modified_at), usegmt=True)
+        return headers
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, version: DataVersion) -> bool:
+    """True if the client's cached copy (per If-None-Match or If-Modified-Since) is current"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _strip_weak(version.etag)
+        return any(_strip_weak(tag) == current for tag in if_none_match.split(","))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # Last-Modified is only sent once its second has passed, so a write after
+        # the client's copy was served always lands in a later second
+        return int(version.modified_at) <= since
+    return False
+
+
+def not_modified_response(request: Request, version: DataVersion) -> Optional[Response]:
+    """A 304 response if the client's copy is current, else None"""
+    if request.method in ("GET", "HEAD") and is_not_modified(request, version):
+        return Response(status_code=304, headers=version.headers())
+    return None
@@ -1,35 +1,66 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Path
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Path, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Any
+from contextlib import asynccontextmanager
 import asyncio
 import logging
 import os
+import shutil
+import tempfile
 from datetime import datetime
 import json
+import threading
+import time
 from dotenv import load_dotenv
+from starlette.background import BackgroundTask
 
 load_dotenv()
 
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from backend.scrapers.events_scraper import EventsScraper
-from backend.scrapers.company_scraper import CompanyScraper, enrich_contacts_with_linkedin
-from backend.ai_engine.lead_qualifier import LeadQualifier
-from backend.ai_engine.outreach_generator import OutreachGenerator
+# Scrapers and LLM clients (selenium, pandas, openai, BeautifulSoup) are imported
+# on first use, see component(), so read-only workers start quickly
+from backend.scrapers.event_index import normalize_company_name
+from backend.pipeline.cache import FingerprintCache
+from backend.pipeline.persistence import DatabaseSink
+from backend.pipeline.streaming import PipelineSink, StreamingLeadPipeline
+from backend.monitoring.metrics import REGISTRY
+from backend.api.compression import CompressionMiddleware
+from backend.api.conditional import DataVersion, not_modified_response
+from backend.api.progress import ProgressBroker
+from backend.api.responses import FastJSONResponse, dumps, json_array, merge_encoded, with_encoded_field
+from backend.api.storage import RecordStore, field_key
 from backend.database.models import Lead, Event, Company
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # LEAD_ARCHIVE_INTERVAL_HOURS > 0 moves closed/stale leads to leads_archive on that schedule
+    interval = float(os.getenv("LEAD_ARCHIVE_INTERVAL_HOURS", "0"))
+    scheduler = None
+    if interval > 0:
+        from backend.database.archive import ArchiveScheduler
+        scheduler = ArchiveScheduler(component("async_database"), interval * 3600,
+                                     closed_after_days=float(os.getenv("LEAD_ARCHIVE_CLOSED_DAYS", "30")),
+                                     stale_after_days=float(os.getenv("LEAD_ARCHIVE_STALE_DAYS", "365")))
+        scheduler.start()
+    yield
+    if scheduler is not None:
+        await scheduler.stop()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Instalily AI - Lead Generation System",
     description="Automated lead generation and outreach for DuPont Tedlar Graphics & Signage",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -43,20 +74,84 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified"],
 )
+# Compress large responses (the event stream is passed through)
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
 
-# Initialize components
+# Components, constructed on first use
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-events_scraper = EventsScraper()
-company_scraper = CompanyScraper()
-lead_qualifier = LeadQualifier(OPENAI_API_KEY)
-outreach_generator = OutreachGenerator(OPENAI_API_KEY)
+
+def _create_events_scraper():
+    from backend.scrapers.events_scraper import EventsScraper
+    return EventsScraper()
+
+def _create_company_scraper():
+    from backend.scrapers.company_scraper import CompanyScraper
+    return CompanyScraper()
+
+def _create_lead_qualifier():
+    from backend.ai_engine.lead_qualifier import LeadQualifier
+    return LeadQualifier(OPENAI_API_KEY)
+
+def _create_outreach_generator():
+    from backend.ai_engine.outreach_generator import OutreachGenerator
+    return OutreachGenerator(OPENAI_API_KEY)
+
+def _create_database():
+    from backend.database.models import DatabaseManager
+    return DatabaseManager(os.getenv("LEADS_DB_PATH", "data/leads.db"), connection_per_thread=True)
+
+def _create_async_database():
+    from backend.database.async_db import AsyncDatabase
+    return AsyncDatabase(component("database"), readers=int(os.getenv("DB_READER_THREADS", "4")))
+
+def _create_write_queue():
+    from backend.database.write_queue import WriteBehindQueue
+    return WriteBehindQueue(component("database"))
+
+COMPONENT_FACTORIES = {
+    "events_scraper": _create_events_scraper,
+    "company_scraper": _create_company_scraper,
+    "lead_qualifier": _create_lead_qualifier,
+    "outreach_generator": _create_outreach_generator,
+    "database": _create_database,
+    "async_database": _create_async_database,  # awaitable facade over database
+    "write_queue": _create_write_queue,  # group-committed pipeline writes to database
+}
+_components_lock = threading.RLock()  # factories may build the components they depend on
+
+def component(name: str):
+    """
+    Shared component by name, constructed on first use
+    Assigning the module attribute (e.g. ``main.lead_qualifier = ...`` in benchmarks) replaces it.
+    """
+    instance = globals().get(name)
+    if instance is None:
+        with _components_lock:
+            instance = globals().get(name)
+            if instance is None:
+                instance = globals()[name] = COMPONENT_FACTORIES[name]()
+    return instance
+
+def __getattr__(name: str):
+    # Lazy module attributes: main.events_scraper etc.
+    if name in COMPONENT_FACTORIES:
+        return component(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # In-memory storage for demo (replace with database in production)
-leads_storage = []
-events_storage = []
-companies_storage = []
-outreach_storage = []
+# Keyed stores: reruns update existing records instead of appending duplicates.
+# Every write bumps data_version, which read endpoints use as their ETag.
+data_version = DataVersion()
+leads_storage = RecordStore(field_key("id"), preserve=("created_at", "status"), cache_encoded=True,
+                            version=data_version)
+events_storage = RecordStore(field_key("name"), version=data_version)
+companies_storage = RecordStore(lambda company: normalize_company_name(company.get("name", "")),
+                                version=data_version)
+outreach_storage = RecordStore(field_key("lead_id"), version=data_version)  # one outreach sequence per lead
+# Stage results reused across runs for companies whose inputs did not change
+stage_cache = FingerprintCache()
 
 # Pydantic models for API requests/responses
 class LeadGenerationRequest(BaseModel):
@@ -92,6 +187,43 @@ task_status = {
     "results": {}
 }
 
+# Push channel for progress, lead and dashboard updates (see /api/stream)
+progress_broker = ProgressBroker()
+
+def _publish_status():
+    progress_broker.publish("progress", dict(task_status))
+
+def _publish_dashboard(force: bool = False):
+    # Stats are computed only when the throttle lets a delta through, not on every store write
+    progress_broker.publish_delta("dashboard", _dashboard_stats, force=force)
+
+# Lead fields in the compact /api/leads view (the dashboard's lead cards); the
+# rest, including outreach text, comes from /api/leads/{lead_id}
+LEAD_LIST_FIELDS = (
+    "id", "company_name", "industry", "industry_alignment", "qualification_score", "status",
+    "contact_name", "contact_title", "event_context", "company_size", "created_at"
+)
+# Fields computed per request rather than stored on the lead
+LEAD_OUTREACH_FIELDS = ("has_outreach", "outreach_data")
+
+def _lead_summary(lead: Dict) -> Dict:
+    """Compact lead as sent to the dashboard for a newly qualified lead"""
+    summary = {key: lead.get(key) for key in LEAD_LIST_FIELDS}
+    summary["has_outreach"] = outreach_storage.get(lead.get("id")) is not None
+    return summary
+
+def _lead_list_row(lead: Dict, row: Optional[bytes], fields: Optional[List[str]]) -> bytes:
+    """Encoded lead for /api/leads: projected to ``fields``, or the full lead with outreach if None"""
+    lead_outreach = outreach_storage.get(lead.get('id'))
+    if fields is None:
+        return merge_encoded(row, {"has_outreach": lead_outreach is not None, "outreach_data": lead_outreach})
+    projected = {field: lead.get(field) for field in fields if field in lead}
+    if "has_outreach" in fields:
+        projected["has_outreach"] = lead_outreach is not None
+    if "outreach_data" in fields:
+        projected["outreach_data"] = lead_outreach
+    return dumps(projected)
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -104,7 +236,13 @@ async def root():
             "dashboard": "/api/dashboard",
             "leads": "/api/leads",
             "events": "/api/events",
-            "status": "/api/task-status"
+            "status": "/api/task-status",
+            "stream": "/api/stream",
+            "search": "/api/search",
+            "database_leads": "/api/db/leads",
+            "archive_database_leads": "/api/db/leads/archive",
+            "database_snapshots": "/api/db/snapshots/{leads|companies}",
+            "metrics": "/metrics"
         }
     }
 
@@ -120,6 +258,7 @@ async def generate_leads(request: LeadGenerationRequest, background_tasks: Backg
         "message": "Starting lead generation process...",
         "results": {}
     }
+    _publish_status()
     # Run the lead generation process in background
     background_tasks.add_task(
         run_lead_generation_pipeline,
@@ -136,12 +275,6 @@ async def generate_leads(request: LeadGenerationRequest, background_tasks: Backg
     }
 
 
-sem = asyncio.Semaphore(2) 
-
-def safe_qualify(company, event_context):
-    # Remove async; remove 'await'.
-    return lead_qualifier.qualify_lead(company, event_context)
-
 async def run_lead_generation_pipeline(
     target_industries: List[str],
     max_leads: int,
@@ -149,113 +282,69 @@ async def run_lead_generation_pipeline(
     include_outreach: bool
 ):
     """Main pipeline for lead generation"""
-    global task_status, leads_storage, events_storage, companies_storage, outreach_storage
+    from backend.ai_engine.llm_client import track_llm_usage
+    with track_llm_usage() as llm_usage:
+        started = time.perf_counter()
+        await _run_lead_generation_stages(target_industries, max_leads, min_company_size, include_outreach)
+        task_status["results"]["llm_usage"] = llm_usage.to_dict()
+        task_status["results"]["duration_seconds"] = round(time.perf_counter() - started, 3)
+    _publish_status()
+    _publish_dashboard(force=True)
+
+class StorageSink(PipelineSink):
+    """Publishes pipeline output to the in-memory stores as soon as it is produced"""
+
+    def __init__(self, max_leads: int):
+        self.max_leads = max(max_leads, 1)
+
+    def on_event(self, event):
+        events_storage.upsert(event)
+        _publish_dashboard()
+
+    def on_company(self, company: Dict):
+        companies_storage.upsert(company)
+        _publish_dashboard()
+
+    def on_lead(self, lead: Dict):
+        leads_storage.upsert(lead)
+        progress_broker.publish("lead", _lead_summary(lead))
+        _publish_dashboard()
+
+    def on_outreach(self, outreach: Dict):
+        outreach_storage.upsert(outreach)
+        progress_broker.publish("outreach", {"lead_id": outreach["lead_id"]})
+        _publish_dashboard()
+
+    def on_progress(self, stats: Dict):
+        task_status["progress"] = 10 + int(85 * min(stats["companies_processed"] / self.max_leads, 1.0))
+        task_status["message"] = (f"Analyzed {stats['companies_processed']} companies: "
+                                  f"{stats['qualified_leads']} qualified, "
+                                  f"{stats['outreach_generated']} outreach messages generated")
+        _publish_status()
+
+async def _run_lead_generation_stages(
+    target_industries: List[str],
+    max_leads: int,
+    min_company_size: str,
+    include_outreach: bool
+):
+    """Pipeline stages, streamed per company: events -> companies -> enrichment -> qualification -> outreach"""
+    global task_status
     try:
-        # Step 1: Scrape Events
         task_status["message"] = "Scraping industry events..."
         task_status["progress"] = 10
-        events_data = events_scraper.scrape_industry_events(target_industries)
-        events_storage.extend(events_data)
-        logger.info(f"Found {len(events_data)} events")
-
-        # Step 2: Extract Companies from Events
-        task_status["message"] = "Extracting companies from events..."
-        task_status["progress"] = 30
-        all_companies = []
-        for event in events_data:
-            companies = company_scraper.extract_companies_from_event(event)
-            all_companies.extend(companies)
-
-        # Deduplicate companies by name (case-insensitive)
-        unique_companies = {}
-        for company in all_companies:
-            name = company.get('name', '').strip().lower() if isinstance(company, dict) else getattr(company, 'name', '').strip().lower()
-            if name and name not in unique_companies:
-                unique_companies[name] = company
-
-        # Enrich company contacts with LinkedIn
-        for company in unique_companies.values():
-            if not company.get('key_contacts'):
-                contacts = enrich_contacts_with_linkedin(company.get('name', ''), company.get('website', ''))
-                company['key_contacts'] = contacts
-
-        companies_storage.extend(list(unique_companies.values()))
-        logger.info(f"Found {len(unique_companies)} unique companies")
-
-        # Step 3: Enrich Company Data
-        task_status["message"] = "Enriching company data..."
-        task_status["progress"] = 50
-        enriched_companies = []
-        unique_companies_list = list(unique_companies.values())[:max_leads]  # Limit processing
-        for i, company in enumerate(unique_companies_list):
-            enriched = company_scraper.enrich_company_data(company)
-            enriched_companies.append(enriched)
-            # Update progress
-            progress = 50 + (i / min(len(unique_companies_list), max_leads)) * 20
-            task_status["progress"] = int(progress)
-
-        # Step 4: Qualify Leads
-        task_status["message"] = "Qualifying leads with AI..."
-        task_status["progress"] = 70
-        # Prepare input for each lead
-        context_per_company = []
-        qualifications = []
-        for company in enriched_companies:
-            relevant_events = [e for e in events_data if any(
-                (comp.get('name', '').lower() if isinstance(comp, dict) else getattr(comp, 'name', '').lower()) == company.get('name', '').lower()
-                for comp in getattr(e, 'companies', [])
-            )]
-            event_context = relevant_events[0] if relevant_events else None
-            context_per_company.append((company, event_context))
-            qualification = safe_qualify(company, event_context)
-            qualifications.append(qualification)
-
-        qualified_leads = []
-        for idx, qualification in enumerate(qualifications):
-            company, event_context = context_per_company[idx]
-            if qualification.get('is_qualified', False):
-                lead_data = {
-                    "id": f"lead_{len(qualified_leads)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                    "company_name": company.get('name', ''),
-                    "company_description": company.get('description', ''),
-                    "company_size": company.get('size', ''),
-                    "industry": company.get('industry', ''),
-                    "revenue": company.get('revenue', ''),
-                    "website": company.get('website', ''),
-                    "qualification_score": qualification.get('score', 0),
-                    "qualification_reasons": qualification.get('reasons', []),
-                    "industry_alignment": qualification.get('industry_alignment', ''),
-                    "event_context": event_context.get('name', '') if event_context else '',
-                    "contact_name": company.get('key_contacts', [{}])[0].get('name', ''),
-                    "contact_title": company.get('key_contacts', [{}])[0].get('title', ''),
-                    "contact_linkedin": company.get('key_contacts', [{}])[0].get('linkedin', ''),
-                    "created_at": datetime.now().isoformat()
-                }
-                qualified_leads.append(lead_data)
-        leads_storage.extend(qualified_leads)
-        logger.info(f"Qualified {len(qualified_leads)} leads")
-
-
-        # Step 5: Generate Outreach 
-        generated_outreach = []
-        if include_outreach and qualified_leads:
-            task_status["message"] = "Generating personalized outreach..."
-            task_status["progress"] = 80
-            outreach_results = outreach_generator.generate_bulk_outreach(qualified_leads)
-            for result in outreach_results:
-                if result.get('success', False):
-                    outreach_data = {
-                        "id": f"outreach_{result.get('lead_id', 'unknown')}",
-                        "lead_id": result.get('lead_id'),
-                        "subject_line": result['data']['subject_line'],
-                        "primary_message": result['data']['primary_message'],
-                        "follow_up_sequence": result['data']['follow_up_sequence'],
-                        "personalization_elements": result['data']['personalization_elements'],
-                        "generated_at": result['data']['generated_at'],
-                        "status": "generated"
-                    }
-                    generated_outreach.append(outreach_data)
-            outreach_storage.extend(generated_outreach)
+        pipeline = StreamingLeadPipeline(component("events_scraper"), component("company_scraper"),
+                                         component("lead_qualifier"), component("outreach_generator"),
+                                         cache=stage_cache)
+        sink = StorageSink(max_leads)
+        if os.getenv("LEADS_DB_PATH"):
+            # Also persist to the leads database, without the stages waiting on commits
+            sink = DatabaseSink(component("write_queue"), sink)
+        stats = await pipeline.run(target_industries, max_leads, include_outreach, sink=sink)
+        if isinstance(sink, DatabaseSink):
+            await asyncio.wrap_future(sink.flush())
+        logger.info(f"Found {stats['events_found']} events, {stats['companies_analyzed']} unique companies, "
+                    f"qualified {stats['qualified_leads']} leads")
 
         # Complete the task
         task_status = {
@@ -264,10 +353,14 @@ async def run_lead_generation_pipeline(
             "progress": 100,
             "message": "Lead generation process completed successfully",
             "results": {
-                "events_found": len(events_data),
-                "companies_analyzed": len(unique_companies),
-                "qualified_leads": len(qualified_leads),
-                "outreach_generated": len(generated_outreach),
+                "events_found": stats["events_found"],
+                "companies_analyzed": stats["companies_analyzed"],
+                "companies_merged": stats["companies_merged"],
+                "qualified_leads": stats["qualified_leads"],
+                "outreach_generated": stats["outreach_generated"],
+                "stage_seconds": stats["stage_seconds"],
+                "first_lead_seconds": stats["first_lead_seconds"],
+                "cache": stats["cache"],
                 "completion_time": datetime.now().isoformat()
             }
         }
@@ -287,15 +380,48 @@ async def get_task_status():
     """Get current task status"""
     return task_status
 
-@app.get("/api/dashboard")
-async def get_dashboard_stats() -> DashboardStats:
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Expose process metrics (LLM latency, tokens, cost) in Prometheus text format"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/stream")
+async def stream_progress(request: Request):
+    """Server-Sent Events feed of task progress, newly qualified leads and dashboard deltas"""
+    last_event_id = request.headers.get("last-event-id")
+    subscription = progress_broker.subscribe(int(last_event_id) if last_event_id and last_event_id.isdigit() else None)
+    # Fresh connections start from a snapshot; reconnects get the messages they missed
+    initial = [] if last_event_id else [("progress", dict(task_status)), ("dashboard", _dashboard_stats())]
+    return StreamingResponse(
+        progress_broker.stream(subscription, initial, is_disconnected=request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/dashboard", response_model=DashboardStats)
+async def get_dashboard_stats(request: Request):
     """Get dashboard statistics"""
+    not_modified = not_modified_response(request, data_version)
+    if not_modified:
+        return not_modified
+    return FastJSONResponse(_dashboard_stats(), headers=data_version.headers())
+
+_dashboard_cache: Dict[str, Any] = {"version": None, "stats": None}
+
+def _dashboard_stats() -> Dict:
+    """Dashboard counters, recomputed only after the data changed"""
+    if _dashboard_cache["version"] != data_version.value:
+        _dashboard_cache["stats"] = _compute_dashboard_stats()
+        _dashboard_cache["version"] = data_version.value
+    return dict(_dashboard_cache["stats"])
+
+def _compute_dashboard_stats() -> Dict:
     qualified_leads = [lead for lead in leads_storage if lead.get('qualification_score', 0) >= 0.8]
     avg_score = 0
     if leads_storage:
         total_score = sum(lead.get('qualification_score', 0) for lead in leads_storage)
         avg_score = total_score / len(leads_storage)
-    return DashboardStats(
+    return dict(
         total_leads=len(leads_storage),
         qualified_leads=len(qualified_leads),
         events_processed=len(events_storage),
@@ -306,12 +432,25 @@ async def get_dashboard_stats() -> DashboardStats:
 
 @app.get("/api/leads")
 async def get_leads(
+    request: Request,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     min_score: float = Query(0.0, ge=0.0, le=1.0),
-    sort_by: str = Query("qualification_score", pattern="^(qualification_score|company_name|created_at)$")
+    sort_by: str = Query("qualification_score", pattern="^(qualification_score|company_name|created_at)$"),
+    view: str = Query("compact", pattern="^(compact|full)$",
+                      description="compact: list fields only; full: every field plus outreach_data"),
+    fields: Optional[str] = Query(None, description="Comma-separated lead fields to return (overrides view)")
 ):
     """Get paginated list of leads"""
+    not_modified = not_modified_response(request, data_version)
+    if not_modified:
+        return not_modified
+    if fields:
+        projection = [field.strip() for field in fields.split(",") if field.strip()]
+    elif view == "compact":
+        projection = list(LEAD_LIST_FIELDS) + ["has_outreach"]
+    else:
+        projection = None
     # Filter by minimum score
     filtered_leads = [
         lead for lead in leads_storage
@@ -328,16 +467,10 @@ async def get_leads(
     start_idx = (page - 1) * limit
     end_idx = start_idx + limit
     paginated_leads = sorted_leads[start_idx:end_idx]
-    # Add outreach information
-    for lead in paginated_leads:
-        lead_outreach = [
-            outreach for outreach in outreach_storage
-            if outreach.get('lead_id') == lead.get('id')
-        ]
-        lead['has_outreach'] = len(lead_outreach) > 0
-        lead['outreach_data'] = lead_outreach[0] if lead_outreach else None
-    return {
-        "leads": paginated_leads,
+    # The full view adds outreach information to the cached lead encodings
+    encoded = leads_storage.encoded(paginated_leads) if projection is None else [None] * len(paginated_leads)
+    rows = [_lead_list_row(lead, row, projection) for lead, row in zip(paginated_leads, encoded)]
+    envelope = {
         "pagination": {
             "page": page,
             "limit": limit,
@@ -347,68 +480,111 @@ async def get_leads(
         "filters": {
             "min_score": min_score,
             "sort_by": sort_by
-        }
+        },
+        "view": "fields" if fields else view
     }
+    return FastJSONResponse(with_encoded_field(envelope, "leads", json_array(rows)), headers=data_version.headers())
 
 @app.get("/api/leads/{lead_id}")
-async def get_lead_detail(lead_id: str = Path(..., description="Lead ID")):
+async def get_lead_detail(request: Request, lead_id: str = Path(..., description="Lead ID")):
     """Get detailed information for a specific lead"""
-    lead = next((lead for lead in leads_storage if lead.get('id') == lead_id), None)
+    not_modified = not_modified_response(request, data_version)
+    if not_modified:
+        return not_modified
+    lead = leads_storage.get(lead_id)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     # Get associated outreach
-    outreach_data = [
-        outreach for outreach in outreach_storage
-        if outreach.get('lead_id') == lead_id
-    ]
+    outreach = outreach_storage.get(lead_id)
+    outreach_data = [outreach] if outreach else []
     # Get related event information
     event_name = lead.get('event_context', '')
-    related_event = next(
-        (event for event in events_storage if event.name == event_name),
-        None
-    )
-    print("Lead being returned:", lead)
-    return {
+    related_event = events_storage.get(event_name)
+    return FastJSONResponse({
         "lead": lead,
         "outreach": outreach_data,
         "related_event": related_event
-    }
+    }, headers=data_version.headers())
 
 @app.get("/api/events")
-async def get_events():
+async def get_events(request: Request):
     """Get list of scraped events"""
-    return {
+    not_modified = not_modified_response(request, data_version)
+    if not_modified:
+        return not_modified
+    return FastJSONResponse({
         "events": events_storage,
         "total": len(events_storage)
-    }
+    }, headers=data_version.headers())
 
 @app.get("/api/companies")
-async def get_companies(limit: int = Query(50, ge=1, le=200)):
+async def get_companies(request: Request, limit: int = Query(50, ge=1, le=200)):
     """Get list of scraped companies"""
-    return {
+    not_modified = not_modified_response(request, data_version)
+    if not_modified:
+        return not_modified
+    return FastJSONResponse({
         "companies": companies_storage[:limit],
         "total": len(companies_storage),
         "showing": min(limit, len(companies_storage))
-    }
+    }, headers=data_version.headers())
+
+@app.get("/api/search")
+async def search(
+    q: str = Query(..., min_length=1, description="Words to find; the last one may be a prefix"),
+    type: str = Query("all", pattern="^(all|companies|leads)$"),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Ranked full-text search over company descriptions and lead rationale, notes and outreach"""
+    kinds = None if type == "all" else [type]
+    found = await component("async_database").search(q, kinds=kinds, limit=limit, offset=(page - 1) * limit)
+    return FastJSONResponse({
+        "query": q,
+        "results": found["results"],
+        "pagination": {"page": page, "limit": limit, "has_more": found["has_more"]}
+    })
+
+@app.get("/api/db/leads")
+async def list_database_leads(
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    after_score: Optional[float] = Query(None, description="next_cursor of the previous page"),
+    after_id: Optional[int] = Query(None, description="next_cursor of the previous page"),
+    with_decision_maker: bool = False,
+    include_archived: bool = False
+):
+    """Leads stored in the leads database (LEADS_DB_PATH) by score, one keyset page at a time"""
+    page = await component("async_database").get_leads(status=status, limit=limit, after_score=after_score,
+                                                        after_id=after_id, with_decision_maker=with_decision_maker,
+                                                        include_archived=include_archived)
+    return FastJSONResponse({"leads": page, "next_cursor": page.next_cursor})
+
+@app.post("/api/db/leads/archive")
+async def archive_database_leads(
+    closed_after_days: float = Query(30, ge=0),
+    stale_after_days: float = Query(365, ge=0)
+):
+    """Move closed and stale leads to leads_archive now (see LEAD_ARCHIVE_INTERVAL_HOURS for scheduled runs)"""
+    archived = await component("async_database").archive_leads(closed_after_days=closed_after_days,
+                                                                stale_after_days=stale_after_days)
+    return {"archived": archived}
 
 @app.post("/api/outreach/{lead_id}/generate")
 async def generate_outreach_for_lead(lead_id: str = Path(..., description="Lead ID")):
     """Generate outreach message for a specific lead"""
-    lead = next((lead for lead in leads_storage if lead.get('id') == lead_id), None)
+    lead = leads_storage.get(lead_id)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     # Check if outreach already exists
-    existing_outreach = next(
-        (outreach for outreach in outreach_storage if outreach.get('lead_id') == lead_id),
-        None
-    )
+    existing_outreach = outreach_storage.get(lead_id)
     if existing_outreach:
         return {
             "message": "Outreach already exists for this lead",
             "outreach": existing_outreach
         }
     # Generate new outreach
-    result = outreach_generator.generate_personalized_outreach(lead)
+    result = component("outreach_generator").generate_personalized_outreach(lead)
     if result.get('success', False):
         outreach_data = {
             "id": f"outreach_{lead_id}",
@@ -420,7 +596,9 @@ async def generate_outreach_for_lead(lead_id: str = Path(..., description="Lead
             "generated_at": result['data']['generated_at'],
             "status": "generated"
         }
-        outreach_storage.append(outreach_data)
+        outreach_storage.upsert(outreach_data)
+        progress_broker.publish("outreach", {"lead_id": lead_id})
+        _publish_dashboard(force=True)
         return {
             "message": "Outreach generated successfully",
             "outreach": outreach_data
@@ -439,6 +617,7 @@ async def clear_all_data():
     events_storage.clear()
     companies_storage.clear()
     outreach_storage.clear()
+    stage_cache.clear()
     task_status = {
         "current_task": None,
         "status": "idle",
@@ -446,17 +625,55 @@ async def clear_all_data():
         "message": "",
         "results": {}
     }
+    progress_broker.reset()
+    progress_broker.publish("resync", {"reason": "data cleared"})
     return {"message": "All data cleared successfully"}
 
 @app.get("/api/export/leads")
-async def export_leads():
+async def export_leads(request: Request):
     """Export leads data as JSON"""
-    return {
+    not_modified = not_modified_response(request, data_version)
+    if not_modified:
+        return not_modified
+    envelope = {
         "export_type": "leads",
         "exported_at": datetime.now().isoformat(),
-        "data": leads_storage,
         "count": len(leads_storage)
     }
+    return FastJSONResponse(with_encoded_field(envelope, "data", leads_storage.encoded_array()),
+                            headers=data_version.headers())
+
+@app.get("/api/db/snapshots/{table}")
+async def export_database_snapshot(
+    table: str = Path(..., pattern="^(leads|companies)$"),
+    since: Optional[str] = Query(None, description="X-Snapshot-Watermark of the previous snapshot"),
+    format: Optional[str] = Query(None, pattern="^(parquet|csv)$", description="default: parquet if available")
+):
+    """
+    Columnar snapshot of the leads database (Parquet, or gzipped CSV with the column types in
+    X-Snapshot-Schema), with only the rows updated since ``since`` for incremental refreshes.
+    The file is written to a scratch directory (under SNAPSHOT_DIR, if set) that is
+    deleted once the response has been sent, so repeated pulls do not accumulate files.
+    """
+    parent = os.getenv("SNAPSHOT_DIR") or None
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    scratch = tempfile.mkdtemp(prefix=f"{table}-snapshot-", dir=parent)
+    try:
+        manifest = await component("async_database").export_snapshot(table, scratch, since=since, format=format)
+    except BaseException as e:
+        shutil.rmtree(scratch, ignore_errors=True)
+        if isinstance(e, ValueError):
+            raise HTTPException(status_code=400, detail=str(e))
+        raise
+    path = os.path.join(scratch, manifest["file"])
+    media_type = "application/vnd.apache.parquet" if manifest["format"] == "parquet" else "application/gzip"
+    return FileResponse(path, media_type=media_type, filename=manifest["file"],
+                        background=BackgroundTask(shutil.rmtree, scratch, ignore_errors=True), headers={
+        "X-Snapshot-Watermark": manifest["watermark"],
+        "X-Snapshot-Rows": str(manifest["rows"]),
+        "X-Snapshot-Schema": dumps({column["name"]: column["type"] for column in manifest["columns"]}).decode(),
+    })
 
 # Error handlers
 @app.exception_handler(Exception)
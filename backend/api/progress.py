@@ -0,0 +1,146 @@
+"""
+Server-Sent Events progress feed.
+
+The pipeline publishes progress, per-lead and dashboard messages to a
+ProgressBroker; every open /api/stream connection gets its own bounded queue,
+so the cost of a run no longer depends on how many dashboards are polling.
+Messages carry increasing ids: a reconnecting client sends ``Last-Event-ID`` and
+receives what it missed from a short history, or a ``resync`` message when it
+fell too far behind and should refetch the REST endpoints.
+"""
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+Message = Tuple[int, str, Dict]  # (id, event type, data)
+
+
+def format_sse(message: Message) -> str:
+    """Encode a message in the text/event-stream wire format"""
+    message_id, event, data = message
+    return f"id: {message_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class Subscription:
+    """One connected client: a bounded queue fed by the broker"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int, start_id: int = 0):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        # Id of the last message published before subscribing
+        self.start_id = start_id
+
+    def deliver(self, message: Message):
+        if self.queue.full():
+            # Slow consumer: drop the backlog and ask it to refetch instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = (message[0], "resync", {"reason": "client fell behind"})
+        self.queue.put_nowait(message)
+
+
+class ProgressBroker:
+    """Fan-out publisher for pipeline progress messages"""
+
+    def __init__(self, history_size: int = 1000, queue_size: int = 1000):
+        self.queue_size = queue_size
+        self._history: Deque[Message] = deque(maxlen=history_size)
+        self._subscribers: List[Subscription] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, Dict] = {}
+        self._last_delta: Dict[str, float] = {}
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict) -> Message:
+        """Send a message to every subscriber (safe to call from any thread)"""
+        with self._lock:
+            message = (next(self._ids), event, data)
+            self._history.append(message)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is subscription.loop:
+                subscription.deliver(message)
+            elif not subscription.loop.is_closed():
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+        return message
+
+    def publish_delta(self, event: str, snapshot: Union[Dict, Callable[[], Dict]], min_interval: float = 0.5,
+                      force: bool = False):
+        """
+        Publish only the fields of ``snapshot`` that changed since the last delta for ``event``,
+        at most once per ``min_interval`` seconds unless ``force`` is set
+        ``snapshot`` may be a function computing it, called only when a delta is due.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_delta.get(event, float("-inf")) < min_interval:
+            return None
+        if callable(snapshot):
+            snapshot = snapshot()
+        previous = self._snapshots.get(event, {})
+        changed = {key: value for key, value in snapshot.items() if previous.get(key) != value}
+        self._snapshots[event] = dict(snapshot)
+        self._last_delta[event] = now
+        return self.publish(event, changed) if changed else None
+
+    def reset(self):
+        """Forget delta snapshots (e.g. after the stores were cleared)"""
+        self._snapshots.clear()
+        self._last_delta.clear()
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """Register a subscriber on the running loop, replaying messages after ``last_event_id``"""
+        with self._lock:
+            latest_id = self._history[-1][0] if self._history else 0
+            subscription = Subscription(asyncio.get_running_loop(), self.queue_size, latest_id)
+            if last_event_id is not None:
+                expired = bool(self._history) and self._history[0][0] > last_event_id + 1
+                # An id from the future means the server restarted since the client's last message
+                if expired or last_event_id > latest_id:
+                    subscription.deliver((latest_id, "resync", {"reason": "history unavailable"}))
+                else:
+                    for message in self._history:
+                        if message[0] > last_event_id:
+                            subscription.deliver(message)
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    async def stream(self, subscription: Subscription, initial: List[Tuple[str, Dict]] = (),
+                     heartbeat: float = 15.0, is_disconnected=None) -> AsyncIterator[str]:
+        """
+        Yield SSE-encoded messages for a subscription until the client disconnects
+        Args:
+            initial: (event, data) snapshots sent first, e.g. current status and dashboard
+            heartbeat: seconds between keep-alive comments when idle
+            is_disconnected: optional coroutine function polled on every heartbeat
+        """
+        try:
+            for event, data in initial:
+                yield format_sse((subscription.start_id, event, data))
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(message)
+        finally:
+            self.unsubscribe(subscription)
@@ -0,0 +1,74 @@
+"""
+Fast JSON encoding for large API payloads.
+
+Endpoints returning many records bypass FastAPI's ``jsonable_encoder`` (which
+walks and copies every nested value in Python) and encode directly with orjson
+when it is installed, falling back to the stdlib encoder otherwise. Records
+that rarely change can be encoded once and spliced into later responses as
+pre-encoded rows.
+"""
+import dataclasses
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterable
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def _default(value: Any):
+    """Encode types neither encoder handles natively (and dataclasses/dates for the stdlib one)"""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "dict"):
+        return value.dict()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON for ``content``"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_array(rows: Iterable[bytes]) -> bytes:
+    """Join pre-encoded JSON values into a JSON array"""
+    return b"[" + b",".join(rows) + b"]"
+
+
+def with_encoded_field(envelope: Dict, field: str, encoded: bytes) -> bytes:
+    """Encode ``envelope`` with ``field`` set to an already encoded JSON value"""
+    body = dumps(envelope)
+    separator = b"," if len(body) > 2 else b""
+    return body[:-1] + separator + dumps(field) + b":" + encoded + b"}"
+
+
+def merge_encoded(row: bytes, extra: Dict) -> bytes:
+    """Add the fields of ``extra`` to an encoded JSON object"""
+    if not extra:
+        return row
+    if row == b"{}":
+        return dumps(extra)
+    return row[:-1] + b"," + dumps(extra)[1:]
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (if installed); accepts pre-encoded bytes as content"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
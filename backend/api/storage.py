@@ -0,0 +1,124 @@
+"""
+In-memory record stores backing the API.
+
+Each store is a list (so existing endpoints can filter, slice, encode and clear
+it) with an index from record key to position; list mutators that would move
+records out from under that index (insert, remove, pop, del, sort, ...) raise. Writes are upserts: storing a record
+whose key is already present replaces it in place, so reruns of the pipeline
+update existing leads instead of appending duplicates. Stores created with
+``cache_encoded`` keep each record's JSON encoding until it is replaced, so
+large list responses only encode records that changed.
+"""
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from backend.api.conditional import DataVersion
+from backend.api.responses import dumps, json_array
+
+
+def field_key(field: str) -> Callable[[Any], Any]:
+    """Key function reading ``field`` from dict records or attribute-style records (e.g. Event)"""
+    return lambda record: record.get(field) if isinstance(record, dict) else getattr(record, field, None)
+
+
+class RecordStore(list):
+    """List of records with O(1) lookup and upsert by key"""
+
+    def __init__(self, key: Callable[[Any], Any], preserve: Sequence[str] = (), cache_encoded: bool = False,
+                 version: Optional[DataVersion] = None):
+        """
+        Args:
+            key: function returning the identity of a record
+            preserve: dict fields kept from the stored record on update (e.g. created_at)
+            cache_encoded: cache the JSON encoding of each record (records must then
+                only be changed through upsert, never mutated in place)
+            version: DataVersion bumped on every write (shared by the API's stores)
+        """
+        super().__init__()
+        self.key = key
+        self.preserve = tuple(preserve)
+        self.cache_encoded = cache_encoded
+        self.version = version
+        self._positions: Dict[Any, int] = {}
+        self._encoded: Dict[Any, bytes] = {}
+        self._encoded_array: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    def upsert(self, record) -> bool:
+        """Insert or replace a record; returns True when it was new"""
+        record_key = self.key(record)
+        with self._lock:
+            position = self._positions.get(record_key)
+            self._encoded_array = None
+            if self.version is not None:
+                self.version.bump()
+            if position is None:
+                self._positions[record_key] = len(self)
+                super().append(record)
+                return True
+            if self.preserve and isinstance(record, dict):
+                existing = self[position]
+                record.update({field: existing[field] for field in self.preserve if field in existing})
+            super().__setitem__(position, record)
+            self._encoded.pop(record_key, None)
+            return False
+
+    def append(self, record):
+        self.upsert(record)
+
+    def extend(self, records: Iterable):
+        for record in records:
+            self.upsert(record)
+
+    def __iadd__(self, records: Iterable):
+        self.extend(records)
+        return self
+
+    def _unsupported(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} only changes through upsert/append/extend/clear")
+
+    # Would desynchronize the key -> position index and the encoding cache
+    __setitem__ = __delitem__ = __imul__ = _unsupported
+    insert = remove = pop = sort = reverse = _unsupported
+
+    def get(self, record_key, default=None) -> Optional[Any]:
+        position = self._positions.get(record_key)
+        return self[position] if position is not None else default
+
+    def encoded(self, records: Optional[Iterable] = None) -> List[bytes]:
+        """JSON encoding of each record (all records by default), reusing cached encodings"""
+        records = self if records is None else records
+        if not self.cache_encoded:
+            return [dumps(record) for record in records]
+        rows = []
+        for record in records:
+            record_key = self.key(record)
+            if self.get(record_key) is not record:
+                rows.append(dumps(record))
+                continue
+            row = self._encoded.get(record_key)
+            if row is None:
+                row = dumps(record)
+                with self._lock:
+                    if self.get(record_key) is record:
+                        self._encoded[record_key] = row
+            rows.append(row)
+        return rows
+
+    def encoded_array(self) -> bytes:
+        """JSON array of all records, kept until the next write when ``cache_encoded`` is set"""
+        encoded = self._encoded_array
+        if encoded is None:
+            encoded = json_array(self.encoded())
+            if self.cache_encoded:
+                self._encoded_array = encoded
+        return encoded
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            self._positions.clear()
+            self._encoded.clear()
+            self._encoded_array = None
+            if self.version is not None:
+                self.version.bump()
@@ -0,0 +1,62 @@
+"""
+Scheduled lead archival.
+
+Closed and stale leads would otherwise stay in the leads table forever, and
+every list query and dashboard aggregate over it would keep paying for them.
+ArchiveScheduler runs DatabaseManager.archive_leads on an interval (through
+AsyncDatabase, so on its writer thread) to move them into leads_archive.
+
+    scheduler = ArchiveScheduler(async_database, interval=3600)
+    scheduler.start()
+    ...
+    await scheduler.stop()
+"""
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from backend.database.async_db import AsyncDatabase
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveScheduler:
+    """Archives closed and stale leads every ``interval`` seconds"""
+
+    def __init__(self, database: AsyncDatabase, interval: float, closed_after_days: Optional[float] = 30,
+                 stale_after_days: Optional[float] = 365):
+        self.database = database
+        self.interval = interval
+        self.closed_after_days = closed_after_days
+        self.stale_after_days = stale_after_days
+        self.last_result: Optional[Dict[str, int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> Dict[str, int]:
+        """Archive what is due now"""
+        self.last_result = await self.database.archive_leads(closed_after_days=self.closed_after_days,
+                                                             stale_after_days=self.stale_after_days)
+        return self.last_result
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Lead archival failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> asyncio.Task:
+        """Start archiving on the running event loop (first run immediately)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
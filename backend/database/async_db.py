@@ -0,0 +1,62 @@
+"""
+Async access to DatabaseManager for FastAPI handlers.
+
+sqlite3 calls block, so awaiting them directly in ``async def`` endpoints would
+stall the event loop. AsyncDatabase runs DatabaseManager methods on threads
+instead: reads on a small pool of reader threads, each keeping its own
+connection, and writes on a single writer thread, so its writes are serialized
+(SQLite allows one writer at a time). Other connections may write too (the
+pipeline's WriteBehindQueue has its own writer); a write then waits up to the
+manager's ``busy_timeout`` for the other transaction. The database is switched
+to WAL mode, so readers keep reading while a write commits.
+
+    db = AsyncDatabase(DatabaseManager("data/leads.db", connection_per_thread=True))
+    page = await db.get_leads(status="new", limit=50)
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from backend.database.models import DatabaseManager
+
+# DatabaseManager methods run on the reader pool; all others run on the writer thread
+READ_PREFIXES = ("get_", "search", "export_")
+
+
+class AsyncDatabase:
+    """Awaitable DatabaseManager: ``await db.get_leads(...)``, ``await db.create_lead(...)``"""
+
+    def __init__(self, manager: DatabaseManager, readers: int = 4):
+        self.manager = manager
+        self.wal_enabled = manager.enable_wal()
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-reader")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
+    async def read(self, func: Callable, *args, **kwargs) -> Any:
+        """Run ``func`` (which reads through self.manager) on a reader thread"""
+        return await self._run(self._readers, func, *args, **kwargs)
+
+    async def write(self, func: Callable, *args, **kwargs) -> Any:
+        """Run ``func`` (which writes through self.manager) on the writer thread"""
+        return await self._run(self._writer, func, *args, **kwargs)
+
+    async def _run(self, executor: ThreadPoolExecutor, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name: str):
+        method = getattr(self.manager, name)
+        if not callable(method):
+            return method
+        run = self.read if name.startswith(READ_PREFIXES) else self.write
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            return await run(method, *args, **kwargs)
+        return call
+
+    def close(self):
+        """Stop the reader and writer threads (their connections close with them)"""
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
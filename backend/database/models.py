@@ -1,10 +1,160 @@
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+from dataclasses import dataclass, asdict, fields
+from typing import List, Dict, Optional, Any, Tuple, Union
+from datetime import datetime, timedelta, timezone
+import html
 import json
+import re
 import sqlite3
 import logging
+import threading
 
+# Full-text indexes: kind -> (FTS5 table, content table, indexed columns)
+SEARCH_INDEXES = {
+    "companies": ("companies_fts", "companies", ("name", "description")),
+    "leads": ("leads_fts", "leads", ("rationale", "notes", "outreach_subject", "outreach_message")),
+}
+
+# Indexes matched to the queries below (checked by backend/devtools/query_plans.py):
+# filters first, then the ORDER BY column, so no query needs a separate sort step
+INDEXES = {
+    "idx_events_relevance": "events(relevance_score DESC)",
+    # Pages in (score DESC, id) order; name makes it cover the dashboard's top companies
+    "idx_companies_score_page": "companies(qualification_score DESC, id, name)",
+    "idx_stakeholders_company_score": "stakeholders(company_id, decision_maker_score DESC)",
+    "idx_leads_status_score": "leads(status, overall_score DESC)",
+    "idx_leads_priority": "leads(priority)",
+    "idx_leads_score_desc": "leads(overall_score DESC)",
+    "idx_company_technologies_lookup": "company_technologies(technology, qualification_score DESC, company_id)",
+    "idx_company_news_recorded": "company_news(recorded_at, company_id)",
+    # Finds leads due for archiving (archive_leads) and rows changed since a snapshot watermark
+    "idx_leads_updated": "leads(updated_at)",
+    "idx_leads_archive_updated": "leads_archive(updated_at)",
+    "idx_companies_updated": "companies(updated_at)",
+    "idx_leads_archive_status_score": "leads_archive(status, overall_score DESC)",
+    "idx_leads_archive_score": "leads_archive(overall_score DESC)",
+    # Pipeline reruns look up archived leads by external_id (upsert_lead)
+    "idx_leads_archive_external_id": "leads_archive(external_id)",
+}
+# Score columns list queries page on: table -> (column, key columns of a row). Kept
+# non-NULL (NULL is stored as 0.0) so the last row of a page always gives a cursor
+SCORE_COLUMNS = {
+    "events": ("relevance_score", ("id",)),
+    "companies": ("qualification_score", ("id",)),
+    "company_technologies": ("qualification_score", ("company_id", "technology")),
+    "leads": ("overall_score", ("id",)),
+    "leads_archive": ("overall_score", ("id",)),
+}
+# Superseded by the composite indexes above (companies.name already has its UNIQUE index)
+OBSOLETE_INDEXES = ("idx_companies_name", "idx_companies_score", "idx_stakeholders_company", "idx_leads_status",
+                    "idx_companies_score_name", "idx_leads_score")
+
+class Page(list):
+    """
+    One page of a list query. ``next_cursor`` holds the keyword arguments for the
+    next page (``after_score``, ``after_id``), or None on the last page
+    """
+
+    def __init__(self, rows=(), next_cursor: Optional[Dict[str, Any]] = None):
+        super().__init__(rows)
+        self.next_cursor = next_cursor
+
+def keyset(score_column: str, id_column: str, after_score: Optional[float],
+           after_id: Optional[int]) -> Tuple[str, List[Any]]:
+    """
+    SQL condition and parameters for rows after (after_score, after_id) in
+    ``score DESC, id`` order; the leading ``score <= ?`` lets SQLite seek in the
+    score index, so a deep page costs the same as the first. Score columns are
+    never NULL (see SCORE_COLUMNS), which this condition would skip
+    """
+    if after_score is None or after_id is None:
+        return "", []
+    return (f"{score_column} <= ? AND ({score_column} < ? OR {id_column} > ?)",
+            [after_score, after_score, after_id])
+
+def paginate(conn, query: str, params: List[Any], limit: Optional[int], score_field: str, row_factory) -> Page:
+    """Run ``query`` (already ordered by score DESC, id) for one page of models built by ``row_factory``"""
+    cursor = conn.cursor()
+    cursor.row_factory = row_factory
+    if not limit:
+        return Page(cursor.execute(query, params).fetchall())
+    rows = cursor.execute(query + " LIMIT ?", params + [limit + 1]).fetchall()
+    if len(rows) <= limit:
+        return Page(rows)
+    last = rows[limit - 1]
+    return Page(rows[:limit], {"after_score": getattr(last, score_field), "after_id": last.id})
+
+def timestamp(value: Union[str, datetime]) -> str:
+    """A datetime (naive ones are taken as UTC) in the format of SQLite's CURRENT_TIMESTAMP"""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+def fts_query(text: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word must match, the last one as a prefix
+    (quoting keeps FTS5 operators and punctuation in user input from being parsed as syntax)
+    """
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+def highlight(snippet: Optional[str]) -> str:
+    """HTML-escape an FTS snippet whose matches are delimited by \x02/\x03, wrapping them in <mark>"""
+    return html.escape(snippet or "").replace("\x02", "<mark>").replace("\x03", "</mark>")
+
+def slotted(cls):
+    """
+    Rebuild a dataclass with ``__slots__`` instead of a per-instance ``__dict__``
+    (what ``@dataclass(slots=True)`` does on Python 3.10+)
+    """
+    names = tuple(field.name for field in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    # Callers reading ``obj.__dict__``/``vars(obj)`` get a snapshot of the fields
+    namespace["__dict__"] = property(lambda self: {name: getattr(self, name) for name in names})
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+class EncodedJSON(str):
+    """Raw text of a JSON list column, stored in a model field until the field is first read"""
+    __slots__ = ()
+
+class JSONField:
+    """
+    Descriptor wrapping a slotted model field that holds a JSON list: reading it
+    decodes EncodedJSON (and None) into a plain list, stored back in the slot
+    """
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, owner)
+        if value is None or type(value) is EncodedJSON:
+            value = json.loads(value) if value else []
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+
+def json_fields(*names):
+    """Class decorator decoding the given fields of a slotted model on first access (see JSONField)"""
+    def decorate(cls):
+        for name in names:
+            setattr(cls, name, JSONField(cls.__dict__[name]))
+        cls._json_fields = names
+        return cls
+    return decorate
+
+@slotted
 @dataclass
 class Event:
     id: Optional[int] = None
@@ -19,6 +169,8 @@ class Event:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
+@json_fields("technologies", "recent_news")
+@slotted
 @dataclass
 class Company:
     id: Optional[int] = None
@@ -37,12 +189,7 @@ class Company:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    def __post_init__(self):
-        if self.technologies is None:
-            self.technologies = []
-        if self.recent_news is None:
-            self.recent_news = []
-
+@slotted
 @dataclass
 class Stakeholder:
     id: Optional[int] = None
@@ -58,6 +205,7 @@ class Stakeholder:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
+@slotted
 @dataclass
 class Lead:
     id: Optional[int] = None
@@ -71,16 +219,158 @@ class Lead:
     outreach_subject: str = ""
     outreach_message: str = ""
     notes: str = ""
+    external_id: Optional[str] = None  # id of the lead in the pipeline/API (lead_<hash>)
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None  # set on leads read from leads_archive
     # Composite fields (populated via joins)
     event_name: Optional[str] = None
     company_name: Optional[str] = None
     stakeholder_name: Optional[str] = None
+    # Highest decision_maker_score stakeholder of the company (get_leads(with_decision_maker=True))
+    decision_maker_name: Optional[str] = None
+    decision_maker_title: Optional[str] = None
+
+def select_list(model, alias: str = "", expressions: Optional[Dict[str, str]] = None) -> str:
+    """SELECT list of ``model``'s fields in declaration order, so rows map positionally onto the model"""
+    expressions = expressions or {}
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(expressions.get(field.name, prefix + field.name) for field in fields(model))
+
+def model_row(model):
+    """sqlite3 row factory building ``model`` from a positional row; JSON columns are decoded on first access"""
+    lazy = getattr(model, "_json_fields", ())
+    positions = [index for index, field in enumerate(fields(model)) if field.name in lazy]
+    if not positions:
+        return lambda cursor, row: model(*row)
+
+    def build(cursor, row):
+        values = list(row)
+        for index in positions:
+            if values[index] is not None:
+                values[index] = EncodedJSON(values[index])
+        return model(*values)
+    return build
+
+EVENT_COLUMNS = select_list(Event)
+COMPANY_COLUMNS = select_list(Company, "c", {"key_contacts": "NULL"})
+STAKEHOLDER_COLUMNS = select_list(Stakeholder)
+LEAD_JOINED = {"event_name": "e.name", "company_name": "c.name", "stakeholder_name": "s.name"}
+LEAD_ARCHIVE_COLUMNS = select_list(Lead, "l", dict(LEAD_JOINED, decision_maker_name="NULL",
+                                                   decision_maker_title="NULL"))
+LEAD_ARCHIVE_VIEW_COLUMNS = select_list(Lead, "l", dict(LEAD_JOINED, decision_maker_name="dm.name",
+                                                        decision_maker_title="dm.title"))
+# The leads table has no archived_at column
+LEAD_COLUMNS = select_list(Lead, "l", dict(LEAD_JOINED, archived_at="NULL", decision_maker_name="NULL",
+                                           decision_maker_title="NULL"))
+LEAD_VIEW_COLUMNS = select_list(Lead, "l", dict(LEAD_JOINED, archived_at="NULL", decision_maker_name="dm.name",
+                                                decision_maker_title="dm.title"))
+EVENT_ROW = model_row(Event)
+COMPANY_ROW = model_row(Company)
+STAKEHOLDER_ROW = model_row(Stakeholder)
+LEAD_ROW = model_row(Lead)
+
+COMPANY_UPDATE_FIELDS = {"website": "''", "industry": "''", "size": "''", "revenue": "''", "location": "''",
+                         "description": "''", "linkedin_url": "''", "technologies": "'[]'", "recent_news": "'[]'",
+                         "qualification_score": "0"}  # field -> its empty value
+
+# Writes on an open connection, without committing (shared by DatabaseManager and
+# WriteBehindQueue, which commits many of them together)
+def upsert_company(conn, company: Company, keep_filled: bool = False) -> int:
+    """
+    Insert a company, or update the one with the same name; returns its ID.
+    With ``keep_filled``, empty fields of ``company`` keep the stored values (for
+    partial records, e.g. a pipeline company before and after enrichment)
+    """
+    if keep_filled:
+        updates = ", ".join(f"{field} = COALESCE(NULLIF(excluded.{field}, {empty}), companies.{field})"
+                            for field, empty in COMPANY_UPDATE_FIELDS.items())
+    else:
+        updates = ", ".join(f"{field} = excluded.{field}" for field in COMPANY_UPDATE_FIELDS)
+    # An upsert rather than INSERT OR REPLACE: REPLACE deletes the row without
+    # firing delete triggers (leaving the search index stale) and changes its id
+    conn.execute(f"""
+        INSERT INTO companies
+        (name, website, industry, size, revenue, location, description,
+         linkedin_url, technologies, recent_news, qualification_score)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+    """, (company.name, company.website, company.industry, company.size,
+          company.revenue, company.location, company.description,
+          company.linkedin_url, json.dumps(list(company.technologies or [])),
+          json.dumps(list(company.recent_news or [])), company.qualification_score))
+    return conn.execute("SELECT id FROM companies WHERE name = ?", (company.name,)).fetchone()[0]
+
+def upsert_lead(conn, lead: Lead) -> int:
+    """
+    Insert a lead, or update the one with the same external_id (keeping its status,
+    notes and, unless new text is given, rationale and outreach); returns its ID.
+    An archived lead with that external_id is left in the archive if it is closed,
+    otherwise (archived as stale) it is restored and updated.
+    Without a company_id, the lead is linked to the company named company_name.
+    """
+    if lead.external_id is not None:
+        archived = conn.execute("SELECT id, status, priority FROM leads_archive WHERE external_id = ?",
+                                (lead.external_id,)).fetchone()
+        if archived is not None:
+            if archived[1] == "closed":
+                return archived[0]
+            restore_lead(conn, *archived)
+    company_id = lead.company_id
+    if company_id is None and lead.company_name:
+        row = conn.execute("SELECT id FROM companies WHERE name = ?", (lead.company_name,)).fetchone()
+        company_id = row[0] if row else None
+    cursor = conn.execute("""
+        INSERT INTO leads
+        (event_id, company_id, stakeholder_id, status, priority, overall_score,
+         rationale, outreach_subject, outreach_message, notes, external_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(external_id) DO UPDATE SET
+            event_id = excluded.event_id, company_id = excluded.company_id,
+            stakeholder_id = excluded.stakeholder_id, priority = excluded.priority,
+            overall_score = excluded.overall_score,
+            rationale = COALESCE(NULLIF(excluded.rationale, ''), leads.rationale),
+            outreach_subject = COALESCE(NULLIF(excluded.outreach_subject, ''), leads.outreach_subject),
+            outreach_message = COALESCE(NULLIF(excluded.outreach_message, ''), leads.outreach_message),
+            updated_at = CURRENT_TIMESTAMP
+    """, (lead.event_id, company_id, lead.stakeholder_id, lead.status,
+          lead.priority, lead.overall_score, lead.rationale,
+          lead.outreach_subject, lead.outreach_message, lead.notes, lead.external_id))
+    if lead.external_id is None:
+        return cursor.lastrowid
+    return conn.execute("SELECT id FROM leads WHERE external_id = ?", (lead.external_id,)).fetchone()[0]
+
+def restore_lead(conn, lead_id: int, status: Optional[str], priority: Optional[str]):
+    """Move an archived lead back into the leads table (same id, status and notes)"""
+    columns = ", ".join(row[1] for row in conn.execute("PRAGMA table_info(leads)"))
+    conn.execute(f"INSERT INTO leads ({columns}) SELECT {columns} FROM leads_archive WHERE id = ?", (lead_id,))
+    conn.execute("DELETE FROM leads_archive WHERE id = ?", (lead_id,))
+    conn.execute("UPDATE lead_archive_counts SET leads = leads - 1 WHERE status = ? AND priority = ?",
+                 (status or "", priority or ""))
+
+def update_lead_outreach(conn, external_id: str, subject: str, message: str) -> bool:
+    """Store generated outreach on the lead with this external_id; False if there is none"""
+    cursor = conn.execute("""
+        UPDATE leads SET outreach_subject = ?, outreach_message = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE external_id = ?
+    """, (subject, message, external_id))
+    return cursor.rowcount > 0
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "data/leads.db"):
+    def __init__(self, db_path: str = "data/leads.db", connection_per_thread: bool = False,
+                 busy_timeout: float = 30.0):
+        """
+        Args:
+            connection_per_thread: keep one open connection per thread instead of
+                connecting on every call (for long-lived thread pools, see AsyncDatabase)
+            busy_timeout: seconds a write waits for another connection's write
+                transaction (e.g. AsyncDatabase's and WriteBehindQueue's writers)
+                before failing with "database is locked"
+        """
         self.db_path = db_path
+        self.connection_per_thread = connection_per_thread
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
         self.logger = self._setup_logging()
         self.init_database()
 
@@ -90,10 +380,28 @@ class DatabaseManager:
 
     def get_connection(self):
         """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        if self.connection_per_thread:
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._local.conn = self._connect()
+            return conn
+        return self._connect()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
         conn.row_factory = sqlite3.Row  # Enable dict-like access
         return conn
 
+    def enable_wal(self) -> bool:
+        """
+        Switch the database file to write-ahead logging, so readers are not blocked by
+        a writer (the mode persists in the file). Returns False if it is unsupported,
+        e.g. for in-memory databases
+        """
+        with self.get_connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        return mode.lower() == "wal"
+
     def init_database(self):
         """Initialize database with all tables"""
         with self.get_connection() as conn:
@@ -164,6 +472,7 @@ class DatabaseManager:
                     outreach_subject TEXT,
                     outreach_message TEXT,
                     notes TEXT,
+                    external_id TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY (event_id) REFERENCES events (id),
@@ -171,16 +480,193 @@ class DatabaseManager:
                     FOREIGN KEY (stakeholder_id) REFERENCES stakeholders (id)
                 )
             """)
+            # Columns added after the first release
+            lead_columns = {row[1] for row in conn.execute("PRAGMA table_info(leads)")}
+            if "external_id" not in lead_columns:
+                conn.execute("ALTER TABLE leads ADD COLUMN external_id TEXT")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_leads_external_id ON leads(external_id)")
+            self._init_company_attributes(conn)
+            self._init_archive(conn)
+            self._init_score_defaults(conn)
             # Create indexes for better performance
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_companies_name ON companies(name)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_companies_score ON companies(qualification_score)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_stakeholders_company ON stakeholders(company_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_status ON leads(status)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_priority ON leads(priority)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_leads_score ON leads(overall_score)")
+            for index in OBSOLETE_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {index}")
+            for index, definition in INDEXES.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {definition}")
+            self.search_enabled = self._init_search(conn)
             conn.commit()
         self.logger.info("Database initialized successfully")
 
+    def _init_archive(self, conn):
+        """
+        Create leads_archive, where archive_leads moves closed and stale leads (same
+        columns as leads, ids kept), and the per status/priority counts of its rows
+        """
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS leads_archive (
+                id INTEGER PRIMARY KEY,
+                event_id INTEGER,
+                company_id INTEGER,
+                stakeholder_id INTEGER,
+                status TEXT,
+                priority TEXT,
+                overall_score REAL,
+                rationale TEXT,
+                outreach_subject TEXT,
+                outreach_message TEXT,
+                notes TEXT,
+                external_id TEXT,
+                created_at TIMESTAMP,
+                updated_at TIMESTAMP,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # Kept up to date by archive_leads, so dashboard totals never scan the archive
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS lead_archive_counts (
+                status TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                leads INTEGER NOT NULL,
+                PRIMARY KEY (status, priority)
+            ) WITHOUT ROWID
+        """)
+
+    def _init_score_defaults(self, conn):
+        """
+        Keep SCORE_COLUMNS non-NULL: SQLite cannot add NOT NULL to an existing
+        column, so triggers store 0.0 in place of a NULL written by any statement
+        """
+        for table, (column, key) in SCORE_COLUMNS.items():
+            row = " AND ".join(f"{name} = new.{name}" for name in key)
+            for action, event in (("insert", "INSERT"), ("update", f"UPDATE OF {column}")):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_{column}_{action}_not_null AFTER {event} ON {table}
+                    WHEN new.{column} IS NULL BEGIN
+                        UPDATE {table} SET {column} = 0.0 WHERE {row};
+                    END
+                """)
+            # Rows written before the triggers existed (company_technologies follows
+            # companies through companies_score_update)
+            if table != "company_technologies":
+                conn.execute(f"UPDATE {table} SET {column} = 0.0 WHERE {column} IS NULL")
+
+    def _init_company_attributes(self, conn):
+        """
+        Create the tables normalizing companies.technologies and recent_news (JSON
+        arrays) into one row per value, and the triggers keeping them in sync
+        """
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'company_technologies'").fetchone()
+        # qualification_score is copied in so technology-filtered lists are read in score order from the index
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS company_technologies (
+                company_id INTEGER NOT NULL,
+                technology TEXT NOT NULL COLLATE NOCASE,
+                qualification_score REAL DEFAULT 0.0,
+                PRIMARY KEY (company_id, technology)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS company_news (
+                company_id INTEGER NOT NULL,
+                headline TEXT NOT NULL,
+                recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (company_id, headline)
+            ) WITHOUT ROWID
+        """)
+        # ON CONFLICT DO NOTHING rather than INSERT OR IGNORE: inside a trigger, OR IGNORE is
+        # overridden by the conflict policy of the statement firing it (ABORT for create_company's upsert)
+        technologies = """
+            INSERT INTO company_technologies (company_id, technology, qualification_score)
+            SELECT new.id, value, new.qualification_score
+            FROM json_each(CASE WHEN json_valid(new.technologies) THEN new.technologies END) WHERE type = 'text'
+            ON CONFLICT DO NOTHING;
+        """
+        news = """
+            INSERT INTO company_news (company_id, headline)
+            SELECT new.id, value
+            FROM json_each(CASE WHEN json_valid(new.recent_news) THEN new.recent_news END) WHERE type = 'text'
+            ON CONFLICT DO NOTHING;
+        """
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS companies_attributes_insert AFTER INSERT ON companies BEGIN {technologies} {news} END")
+        # Values still listed keep their row (and the news its recorded_at); dropped ones are removed
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS companies_technologies_update AFTER UPDATE OF technologies ON companies BEGIN
+                DELETE FROM company_technologies WHERE company_id = old.id AND technology NOT IN (
+                    SELECT value FROM json_each(CASE WHEN json_valid(new.technologies) THEN new.technologies END));
+                {technologies}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS companies_news_update AFTER UPDATE OF recent_news ON companies BEGIN
+                DELETE FROM company_news WHERE company_id = old.id AND headline NOT IN (
+                    SELECT value FROM json_each(CASE WHEN json_valid(new.recent_news) THEN new.recent_news END));
+                {news}
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS companies_score_update AFTER UPDATE OF qualification_score ON companies BEGIN
+                UPDATE company_technologies SET qualification_score = new.qualification_score WHERE company_id = new.id;
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS companies_attributes_delete AFTER DELETE ON companies BEGIN
+                DELETE FROM company_technologies WHERE company_id = old.id;
+                DELETE FROM company_news WHERE company_id = old.id;
+            END
+        """)
+        if not exists:
+            # Normalize rows written before these tables existed
+            conn.execute("""
+                INSERT OR IGNORE INTO company_technologies (company_id, technology, qualification_score)
+                SELECT c.id, j.value, c.qualification_score
+                FROM companies c, json_each(CASE WHEN json_valid(c.technologies) THEN c.technologies END) j
+                WHERE j.type = 'text'
+            """)
+            conn.execute("""
+                INSERT OR IGNORE INTO company_news (company_id, headline, recorded_at)
+                SELECT c.id, j.value, COALESCE(c.updated_at, CURRENT_TIMESTAMP)
+                FROM companies c, json_each(CASE WHEN json_valid(c.recent_news) THEN c.recent_news END) j
+                WHERE j.type = 'text'
+            """)
+
+    def _init_search(self, conn) -> bool:
+        """Create the FTS5 indexes and the triggers keeping them in sync (False if FTS5 is unavailable)"""
+        for fts_table, table, columns in SEARCH_INDEXES.values():
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts_table,)).fetchone()
+            column_list = ", ".join(columns)
+            new_values = ", ".join(f"new.{column}" for column in columns)
+            old_values = ", ".join(f"old.{column}" for column in columns)
+            try:
+                # External content: the index stores only tokens, text stays in the base table
+                conn.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                        {column_list}, content='{table}', content_rowid='id', tokenize='porter unicode61'
+                    )
+                """)
+            except sqlite3.OperationalError as e:
+                self.logger.warning(f"Full-text search disabled, FTS5 unavailable: {e}")
+                return False
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+                END
+            """)
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                END
+            """)
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {column_list} ON {table} BEGIN
+                    INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                    INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+                END
+            """)
+            if not exists:
+                # Index rows written before search existed
+                conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        return True
+
     # Event methods
     def create_event(self, event: Event) -> int:
         """Create new event and return ID"""
@@ -196,98 +682,66 @@ class DatabaseManager:
             conn.commit()
             return event_id
 
-    def get_events(self, limit: int = None) -> List[Event]:
-        """Get all events"""
+    def get_events(self, limit: int = None, after_score: float = None, after_id: int = None) -> Page:
+        """Get events by relevance, ``limit`` at a time after the given cursor"""
         with self.get_connection() as conn:
-            query = "SELECT * FROM events ORDER BY relevance_score DESC"
-            if limit:
-                query += f" LIMIT {limit}"
-            rows = conn.execute(query).fetchall()
-            events = []
-            for row in rows:
-                event = Event(
-                    id=row['id'],
-                    name=row['name'],
-                    date=row['date'],
-                    location=row['location'],
-                    industry=row['industry'],
-                    website=row['website'],
-                    description=row['description'],
-                    relevance_score=row['relevance_score'],
-                    exhibitors_count=row['exhibitors_count'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at']
-                )
-                events.append(event)
-            return events
+            condition, params = keyset("relevance_score", "id", after_score, after_id)
+            query = f"SELECT {EVENT_COLUMNS} FROM events"
+            if condition:
+                query += f" WHERE {condition}"
+            query += " ORDER BY relevance_score DESC, id"
+            return paginate(conn, query, params, limit, "relevance_score", EVENT_ROW)
 
     # Company methods
     def create_company(self, company: Company) -> int:
-        """Create new company and return ID"""
+        """Create a company, or update the one with the same name, and return its ID"""
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                INSERT OR REPLACE INTO companies
-                (name, website, industry, size, revenue, location, description,
-                 linkedin_url, technologies, recent_news, qualification_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (company.name, company.website, company.industry, company.size,
-                  company.revenue, company.location, company.description,
-                  company.linkedin_url, json.dumps(company.technologies),
-                  json.dumps(company.recent_news), company.qualification_score))
-            company_id = cursor.lastrowid
+            company_id = upsert_company(conn, company)
             conn.commit()
             return company_id
 
-    def get_companies(self, limit: int = None) -> List[Company]:
-        """Get all companies"""
+    def get_companies(self, limit: int = None, after_score: float = None, after_id: int = None,
+                      technology: str = None, news_since: Union[str, datetime] = None) -> Page:
+        """
+        Get companies by qualification score, ``limit`` at a time after the given cursor
+        Args:
+            technology: only companies listing this technology (case-insensitive)
+            news_since: only companies with a news headline first recorded at or after this
+                time (UTC, as a datetime or 'YYYY-MM-DD HH:MM:SS')
+        """
         with self.get_connection() as conn:
-            query = "SELECT * FROM companies ORDER BY qualification_score DESC"
-            if limit:
-                query += f" LIMIT {limit}"
-            rows = conn.execute(query).fetchall()
-            companies = []
-            for row in rows:
-                company = Company(
-                    id=row['id'],
-                    name=row['name'],
-                    website=row['website'],
-                    industry=row['industry'],
-                    size=row['size'],
-                    revenue=row['revenue'],
-                    location=row['location'],
-                    description=row['description'],
-                    linkedin_url=row['linkedin_url'],
-                    technologies=json.loads(row['technologies'] or '[]'),
-                    recent_news=json.loads(row['recent_news'] or '[]'),
-                    qualification_score=row['qualification_score'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at']
-                )
-                companies.append(company)
-            return companies
+            conditions = []
+            params = []
+            if technology:
+                # Read from the technology index, already in score order
+                query = f"""
+                    SELECT {COMPANY_COLUMNS} FROM company_technologies t
+                    JOIN companies c ON c.id = t.company_id
+                """
+                conditions.append("t.technology = ?")
+                params.append(technology)
+                score, company_id = "t.qualification_score", "t.company_id"
+            else:
+                query = f"SELECT {COMPANY_COLUMNS} FROM companies c"
+                score, company_id = "c.qualification_score", "c.id"
+            if news_since:
+                conditions.append(f"{company_id} IN (SELECT company_id FROM company_news WHERE recorded_at >= ?)")
+                params.append(timestamp(news_since))
+            condition, keyset_params = keyset(score, company_id, after_score, after_id)
+            if condition:
+                conditions.append(condition)
+                params.extend(keyset_params)
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += f" ORDER BY {score} DESC, {company_id}"
+            return paginate(conn, query, params, limit, "qualification_score", COMPANY_ROW)
 
     def get_company_by_name(self, name: str) -> Optional[Company]:
         """Get company by name"""
         with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM companies WHERE name = ?", (name,)).fetchone()
-            if row:
-                return Company(
-                    id=row['id'],
-                    name=row['name'],
-                    website=row['website'],
-                    industry=row['industry'],
-                    size=row['size'],
-                    revenue=row['revenue'],
-                    location=row['location'],
-                    description=row['description'],
-                    linkedin_url=row['linkedin_url'],
-                    technologies=json.loads(row['technologies'] or '[]'),
-                    recent_news=json.loads(row['recent_news'] or '[]'),
-                    qualification_score=row['qualification_score'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at']
-                )
-            return None
+            cursor = conn.cursor()
+            cursor.row_factory = COMPANY_ROW
+            return cursor.execute(f"SELECT {COMPANY_COLUMNS} FROM companies c WHERE name = ?", (name,)).fetchone()
 
     # Stakeholder methods
     def create_stakeholder(self, stakeholder: Stakeholder) -> int:
@@ -306,89 +760,113 @@ class DatabaseManager:
             conn.commit()
             return stakeholder_id
 
+    def create_stakeholders(self, stakeholders: List[Stakeholder]) -> List[int]:
+        """Create stakeholders (e.g. a company's identified decision makers) in one transaction; returns their IDs"""
+        with self.get_connection() as conn:
+            stakeholder_ids = [
+                conn.execute("""
+                    INSERT INTO stakeholders
+                    (company_id, name, title, department, linkedin_url, email, phone,
+                     decision_maker_score, contact_method)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (stakeholder.company_id, stakeholder.name, stakeholder.title,
+                      stakeholder.department, stakeholder.linkedin_url, stakeholder.email,
+                      stakeholder.phone, stakeholder.decision_maker_score,
+                      stakeholder.contact_method)).lastrowid
+                for stakeholder in stakeholders
+            ]
+            conn.commit()
+            return stakeholder_ids
+
+    def get_stakeholders_for_companies(self, company_ids: List[int]) -> Dict[int, List[Stakeholder]]:
+        """Stakeholders of several companies in one query: {company_id: stakeholders by decision_maker_score}"""
+        grouped = {company_id: [] for company_id in company_ids}
+        if not grouped:
+            return grouped
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = STAKEHOLDER_ROW
+            # The ids travel as one JSON parameter, so any number fits in a single statement
+            rows = cursor.execute(f"""
+                SELECT {STAKEHOLDER_COLUMNS} FROM stakeholders
+                WHERE company_id IN (SELECT value FROM json_each(?))
+                ORDER BY company_id, decision_maker_score DESC, id
+            """, (json.dumps(list(grouped)),))
+            for stakeholder in rows:
+                grouped[stakeholder.company_id].append(stakeholder)
+        return grouped
+
     def get_stakeholders_by_company(self, company_id: int) -> List[Stakeholder]:
         """Get all stakeholders for a company"""
         with self.get_connection() as conn:
-            rows = conn.execute("""
-                SELECT * FROM stakeholders
+            cursor = conn.cursor()
+            cursor.row_factory = STAKEHOLDER_ROW
+            return cursor.execute(f"""
+                SELECT {STAKEHOLDER_COLUMNS} FROM stakeholders
                 WHERE company_id = ?
                 ORDER BY decision_maker_score DESC
             """, (company_id,)).fetchall()
-            stakeholders = []
-            for row in rows:
-                stakeholder = Stakeholder(
-                    id=row['id'],
-                    company_id=row['company_id'],
-                    name=row['name'],
-                    title=row['title'],
-                    department=row['department'],
-                    linkedin_url=row['linkedin_url'],
-                    email=row['email'],
-                    phone=row['phone'],
-                    decision_maker_score=row['decision_maker_score'],
-                    contact_method=row['contact_method'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at']
-                )
-                stakeholders.append(stakeholder)
-            return stakeholders
 
     # Lead methods
     def create_lead(self, lead: Lead) -> int:
-        """Create new lead and return ID"""
+        """
+        Create new lead and return ID; a lead with the external_id of an existing one
+        updates it instead (keeping its status and notes)
+        """
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                INSERT INTO leads
-                (event_id, company_id, stakeholder_id, status, priority, overall_score,
-                 rationale, outreach_subject, outreach_message, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (lead.event_id, lead.company_id, lead.stakeholder_id, lead.status,
-                  lead.priority, lead.overall_score, lead.rationale,
-                  lead.outreach_subject, lead.outreach_message, lead.notes))
-            lead_id = cursor.lastrowid
+            lead_id = upsert_lead(conn, lead)
             conn.commit()
             return lead_id
 
-    def get_leads(self, status: str = None, limit: int = None) -> List[Lead]:
-        """Get leads with optional filtering"""
+    def get_leads(self, status: str = None, limit: int = None, after_score: float = None,
+                  after_id: int = None, with_decision_maker: bool = False, include_archived: bool = False) -> Page:
+        """
+        Get leads by score with optional filtering, ``limit`` at a time after the given cursor
+        Args:
+            with_decision_maker: also fill decision_maker_name/title with the company's top
+                stakeholder, in the same query (one index seek per lead)
+            include_archived: also return leads moved to leads_archive (with archived_at set)
+        """
         with self.get_connection() as conn:
-            query = """
-                SELECT l.*, e.name as event_name, c.name as company_name, s.name as stakeholder_name
-                FROM leads l
-                LEFT JOIN events e ON l.event_id = e.id
-                LEFT JOIN companies c ON l.company_id = c.id
-                LEFT JOIN stakeholders s ON l.stakeholder_id = s.id
-            """
+            conditions = []
             params = []
             if status:
-                query += " WHERE l.status = ?"
+                conditions.append("l.status = ?")
                 params.append(status)
-            query += " ORDER BY l.overall_score DESC"
-            if limit:
-                query += f" LIMIT {limit}"
-            rows = conn.execute(query, params).fetchall()
-            leads = []
-            for row in rows:
-                lead = Lead(
-                    id=row['id'],
-                    event_id=row['event_id'],
-                    company_id=row['company_id'],
-                    stakeholder_id=row['stakeholder_id'],
-                    status=row['status'],
-                    priority=row['priority'],
-                    overall_score=row['overall_score'],
-                    rationale=row['rationale'],
-                    outreach_subject=row['outreach_subject'],
-                    outreach_message=row['outreach_message'],
-                    notes=row['notes'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at'],
-                    event_name=row['event_name'],
-                    company_name=row['company_name'],
-                    stakeholder_name=row['stakeholder_name']
-                )
-                leads.append(lead)
-            return leads
+            condition, keyset_params = keyset("l.overall_score", "l.id", after_score, after_id)
+            if condition:
+                conditions.append(condition)
+                params.extend(keyset_params)
+            sources = [("leads", LEAD_VIEW_COLUMNS if with_decision_maker else LEAD_COLUMNS)]
+            if include_archived:
+                sources.append(("leads_archive",
+                                LEAD_ARCHIVE_VIEW_COLUMNS if with_decision_maker else LEAD_ARCHIVE_COLUMNS))
+            selects = []
+            for table, columns in sources:
+                query = f"""
+                    SELECT {columns}
+                    FROM {table} l
+                    LEFT JOIN events e ON l.event_id = e.id
+                    LEFT JOIN companies c ON l.company_id = c.id
+                    LEFT JOIN stakeholders s ON l.stakeholder_id = s.id
+                """
+                if with_decision_maker:
+                    query += """
+                    LEFT JOIN stakeholders dm ON dm.id = (
+                        SELECT candidate.id FROM stakeholders candidate WHERE candidate.company_id = l.company_id
+                        ORDER BY candidate.decision_maker_score DESC, candidate.id LIMIT 1)
+                    """
+                if conditions:
+                    query += " WHERE " + " AND ".join(conditions)
+                selects.append(query)
+            if include_archived:
+                # Both tables are walked in score order and merged (archived leads keep their ids)
+                position = {field.name: index + 1 for index, field in enumerate(fields(Lead))}
+                query = " UNION ALL ".join(selects) + f" ORDER BY {position['overall_score']} DESC, {position['id']}"
+                params = params * len(selects)
+            else:
+                query = selects[0] + " ORDER BY l.overall_score DESC, l.id"
+            return paginate(conn, query, params, limit, "overall_score", LEAD_ROW)
 
     def update_lead_status(self, lead_id: int, status: str, notes: str = None):
         """Update lead status"""
@@ -407,12 +885,60 @@ class DatabaseManager:
                 """, (status, lead_id))
             conn.commit()
 
+    def archive_leads(self, closed_after_days: Optional[float] = 30, stale_after_days: Optional[float] = 365,
+                      batch_size: int = 1000) -> Dict[str, int]:
+        """
+        Move leads out of the leads table into leads_archive: closed leads not updated for
+        ``closed_after_days``, and leads of any status not updated for ``stale_after_days``
+        (None disables either rule). Archived leads leave the search index; get_leads returns
+        them with include_archived=True, and get_lead_stats keeps counting them.
+        Returns: {"closed": n, "stale": n} leads archived
+        """
+        rules = []
+        now = datetime.now(timezone.utc)
+        if closed_after_days is not None:
+            rules.append(("closed", "status = 'closed' AND updated_at <= ?", now - timedelta(days=closed_after_days)))
+        if stale_after_days is not None:
+            rules.append(("stale", "updated_at <= ?", now - timedelta(days=stale_after_days)))
+        archived = {"closed": 0, "stale": 0}
+        with self.get_connection() as conn:
+            columns = ", ".join(row[1] for row in conn.execute("PRAGMA table_info(leads)"))
+            for rule, condition, cutoff in rules:
+                # One short transaction per batch, so other writers are not held up for long
+                while True:
+                    conn.execute("BEGIN IMMEDIATE")
+                    ids = [row[0] for row in conn.execute(f"SELECT id FROM leads WHERE {condition} LIMIT ?",
+                                                          (cutoff.strftime("%Y-%m-%d %H:%M:%S"), batch_size))]
+                    if ids:
+                        batch = json.dumps(ids)
+                        conn.execute(f"""
+                            INSERT INTO leads_archive ({columns})
+                            SELECT {columns} FROM leads WHERE id IN (SELECT value FROM json_each(?))
+                        """, (batch,))
+                        conn.execute("""
+                            INSERT INTO lead_archive_counts (status, priority, leads)
+                            SELECT IFNULL(status, ''), IFNULL(priority, ''), COUNT(*) FROM leads
+                            WHERE id IN (SELECT value FROM json_each(?))
+                            GROUP BY 1, 2
+                            ON CONFLICT (status, priority) DO UPDATE SET leads = leads + excluded.leads
+                        """, (batch,))
+                        conn.execute("DELETE FROM leads WHERE id IN (SELECT value FROM json_each(?))", (batch,))
+                    conn.commit()
+                    archived[rule] += len(ids)
+                    if len(ids) < batch_size:
+                        break
+        if any(archived.values()):
+            self.logger.info(f"Archived {archived['closed']} closed and {archived['stale']} stale leads")
+        return archived
+
     def get_lead_stats(self) -> Dict[str, Any]:
-        """Get lead statistics for dashboard"""
+        """Get lead statistics for dashboard (lead counts include archived leads)"""
         with self.get_connection() as conn:
             stats = {}
+            archived = conn.execute("SELECT status, priority, leads FROM lead_archive_counts").fetchall()
+            stats['archived_leads'] = sum(row[2] for row in archived)
             # Total counts
-            stats['total_leads'] = conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+            stats['total_leads'] = conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0] + stats['archived_leads']
             stats['total_companies'] = conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
             stats['total_events'] = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
             # Status breakdown
@@ -422,6 +948,8 @@ class DatabaseManager:
                 GROUP BY status
             """).fetchall()
             stats['status_breakdown'] = {row[0]: row[1] for row in status_rows}
+            for row in archived:
+                stats['status_breakdown'][row[0]] = stats['status_breakdown'].get(row[0], 0) + row[2]
             # Priority breakdown
             priority_rows = conn.execute("""
                 SELECT priority, COUNT(*) as count
@@ -429,6 +957,8 @@ class DatabaseManager:
                 GROUP BY priority
             """).fetchall()
             stats['priority_breakdown'] = {row[0]: row[1] for row in priority_rows}
+            for row in archived:
+                stats['priority_breakdown'][row[1]] = stats['priority_breakdown'].get(row[1], 0) + row[2]
             # Top companies by score
             top_companies = conn.execute("""
                 SELECT name, qualification_score
@@ -441,6 +971,61 @@ class DatabaseManager:
             ]
             return stats
 
+    def export_snapshot(self, table: str, directory: str, since: Union[str, datetime, None] = None,
+                        format: Optional[str] = None, chunk_size: int = 10000) -> Dict[str, Any]:
+        """
+        Write a Parquet (or typed CSV) snapshot of "leads" or "companies" rows updated since
+        the ``since`` watermark to ``directory``; see backend/database/snapshot.py
+        Returns: manifest with the file name, row count, column types and the next watermark
+        """
+        from backend.database.snapshot import export_snapshot
+        return export_snapshot(self, table, directory, since=since, format=format, chunk_size=chunk_size)
+
+    # Search methods
+    def search(self, text: str, kinds: Optional[List[str]] = None, limit: int = 20,
+               offset: int = 0) -> Dict[str, Any]:
+        """
+        Ranked full-text search over company descriptions and lead rationale, notes and outreach
+        Args:
+            kinds: subset of SEARCH_INDEXES keys (default: all)
+        Returns: {"results": [{type, id, title, snippet, rank}], "has_more": bool}
+        BM25 ranks of different FTS tables are not comparable, so results are not
+        interleaved: all matches of the first kind in rank order (lower is better),
+        then those of the next kind. Snippets are HTML-escaped text with matches
+        wrapped in <mark>.
+        """
+        query = fts_query(text)
+        if not query or not self.search_enabled:
+            return {"results": [], "has_more": False}
+        # Kinds are paged in sequence: each index is only asked for the rows still
+        # missing from the first offset+limit+1, so later kinds are skipped once it is full
+        wanted = offset + limit + 1
+        statements = {
+            "companies": """
+                SELECT 'company' AS type, c.id, c.name AS title,
+                       snippet(companies_fts, -1, char(2), char(3), '…', 16) AS snippet, companies_fts.rank
+                FROM companies_fts JOIN companies c ON c.id = companies_fts.rowid
+                WHERE companies_fts MATCH ? ORDER BY companies_fts.rank LIMIT ?
+            """,
+            "leads": """
+                SELECT 'lead' AS type, l.id, COALESCE(c.name, '') AS title,
+                       snippet(leads_fts, -1, char(2), char(3), '…', 16) AS snippet, leads_fts.rank
+                FROM leads_fts JOIN leads l ON l.id = leads_fts.rowid
+                LEFT JOIN companies c ON c.id = l.company_id
+                WHERE leads_fts MATCH ? ORDER BY leads_fts.rank LIMIT ?
+            """,
+        }
+        found = []
+        with self.get_connection() as conn:
+            for kind in kinds or list(SEARCH_INDEXES):
+                if len(found) >= wanted:
+                    break
+                found.extend(dict(row) for row in conn.execute(statements[kind], (query, wanted - len(found))))
+        page = found[offset:offset + limit]
+        for result in page:
+            result["snippet"] = highlight(result["snippet"])
+        return {"results": page, "has_more": len(found) > offset + limit}
+
     def export_leads_to_dict(self) -> List[Dict[str, Any]]:
         """Export all leads to dictionary format for API/CSV"""
         leads = self.get_leads()
@@ -0,0 +1,212 @@
+"""
+Columnar snapshot exports of the leads database for analytics.
+
+A snapshot is one file per export, written a chunk at a time straight from a
+SQL cursor, so memory stays flat however many rows are exported:
+- Parquet, one row group per chunk, when ``pyarrow`` is installed;
+- otherwise gzipped CSV, with the column types in the manifest.
+Each snapshot comes with a JSON manifest (columns and types, row count and
+the ``since``/``watermark`` range). Exports are incremental: rows are selected
+by ``updated_at``, and passing a snapshot's watermark as the next export's
+``since`` gets exactly the rows changed in between.
+
+    manifest = export_snapshot(db, "leads", "data/snapshots")
+    later = export_snapshot(db, "leads", "data/snapshots", since=manifest["watermark"])
+    frame = load_snapshot(later["manifest"])   # pandas DataFrame, typed
+"""
+import csv
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from backend.database.models import timestamp
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: typed CSV snapshots only
+    pyarrow = None
+
+# Snapshot columns per table: (name, type, SQL expression); types are integer, float, string, timestamp
+SNAPSHOT_COLUMNS: Dict[str, List[Tuple[str, str, str]]] = {
+    "leads": [
+        ("id", "integer", "l.id"),
+        ("external_id", "string", "l.external_id"),
+        ("event_id", "integer", "l.event_id"),
+        ("event_name", "string", "e.name"),
+        ("company_id", "integer", "l.company_id"),
+        ("company_name", "string", "c.name"),
+        ("stakeholder_id", "integer", "l.stakeholder_id"),
+        ("status", "string", "l.status"),
+        ("priority", "string", "l.priority"),
+        ("overall_score", "float", "l.overall_score"),
+        ("rationale", "string", "l.rationale"),
+        ("outreach_subject", "string", "l.outreach_subject"),
+        ("outreach_message", "string", "l.outreach_message"),
+        ("notes", "string", "l.notes"),
+        ("created_at", "timestamp", "l.created_at"),
+        ("updated_at", "timestamp", "l.updated_at"),
+        ("archived_at", "timestamp", "l.archived_at"),
+    ],
+    "companies": [
+        ("id", "integer", "id"),
+        ("name", "string", "name"),
+        ("website", "string", "website"),
+        ("industry", "string", "industry"),
+        ("size", "string", "size"),
+        ("revenue", "string", "revenue"),
+        ("location", "string", "location"),
+        ("description", "string", "description"),
+        ("linkedin_url", "string", "linkedin_url"),
+        ("technologies", "string", "technologies"),  # JSON array
+        ("recent_news", "string", "recent_news"),  # JSON array
+        ("qualification_score", "float", "qualification_score"),
+        ("created_at", "timestamp", "created_at"),
+        ("updated_at", "timestamp", "updated_at"),
+    ],
+}
+FORMATS = ("parquet", "csv")
+# Rows updated this recently are left for the next export, so a transaction that
+# took its CURRENT_TIMESTAMP before the watermark but commits after the read began
+# is not skipped by both exports
+SETTLE_SECONDS = 5
+
+
+def snapshot_query(table: str) -> str:
+    """SELECT for ``table``'s snapshot columns with updated_at in [?, ?), in updated_at order"""
+    columns = SNAPSHOT_COLUMNS[table]
+    position = {name: index + 1 for index, (name, _, _) in enumerate(columns)}
+    if table != "leads":
+        select = ", ".join(expression for _, _, expression in columns)
+        return f"SELECT {select} FROM {table} WHERE updated_at >= ? AND updated_at < ? ORDER BY updated_at, id"
+    # Archived leads are part of the history, merged in by updated_at
+    selects = []
+    for source in ("leads", "leads_archive"):
+        select = ", ".join("NULL" if source == "leads" and name == "archived_at" else expression
+                           for name, _, expression in columns)
+        selects.append(f"""
+            SELECT {select}
+            FROM {source} l
+            LEFT JOIN events e ON l.event_id = e.id
+            LEFT JOIN companies c ON l.company_id = c.id
+            WHERE l.updated_at >= ? AND l.updated_at < ?
+        """)
+    return " UNION ALL ".join(selects) + f" ORDER BY {position['updated_at']}, {position['id']}"
+
+
+def export_snapshot(db, table: str, directory: str, since: Optional[Union[str, datetime]] = None,
+                    format: Optional[str] = None, chunk_size: int = 10000) -> Dict[str, Any]:
+    """
+    Write a snapshot of ``table`` ("leads" or "companies") to ``directory``
+    Args:
+        db: DatabaseManager
+        since: watermark of a previous snapshot; only rows updated since then are exported
+        format: "parquet" or "csv" (default: parquet when pyarrow is installed)
+    Returns: the manifest, also written next to the snapshot as JSON
+    """
+    if table not in SNAPSHOT_COLUMNS:
+        raise ValueError(f"Unknown snapshot table: {table}")
+    format = format or ("parquet" if pyarrow is not None else "csv")
+    if format not in FORMATS:
+        raise ValueError(f"Unknown snapshot format: {format}")
+    if format == "parquet" and pyarrow is None:
+        raise ValueError("Parquet snapshots need pyarrow installed")
+    columns = [{"name": name, "type": kind} for name, kind, _ in SNAPSHOT_COLUMNS[table]]
+    os.makedirs(directory, exist_ok=True)
+    with db.get_connection() as conn:
+        watermark = conn.execute("SELECT datetime('now', ?)", (f"{-SETTLE_SECONDS} seconds",)).fetchone()[0]
+        if isinstance(since, str) and since:
+            since = datetime.fromisoformat(since)  # also validates the watermark
+        since = timestamp(since) if since else ""
+        name = f"{table}-{_compact(watermark)}" + (f"-since-{_compact(since)}" if since else "")
+        path = os.path.join(directory, f"{name}.{'parquet' if format == 'parquet' else 'csv.gz'}")
+        cursor = conn.cursor()
+        cursor.row_factory = None  # plain tuples
+        params = [since, watermark] * (2 if table == "leads" else 1)
+        cursor.execute(snapshot_query(table), params)
+        write = _write_parquet if format == "parquet" else _write_csv
+        rows = write(cursor, columns, path, chunk_size)
+    manifest = {
+        "table": table,
+        "format": format,
+        "file": os.path.basename(path),
+        "rows": rows,
+        "columns": columns,
+        "since": since or None,
+        "watermark": watermark,
+        "manifest": os.path.join(directory, f"{name}.json"),
+    }
+    with open(manifest["manifest"], "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _compact(value: str) -> str:
+    """'2025-01-31 09:30:00' -> '20250131T093000' (for file names)"""
+    digits = re.sub(r"\D", "", value)
+    return f"{digits[:8]}T{digits[8:]}"
+
+
+def _chunks(cursor, chunk_size: int):
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _write_csv(cursor, columns: List[Dict], path: str, chunk_size: int) -> int:
+    count = 0
+    with gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=6) as f:
+        writer = csv.writer(f)
+        writer.writerow([column["name"] for column in columns])
+        for rows in _chunks(cursor, chunk_size):
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+ARROW_TYPES = {
+    "integer": lambda: pyarrow.int64(),
+    "float": lambda: pyarrow.float64(),
+    "string": lambda: pyarrow.string(),
+    "timestamp": lambda: pyarrow.timestamp("s", tz="UTC"),
+}
+
+
+def _write_parquet(cursor, columns: List[Dict], path: str, chunk_size: int) -> int:
+    schema = pyarrow.schema([(column["name"], ARROW_TYPES[column["type"]]()) for column in columns])
+    timestamps = [index for index, column in enumerate(columns) if column["type"] == "timestamp"]
+    count = 0
+    with pyarrow.parquet.ParquetWriter(path, schema, compression="zstd") as writer:
+        for rows in _chunks(cursor, chunk_size):
+            values = [list(column) for column in zip(*rows)]
+            for index in timestamps:
+                # SQLite's CURRENT_TIMESTAMP text is UTC
+                values[index] = [datetime.fromisoformat(value) if value else None for value in values[index]]
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=field.type) for column, field in zip(values, schema)], schema=schema))
+            count += len(rows)
+    return count
+
+
+PANDAS_DTYPES = {"integer": "Int64", "float": "float64", "string": "string"}
+
+
+def load_snapshot(manifest_path: str):
+    """A snapshot as a typed pandas DataFrame, from its manifest"""
+    import pandas
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    path = os.path.join(os.path.dirname(manifest_path), manifest["file"])
+    if manifest["format"] == "parquet":
+        return pandas.read_parquet(path)
+    timestamps = [column["name"] for column in manifest["columns"] if column["type"] == "timestamp"]
+    frame = pandas.read_csv(path, dtype={column["name"]: PANDAS_DTYPES[column["type"]]
+                                         for column in manifest["columns"] if column["type"] in PANDAS_DTYPES})
+    for name in timestamps:
+        frame[name] = pandas.to_datetime(frame[name], utc=True)
+    return frame
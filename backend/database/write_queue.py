@@ -0,0 +1,143 @@
+"""
+Write-behind queue for pipeline persistence.
+
+Committing every row on its own makes SQLite sync the journal once per write,
+and producers on several threads also contend for the write lock (failing with
+"database is locked" when they wait too long). WriteBehindQueue accepts writes
+from any thread and applies them on one writer thread, which groups whatever is
+queued (up to ``max_batch`` writes, waiting at most ``max_delay`` seconds for
+more) into a single transaction. Each write returns a Future that resolves with
+its result once the transaction holding it has committed, so a producer that
+waits on it knows the write is durable. The writer thread has its own
+connection, so other writers (e.g. AsyncDatabase) still exist; transactions
+are short and wait for each other up to the manager's ``busy_timeout``.
+
+    queue = WriteBehindQueue(DatabaseManager("data/leads.db"))
+    queue.create_company(company)          # fire and forget
+    queue.create_lead(lead).result()       # wait until committed
+    queue.close()                          # commits what is still queued
+"""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Tuple
+
+from backend.database.models import Company, DatabaseManager, Lead, update_lead_outreach, upsert_company, upsert_lead
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Single writer thread applying queued writes in group commits"""
+
+    def __init__(self, manager: DatabaseManager, max_batch: int = 256, max_delay: float = 0.02,
+                 max_pending: int = 10000):
+        self.manager = manager
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        # Bounded, so producers slow down to the writer's pace instead of queueing without limit
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self.stats = {"batches": 0, "writes": 0, "failed": 0, "largest_batch": 0}
+        self._thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, write: Callable[[sqlite3.Connection], Any]) -> Future:
+        """
+        Queue ``write(conn)``; it runs inside the writer's transaction and must not commit.
+        The returned Future resolves with its result after the commit.
+        """
+        if self._closed:
+            raise RuntimeError("WriteBehindQueue is closed")
+        future = Future()
+        self._queue.put((write, future))
+        return future
+
+    def create_company(self, company: Company, keep_filled: bool = False) -> Future:
+        """Queue a company upsert (see upsert_company); resolves with the company ID"""
+        return self.submit(lambda conn: upsert_company(conn, company, keep_filled))
+
+    def create_lead(self, lead: Lead) -> Future:
+        """Queue a lead upsert (by external_id); resolves with the lead ID"""
+        return self.submit(lambda conn: upsert_lead(conn, lead))
+
+    def update_lead_outreach(self, external_id: str, subject: str, message: str) -> Future:
+        """Queue storing outreach on a lead; resolves with False if the lead does not exist"""
+        return self.submit(lambda conn: update_lead_outreach(conn, external_id, subject, message))
+
+    def flush(self) -> Future:
+        """A Future that resolves once everything queued before it has committed"""
+        return self.submit(lambda conn: None)
+
+    def close(self, timeout: float = None):
+        """Commit what is queued and stop the writer thread"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        conn = self.manager._connect()
+        try:
+            while True:
+                batch, stop = self._collect()
+                if batch:
+                    self._commit(conn, batch)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _collect(self) -> Tuple[List[Tuple[Callable, Future]], bool]:
+        """Block for the first write, then take more until the batch is full or max_delay passes"""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[Tuple[Callable, Future]]):
+        results: Dict[Future, Any] = {}
+        errors: Dict[Future, BaseException] = {}
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for write, future in batch:
+                # A savepoint per write, so a failing write is undone without losing the batch
+                conn.execute("SAVEPOINT write")
+                try:
+                    results[future] = write(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write")
+                    errors[future] = e
+                conn.execute("RELEASE write")
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} writes failed: {e}")
+            if conn.in_transaction:
+                conn.rollback()
+            results = {}
+            errors = {future: e for _, future in batch}
+        self.stats["batches"] += 1
+        self.stats["writes"] += len(batch)
+        self.stats["failed"] += len(errors)
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        # Acknowledge only now that the transaction is durable (or definitely failed)
+        for _, future in batch:
+            if future in errors:
+                future.set_exception(errors[future])
+            else:
+                future.set_result(results[future])
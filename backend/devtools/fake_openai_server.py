@@ -0,0 +1,241 @@
+"""
+Local stand-in for the OpenAI API used by tests and benchmarks.
+
+Implements the small subset of endpoints this project calls:
+    POST /v1/chat/completions
+    POST /v1/files, GET /v1/files/{id}/content
+    POST /v1/batches, GET /v1/batches/{id}
+Responses are deterministic and shaped after the prompts in ai_engine, so
+the qualifier and outreach generator can run end to end without network access.
+Chat completions can be slowed down and made to fail (429/500) with a seeded
+latency and error distribution, for benchmarks.
+
+    server = FakeOpenAIServer().start()
+    client = openai.OpenAI(api_key="fake", base_url=server.base_url)
+"""
+import hashlib
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+Responder = Callable[[Dict], str]
+
+
+def default_responder(body: Dict) -> str:
+    """Produce a plausible completion for the prompts used in ai_engine"""
+    prompt = body.get("messages", [{}])[-1].get("content", "")
+    lowered = prompt.lower()
+    if "qualification score" in lowered:
+        score = 0.6 + (sum(map(ord, prompt)) % 40) / 100
+        return json.dumps({"score": round(score, 2),
+                           "rationale": "Strong fit for protective films in outdoor graphics."})
+    if "decision maker" in lowered:
+        return json.dumps([{"title": "VP Product Development", "department": "Product Development",
+                            "decision_maker_score": 0.9, "reasoning": "Owns material selection"}])
+    if "subject lines" in lowered:
+        return "1. Extending graphic lifespan\n2. Durable outdoor graphics\n3. Quick question"
+    if "follow-up" in lowered:
+        return "FOLLOW-UP 1:\nSharing a short case study.\n\nFOLLOW-UP 2:\nOne last note before I close the loop."
+    return "Hi there, I noticed your team's work in graphics and signage and wanted to connect."
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text.split()))
+
+
+def chat_completion_body(request_body: Dict, content: str, completion_id: str) -> Dict:
+    prompt_tokens = sum(_count_tokens(m.get("content", "")) for m in request_body.get("messages", []))
+    completion_tokens = _count_tokens(content)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request_body.get("model", "gpt-4"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    }
+
+
+class FakeOpenAIServer:
+    """Threaded HTTP server emulating the OpenAI chat, files and batches endpoints"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, responder: Responder = default_responder,
+                 batch_delay: float = 0.0, fail_custom_ids: Optional[set] = None,
+                 latency: float = 0.0, latency_jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.responder = responder
+        self.batch_delay = batch_delay
+        self.fail_custom_ids = set(fail_custom_ids or ())
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.seed = seed
+        self._attempts: Dict[str, int] = {}
+        self.files: Dict[str, Dict] = {}
+        self.batches: Dict[str, Dict] = {}
+        self.request_counts: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _next_id(self, prefix: str) -> str:
+        with self._lock:
+            return f"{prefix}-{next(self._ids)}"
+
+    def _count(self, route: str):
+        with self._lock:
+            self.request_counts[route] = self.request_counts.get(route, 0) + 1
+
+    # Endpoint implementations -------------------------------------------------
+
+    def chat_completion(self, body: Dict):
+        return 200, chat_completion_body(body, self.responder(body), self._next_id("chatcmpl"))
+
+    def simulated_chat_completion(self, body: Dict):
+        """Chat completion with the configured latency and error distribution applied"""
+        # Draws depend on the request (and how often it was sent), not on arrival
+        # order, so concurrent clients see the same failures from run to run
+        key = hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+        rng = random.Random(f"{self.seed}:{key}:{attempt}")
+        delay = max(0.0, rng.gauss(self.latency, self.latency_jitter)) if self.latency_jitter else self.latency
+        fails = rng.random() < self.error_rate
+        status = rng.choice((429, 500))
+        if delay:
+            time.sleep(delay)
+        if fails:
+            return status, {"error": {"message": "Simulated failure", "type": "server_error", "code": None}}
+        return self.chat_completion(body)
+
+    def create_file(self, filename: str, purpose: str, content: bytes):
+        file_id = self._next_id("file")
+        self.files[file_id] = {"filename": filename, "purpose": purpose, "content": content}
+        return 200, {"id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+                     "filename": filename, "purpose": purpose, "status": "processed"}
+
+    def create_batch(self, body: Dict):
+        batch_id = self._next_id("batch")
+        batch = {
+            "id": batch_id, "object": "batch", "endpoint": body.get("endpoint"),
+            "input_file_id": body.get("input_file_id"), "completion_window": body.get("completion_window", "24h"),
+            "status": "in_progress", "created_at": int(time.time()), "output_file_id": None,
+            "error_file_id": None, "metadata": body.get("metadata"),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        }
+        self.batches[batch_id] = batch
+        timer = threading.Timer(self.batch_delay, self._process_batch, args=(batch_id,))
+        timer.daemon = True
+        timer.start()
+        return 200, dict(batch)
+
+    def _process_batch(self, batch_id: str):
+        batch = self.batches[batch_id]
+        lines = self.files[batch["input_file_id"]]["content"].decode("utf-8").splitlines()
+        outputs, errors = [], []
+        for line in filter(None, lines):
+            request = json.loads(line)
+            custom_id = request["custom_id"]
+            if custom_id in self.fail_custom_ids:
+                errors.append({"id": self._next_id("batch_req"), "custom_id": custom_id, "response": None,
+                               "error": {"code": "server_error", "message": "Simulated failure"}})
+                continue
+            _, completion = self.chat_completion(request["body"])
+            outputs.append({"id": self._next_id("batch_req"), "custom_id": custom_id, "error": None,
+                            "response": {"status_code": 200, "request_id": self._next_id("req"), "body": completion}})
+        batch["output_file_id"] = self.create_file(
+            "output.jsonl", "batch_output", "\n".join(map(json.dumps, outputs)).encode())[1]["id"]
+        if errors:
+            batch["error_file_id"] = self.create_file(
+                "errors.jsonl", "batch_output", "\n".join(map(json.dumps, errors)).encode())[1]["id"]
+        batch["request_counts"] = {"total": len(outputs) + len(errors), "completed": len(outputs),
+                                   "failed": len(errors)}
+        batch["completed_at"] = int(time.time())
+        batch["status"] = "completed"
+
+    # HTTP plumbing ------------------------------------------------------------
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+            def _send(self, status: int, payload, raw: bool = False):
+                data = payload if raw else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream" if raw else "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_POST(self):
+                path = self.path.split("?")[0]
+                server._count(f"POST {path}")
+                if path.endswith("/chat/completions"):
+                    self._send(*server.simulated_chat_completion(json.loads(self._body())))
+                elif path.endswith("/files"):
+                    message = BytesParser(policy=HTTP).parsebytes(
+                        b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + self._body())
+                    fields = {part.get_param("name", header="content-disposition"): part
+                              for part in message.iter_parts()}
+                    upload = fields["file"]
+                    self._send(*server.create_file(upload.get_filename() or "batch.jsonl",
+                                                   fields["purpose"].get_content().strip(),
+                                                   upload.get_payload(decode=True)))
+                elif path.endswith("/batches"):
+                    self._send(*server.create_batch(json.loads(self._body())))
+                else:
+                    self._send(404, {"error": {"message": f"Unknown route {path}"}})
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                parts = path.strip("/").split("/")
+                server._count(f"GET /{parts[0]}/{parts[1]}" if len(parts) > 1 else f"GET {path}")
+                if len(parts) == 3 and parts[1] == "batches" and parts[2] in server.batches:
+                    self._send(200, server.batches[parts[2]])
+                elif len(parts) == 4 and parts[1] == "files" and parts[3] == "content" and parts[2] in server.files:
+                    self._send(200, server.files[parts[2]]["content"], raw=True)
+                else:
+                    self._send(404, {"error": {"message": f"Unknown route {path}"}})
+
+        return Handler
@@ -0,0 +1,146 @@
+"""
+Local fixture web server standing in for event and company websites.
+
+Event pages (``/events/<n>``) list a deterministic set of exhibitors; any other
+URL is answered with a company homepage generated from the requested host, so
+CompanyScraper's website discovery and scraping work without network access.
+Route a requests session to the server with ``route_session_to``:
+
+    server = FixtureWebServer().start()
+    route_session_to(company_scraper.session, server)
+"""
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+ORIGINAL_HOST_HEADER = "X-Fixture-Host"
+
+NAME_WORDS = ["Apex", "Summit", "Vivid", "Northern", "Crystal", "Metro", "Pioneer", "Horizon", "Atlas", "Bright"]
+NAME_KINDS = ["Graphics", "Signs", "Films", "Imaging", "Print", "Displays", "Wraps", "Media"]
+NAME_SUFFIXES = ["Inc", "Solutions", "Corporation", "International", "Group", "Systems", "LLC"]
+PAGE_TECHNOLOGIES = ["vinyl graphics", "vehicle wraps", "digital printing", "wide format", "protective films",
+                     "architectural films", "window films", "outdoor signage", "floor graphics"]
+
+
+def exhibitor_name(event_index: int, position: int) -> str:
+    """Deterministic exhibitor name (unique per event and position)"""
+    rng = random.Random(event_index * 1000 + position)
+    return (f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_KINDS)} {event_index}-{position} "
+            f"{rng.choice(NAME_SUFFIXES)}")
+
+
+class FixtureWebServer:
+    """Threaded HTTP server serving generated event and company pages"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, exhibitors_per_event: int = 50,
+                 latency: float = 0.0):
+        self.exhibitors_per_event = exhibitors_per_event
+        self.latency = latency
+        self.request_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @staticmethod
+    def event_url(event_index: int) -> str:
+        return f"https://events.fixture.test/events/{event_index}"
+
+    def start(self) -> "FixtureWebServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.request_counts[kind] = self.request_counts.get(kind, 0) + 1
+
+    def event_page(self, event_index: int) -> str:
+        items = "\n".join(f'<li class="exhibitor-name">{exhibitor_name(event_index, position)}</li>'
+                          for position in range(self.exhibitors_per_event))
+        return f"<html><body><h1>Fixture Expo {event_index}</h1><ul>{items}</ul></body></html>"
+
+    def company_page(self, host: str) -> str:
+        rng = random.Random(host)
+        technologies = ", ".join(rng.sample(PAGE_TECHNOLOGIES, rng.randint(1, 4)))
+        return f"""<html><head>
+<meta name="description" content="{host} delivers durable {technologies} for outdoor brands.">
+</head><body>
+<section class="about">We specialise in {technologies}.</section>
+<p>Contact: sales@{host} or 555-010-{rng.randint(1000, 9999)}</p>
+</body></html>"""
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if len(parts) == 2 and parts[0] == "events" and parts[1].isdigit():
+                    server._count("event_page")
+                    body = server.event_page(int(parts[1]))
+                else:
+                    server._count("company_page")
+                    body = server.company_page(self.headers.get(ORIGINAL_HOST_HEADER, "localhost"))
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+class FixtureAdapter(HTTPAdapter):
+    """Transport adapter sending every request to the fixture server, keeping the original host in a header"""
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.headers[ORIGINAL_HOST_HEADER] = parts.netloc
+        request.url = self.base_url + (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
+
+def route_session_to(session: requests.Session, server: FixtureWebServer) -> requests.Session:
+    """Mount the fixture adapter for all http(s) URLs on a requests session"""
+    adapter = FixtureAdapter(server.url)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,168 @@
+"""
+Query plan audit for DatabaseManager.
+
+Runs every DatabaseManager read and write method against a scratch database,
+records the SQL statements they execute (via the sqlite3 trace callback, with
+parameters bound) and reports each statement's ``EXPLAIN QUERY PLAN``. A plan
+is flagged when it scans a whole table instead of searching an index, or sorts
+or groups rows in a temporary B-tree instead of reading them in index order.
+
+Audit a fresh database with sample data, or a copy of an existing one (so the
+planner sees its real data and ANALYZE statistics):
+
+    python -m backend.devtools.query_plans
+    python -m backend.devtools.query_plans --db data/leads.db
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from backend.database.models import (Company, DatabaseManager, Event, Lead, Stakeholder,
+                                     populate_sample_data)
+
+# Statements that are not queries over the application tables (schema setup, transactions,
+# and FTS5's own statements on its shadow tables)
+_SKIPPED = re.compile(r"^\s*(--|BEGIN|COMMIT|ROLLBACK|CREATE|DROP|PRAGMA|ANALYZE)|sqlite_master|'main'\.|"
+                      r"^\s*INSERT INTO \w+_fts\b", re.IGNORECASE)
+# Whole-table counts have no cheaper plan than a scan
+_UNFILTERED_COUNT = re.compile(r"^\s*SELECT COUNT\(\*\) FROM \w+\s*$", re.IGNORECASE)
+# Filters whose matches are found through a selective index and then sorted: sorting the few
+# matches beats walking the whole score index (e.g. companies with news since a recent date),
+# and archive_leads groups at most one batch of leads
+ALLOWED_SORTS = ("FROM company_news WHERE recorded_at >=", "INSERT INTO lead_archive_counts")
+# Tables holding a handful of rows (one per lead status and priority), read whole
+SMALL_TABLES = ("lead_archive_counts",)
+# (CONSTANT ROW: a SELECT without a table)
+_INDEXED_SCAN = re.compile(r"^SCAN (CONSTANT ROW$|\S+ (USING (COVERING )?INDEX|VIRTUAL TABLE))")
+
+
+class TracingDatabaseManager(DatabaseManager):
+    """DatabaseManager recording every SQL statement it executes"""
+
+    def __init__(self, db_path: str):
+        self.statements: List[str] = []
+        super().__init__(db_path)
+
+    def get_connection(self):
+        conn = super().get_connection()
+        conn.set_trace_callback(self.statements.append)
+        return conn
+
+
+def run_workload(db: DatabaseManager):
+    """Call each DatabaseManager method once"""
+    populate_sample_data(db)
+    event_id = db.create_event(Event(name="Audit Expo", relevance_score=0.5))
+    company_id = db.create_company(Company(name="Audit Graphics", description="Vehicle wrap films",
+                                           technologies=["Vehicle Wraps"], recent_news=["Opens a new plant"]))
+    stakeholder_id = db.create_stakeholder(Stakeholder(company_id=company_id, name="Audit Contact",
+                                                       decision_maker_score=0.7))
+    lead_id = db.create_lead(Lead(event_id=event_id, company_id=company_id, stakeholder_id=stakeholder_id,
+                                  overall_score=0.8, rationale="Prints vehicle wraps"))
+    db.get_events()
+    db.get_events(limit=1, **db.get_events(limit=1).next_cursor)
+    db.get_companies()
+    db.get_companies(limit=1, **db.get_companies(limit=1).next_cursor)
+    db.get_company_by_name("Audit Graphics")
+    db.get_companies(limit=10, technology="vehicle wraps")
+    db.get_companies(limit=10, technology="vehicle wraps", after_score=0.9, after_id=1)
+    db.get_companies(limit=10, news_since="2025-01-01 00:00:00")
+    db.get_companies(limit=10, technology="vehicle wraps", news_since="2025-01-01 00:00:00")
+    db.get_stakeholders_by_company(company_id)
+    db.create_stakeholders([Stakeholder(company_id=company_id, name="Audit Buyer", decision_maker_score=0.9)])
+    db.get_stakeholders_for_companies([company_id, company_id + 1])
+    db.get_leads()
+    db.get_leads(status="new", limit=10)
+    db.get_leads(limit=10, after_score=0.9, after_id=1)
+    db.get_leads(status="new", limit=10, after_score=0.9, after_id=1)
+    db.get_leads(status="new", limit=10, with_decision_maker=True)
+    db.get_leads(status="new", limit=10, include_archived=True)
+    db.get_leads(limit=10, after_score=0.9, after_id=1, include_archived=True, with_decision_maker=True)
+    db.update_lead_status(lead_id, "contacted")
+    db.update_lead_status(lead_id, "qualified", notes="Audit note")
+    db.get_lead_stats()
+    db.search("wrap")
+    db.export_leads_to_dict()
+    with tempfile.TemporaryDirectory() as snapshots:
+        for table in ("leads", "companies"):
+            db.export_snapshot(table, snapshots, since=db.export_snapshot(table, snapshots)["watermark"])
+    rerun = Lead(company_id=company_id, overall_score=0.6, external_id="audit-rerun")
+    db.create_lead(rerun)
+    db.update_lead_status(lead_id, "closed")
+    db.archive_leads(closed_after_days=0, stale_after_days=0)
+    db.create_lead(rerun)  # restored from the archive
+
+
+def plan_problems(plan: List[str], sql: str) -> List[str]:
+    """Plan steps that scan a whole table or sort/group in a temporary B-tree"""
+    problems = []
+    for step in plan:
+        if "USE TEMP B-TREE" in step:
+            if not any(allowed in sql for allowed in ALLOWED_SORTS):
+                problems.append(step)
+        elif (step.startswith("SCAN ") and not _INDEXED_SCAN.match(step) and not _UNFILTERED_COUNT.match(sql)
+              and step.split()[1] not in SMALL_TABLES):
+            problems.append(step)
+    return problems
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """EXPLAIN QUERY PLAN details of ``sql`` (parameters already bound)"""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def audit(db_path: Optional[str] = None) -> List[Dict]:
+    """
+    Run the workload on a scratch database (a copy of ``db_path`` if given)
+    Returns: [{"sql", "plan", "problems"}] for each distinct statement
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "audit.db")
+        if db_path:
+            source = sqlite3.connect(db_path)
+            target = sqlite3.connect(path)
+            source.backup(target)
+            source.close()
+            target.close()
+        db = TracingDatabaseManager(path)
+        db.statements.clear()
+        run_workload(db)
+        report = []
+        seen = set()
+        with db.get_connection() as conn:
+            conn.set_trace_callback(None)
+            for sql in db.statements:
+                sql = " ".join(sql.split())
+                if sql in seen or _SKIPPED.search(sql):
+                    continue
+                seen.add(sql)
+                plan = explain(conn, sql)
+                if plan:
+                    report.append({"sql": sql, "plan": plan, "problems": plan_problems(plan, sql)})
+        conn.close()
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="database to audit a copy of (default: fresh database with sample data)")
+    parser.add_argument("--verbose", action="store_true", help="print the plan of every statement")
+    args = parser.parse_args()
+    report = audit(args.db)
+    flagged = [entry for entry in report if entry["problems"]]
+    for entry in report:
+        if entry["problems"] or args.verbose:
+            print(("FLAGGED " if entry["problems"] else "ok      ") + entry["sql"][:160])
+            for step in entry["plan"]:
+                print(f"    {step}")
+    print(f"{len(report)} statements audited, {len(flagged)} flagged")
+    if flagged:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
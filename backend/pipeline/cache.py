@@ -0,0 +1,84 @@
+"""
+Fingerprint cache for incremental lead generation runs.
+
+Stage results (enrichment, qualification, outreach) are stored per company
+together with a content hash of the inputs that produced them. A later run
+reuses a result when the inputs hash to the same fingerprint and the entry has
+not expired, so daily reruns only re-scrape and re-query the LLM for companies
+that actually changed.
+"""
+import copy
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Inputs of each stage; a change in any of them invalidates the cached result
+ENRICHMENT_FIELDS = ("name", "website")
+QUALIFICATION_FIELDS = ("name", "website", "industry", "size", "revenue", "location", "description",
+                        "linkedin_url", "technologies", "recent_news", "key_contacts")
+EVENT_FIELDS = ("name", "date", "location", "industry")
+OUTREACH_FIELDS = ("company_name", "contact_name", "contact_title", "industry_alignment", "event_context",
+                   "company_size")
+
+DAY = 24 * 3600
+DEFAULT_TTL = {"enrichment": 3 * DAY, "qualification": 14 * DAY, "outreach": 14 * DAY}
+
+HIT, MISS, CHANGED, EXPIRED = "hits", "misses", "changed", "expired"
+
+
+def fingerprint(record: Dict, fields: Iterable[str], event=None, context: Optional[str] = None) -> str:
+    """
+    Stable hash of the given fields of a record (and of the event context, if any)
+    Args:
+        context: signature of other inputs the stage depends on (e.g. the qualifier's ICP criteria and model)
+    """
+    payload = {field: record.get(field) for field in fields}
+    if event is not None:
+        payload["event"] = {field: getattr(event, field, None) for field in EVENT_FIELDS}
+    if context is not None:
+        payload["context"] = context
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def empty_stats() -> Dict[str, Dict[str, int]]:
+    return {stage: {HIT: 0, MISS: 0, CHANGED: 0, EXPIRED: 0} for stage in DEFAULT_TTL}
+
+
+class FingerprintCache:
+    """Thread-safe store of stage results keyed by (stage, company key) and validated by fingerprint"""
+
+    def __init__(self, ttl_seconds: Optional[Dict[str, float]] = None, clock: Callable[[], float] = time.time):
+        self.ttl_seconds = {**DEFAULT_TTL, **(ttl_seconds or {})}
+        self.clock = clock
+        self._entries: Dict[Tuple[str, str], Tuple[str, float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, stage: str, key: str, content_fingerprint: str) -> Tuple[Optional[Any], str]:
+        """
+        Find a cached result
+        Returns: (value or None, outcome) where outcome is 'hits', 'misses', 'changed' or 'expired'
+        """
+        with self._lock:
+            entry = self._entries.get((stage, key))
+        if entry is None:
+            return None, MISS
+        stored_fingerprint, stored_at, value = entry
+        if stored_fingerprint != content_fingerprint:
+            return None, CHANGED
+        if self.clock() - stored_at > self.ttl_seconds.get(stage, DAY):
+            return None, EXPIRED
+        return copy.deepcopy(value), HIT
+
+    def store(self, stage: str, key: str, content_fingerprint: str, value: Any):
+        with self._lock:
+            self._entries[(stage, key)] = (content_fingerprint, self.clock(), copy.deepcopy(value))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,88 @@
+"""
+Persisting streaming pipeline output to the leads database.
+
+DatabaseSink hands companies, leads and outreach to a WriteBehindQueue as the
+stages produce them, so enrichment and qualification workers never wait on
+SQLite: the queue's writer thread commits them in groups. Leads are keyed by
+their pipeline id (``Lead.external_id``), so rerunning the pipeline updates the
+stored leads instead of adding duplicates.
+"""
+import logging
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+from backend.database.models import Company, Lead
+from backend.database.write_queue import WriteBehindQueue
+from backend.pipeline.streaming import PipelineSink
+
+logger = logging.getLogger(__name__)
+
+
+def company_from_record(company: Dict) -> Company:
+    """Company model from a pipeline company dict"""
+    return Company(
+        name=company.get('name', ''),
+        website=company.get('website', '') or '',
+        industry=company.get('industry', '') or '',
+        size=company.get('size', '') or '',
+        revenue=company.get('revenue', '') or '',
+        location=company.get('location', '') or '',
+        description=company.get('description', '') or '',
+        linkedin_url=company.get('linkedin_url', '') or '',
+        technologies=list(company.get('technologies') or []),
+        recent_news=list(company.get('recent_news') or []),
+        qualification_score=float(company.get('qualification_score') or 0),
+    )
+
+
+def lead_from_record(lead: Dict) -> Lead:
+    """Lead model from a pipeline lead record (see build_lead_record)"""
+    return Lead(
+        company_name=lead.get('company_name', ''),
+        overall_score=float(lead.get('qualification_score') or 0),
+        rationale=(lead.get('rationale')
+                   or "; ".join(str(reason) for reason in lead.get('qualification_reasons') or [])),
+        status=lead.get('status', 'new'),
+        external_id=lead['id'],
+    )
+
+
+class DatabaseSink(PipelineSink):
+    """Queues pipeline output for the database, then passes it on to ``inner``"""
+
+    def __init__(self, write_queue: WriteBehindQueue, inner: Optional[PipelineSink] = None):
+        self.write_queue = write_queue
+        self.inner = inner or PipelineSink()
+
+    def on_event(self, event):
+        self.inner.on_event(event)
+
+    def on_company(self, company: Dict):
+        # A rerun whose enrichment fails sends the bare extracted record; keep what earlier runs stored
+        self._track(self.write_queue.create_company(company_from_record(company), keep_filled=True),
+                    company.get('name'))
+        self.inner.on_company(company)
+
+    def on_lead(self, lead: Dict):
+        # Queued after its company, so the lead finds it by name
+        self._track(self.write_queue.create_lead(lead_from_record(lead)), lead['id'])
+        self.inner.on_lead(lead)
+
+    def on_outreach(self, outreach: Dict):
+        self._track(self.write_queue.update_lead_outreach(
+            outreach['lead_id'], outreach['subject_line'], outreach['primary_message']), outreach['lead_id'])
+        self.inner.on_outreach(outreach)
+
+    def on_progress(self, stats: Dict):
+        self.inner.on_progress(stats)
+
+    def flush(self) -> Future:
+        """Resolves once everything queued so far has committed"""
+        return self.write_queue.flush()
+
+    @staticmethod
+    def _track(future: Future, key):
+        def log_failure(done: Future):
+            if done.exception() is not None:
+                logger.error(f"Could not save {key} to the leads database: {done.exception()}")
+        future.add_done_callback(log_failure)
@@ -0,0 +1,311 @@
+"""
+Streaming lead generation pipeline.
+
+Companies flow one at a time through extract -> resolve -> enrich -> qualify -> outreach
+over bounded asyncio queues. Each stage runs a fixed number of workers that call
+the (blocking) scrapers and LLM clients in a thread pool. A full queue blocks the
+stage feeding it, so at most ``queue_size`` items wait between two stages, and
+every event, company, lead and outreach message is handed to the sink as soon
+as it is produced. Entity resolution merges spelling variants of the same
+company before anything is scraped or sent to the LLM.
+"""
+import asyncio
+import contextvars
+import functools
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from backend.pipeline.cache import (
+    ENRICHMENT_FIELDS, HIT, OUTREACH_FIELDS, QUALIFICATION_FIELDS, FingerprintCache, empty_stats, fingerprint
+)
+from backend.scrapers.event_index import EventCompanyIndex, normalize_company_name
+
+logger = logging.getLogger(__name__)
+
+STAGES = ["events", "companies", "enrichment", "qualification", "outreach"]
+DEFAULT_CONCURRENCY = {"enrichment": 4, "qualification": 4, "outreach": 2}
+
+_DONE = object()  # end-of-stream marker, one per downstream worker
+
+
+def make_lead_id(company_name: str, event_name: str = '') -> str:
+    """Deterministic lead id: the same company at the same event always gets the same id"""
+    key = f"{normalize_company_name(company_name)}|{normalize_company_name(event_name)}"
+    return f"lead_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}"
+
+
+def build_lead_record(company: Dict, qualification: Dict, event_context) -> Dict:
+    """Lead as stored in leads_storage and returned by /api/leads"""
+    contact = (company.get('key_contacts') or [{}])[0]
+    event_name = event_context.name if event_context else ''
+    return {
+        "id": make_lead_id(company.get('name', ''), event_name),
+        "company_name": company.get('name', ''),
+        "company_description": company.get('description', ''),
+        "company_size": company.get('size', ''),
+        "industry": company.get('industry', ''),
+        "revenue": company.get('revenue', ''),
+        "website": company.get('website', ''),
+        "qualification_score": qualification.get('score', 0),
+        "qualification_reasons": qualification.get('reasons', []),
+        "rationale": qualification.get('rationale', ''),
+        "industry_alignment": qualification.get('industry_alignment', ''),
+        "event_context": event_name,
+        "contact_name": contact.get('name', ''),
+        "contact_title": contact.get('title', ''),
+        "contact_linkedin": contact.get('linkedin', ''),
+        "status": "new",
+        "created_at": datetime.now().isoformat()
+    }
+
+
+def build_outreach_record(result: Dict) -> Dict:
+    """Outreach as stored in outreach_storage, from a successful OutreachGenerator result"""
+    return {
+        "id": f"outreach_{result.get('lead_id', 'unknown')}",
+        "lead_id": result.get('lead_id'),
+        "subject_line": result['data']['subject_line'],
+        "primary_message": result['data']['primary_message'],
+        "follow_up_sequence": result['data']['follow_up_sequence'],
+        "personalization_elements": result['data']['personalization_elements'],
+        "generated_at": result['data']['generated_at'],
+        "status": "generated"
+    }
+
+
+class PipelineSink:
+    """Receives pipeline output as it is produced (the base class discards it)"""
+
+    def on_event(self, event):
+        pass
+
+    def on_company(self, company: Dict):
+        """Called when a company is extracted, again when name variants merge into it and once enriched"""
+
+    def on_lead(self, lead: Dict):
+        pass
+
+    def on_outreach(self, outreach: Dict):
+        pass
+
+    def on_progress(self, stats: Dict):
+        pass
+
+
+class StreamingLeadPipeline:
+    """
+    Runs lead generation as a stage-pipelined dataflow with backpressure
+    With a FingerprintCache, enrichment, qualification and outreach results are
+    reused for companies whose inputs have not changed since a previous run.
+    """
+
+    def __init__(self, events_scraper, company_scraper, lead_qualifier, outreach_generator,
+                 queue_size: int = 100, concurrency: Optional[Dict[str, int]] = None,
+                 cache: Optional[FingerprintCache] = None):
+        self.events_scraper = events_scraper
+        self.company_scraper = company_scraper
+        self.lead_qualifier = lead_qualifier
+        self.outreach_generator = outreach_generator
+        self.queue_size = queue_size
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self.cache = cache
+
+    async def run(self, target_industries: List[str], max_leads: int, include_outreach: bool = True,
+                  sink: Optional[PipelineSink] = None) -> Dict:
+        """
+        Run the pipeline to completion
+        Returns: counts, per-stage busy seconds, cache outcomes per stage and the time
+        until the first qualified lead
+        """
+        # Imported here so importing this module (e.g. for PipelineSink) stays cheap
+        from backend.scrapers.company_scraper import enrich_contacts_with_linkedin
+        from backend.scrapers.entity_resolution import EntityResolver
+
+        sink = sink or PipelineSink()
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=sum(self.concurrency.values()) + 1,
+                                      thread_name_prefix="lead-pipeline")
+        started = time.perf_counter()
+        index = EventCompanyIndex()
+        stats = {
+            "events_found": 0, "companies_analyzed": 0, "companies_processed": 0,
+            "companies_merged": 0, "qualified_leads": 0, "outreach_generated": 0, "first_lead_seconds": None,
+            "stage_seconds": dict.fromkeys(STAGES, 0.0), "cache": empty_stats(),
+        }
+
+        async def call(stage: str, func, *args):
+            # Copy the context so per-job tracking (e.g. track_llm_usage) sees worker threads
+            context = contextvars.copy_context()
+            call_started = time.perf_counter()
+            try:
+                return await loop.run_in_executor(executor, functools.partial(context.run, func, *args))
+            finally:
+                stats["stage_seconds"][stage] += time.perf_counter() - call_started
+
+        async def cached(stage: str, key: str, content_fingerprint: str, compute, cacheable):
+            """Reuse a stage result for unchanged inputs, otherwise compute (and cache) it"""
+            if self.cache is None:
+                return await compute()
+            value, outcome = self.cache.lookup(stage, key, content_fingerprint)
+            stats["cache"][stage][outcome] += 1
+            if outcome == HIT:
+                return value
+            value = await compute()
+            if cacheable(value):
+                self.cache.store(stage, key, content_fingerprint, value)
+            return value
+
+        # Qualifications also depend on the ICP criteria, model and prompt the qualifier uses
+        qualifier_signature = getattr(self.lead_qualifier, "qualification_signature", None)
+
+        to_enrich = asyncio.Queue(self.queue_size)
+        to_qualify = asyncio.Queue(self.queue_size)
+        to_outreach = asyncio.Queue(self.queue_size) if include_outreach else None
+
+        # A company reaches the sink again after merges and after enrichment, which race
+        # each other; every record it gets is the latest extraction plus what enrichment found
+        extracted: Dict[str, Dict] = {}
+        enrichment_found: Dict[str, Dict] = {}
+
+        def publish(company: Dict, found: Optional[Dict] = None):
+            key = normalize_company_name(company.get('name', ''))
+            if found is None:
+                extracted[key] = company
+            else:
+                enrichment_found[key] = found
+            sink.on_company({**extracted[key], **enrichment_found.get(key, {})})
+
+        async def extract():
+            events = await call("events", self.events_scraper.scrape_industry_events, target_industries)
+            stats["events_found"] = len(events)
+            for event in events:
+                sink.on_event(event)
+            resolver = EntityResolver()
+            for event in events:
+                companies = await call("companies", self.company_scraper.extract_companies_from_event, event, index)
+                for company in companies:
+                    if not normalize_company_name(company.get('name', '')):
+                        continue
+                    representative, is_new = resolver.resolve(company)
+                    if not is_new:
+                        alias = normalize_company_name(company['name'])
+                        if alias != normalize_company_name(representative['name']):
+                            stats["companies_merged"] += 1
+                            index.merge(company['name'], representative['name'])
+                        # The merged representative is a fresh copy (the first record may be
+                        # in enrichment already), so update it and hand it to the sink again
+                        if event.name not in representative['source_events']:
+                            representative['source_events'] = representative['source_events'] + [event.name]
+                        publish(representative)
+                        continue
+                    company['source_events'] = [event.name]
+                    if not company.get('key_contacts'):
+                        company['key_contacts'] = enrich_contacts_with_linkedin(
+                            company.get('name', ''), company.get('website', ''))
+                    stats["companies_analyzed"] += 1
+                    publish(company)
+                    if stats["companies_analyzed"] <= max_leads:
+                        await to_enrich.put(company)
+            logger.info(f"Extracted {len(resolver)} unique companies from {len(events)} events "
+                        f"({stats['companies_merged']} name variants merged)")
+
+        async def enrich(company: Dict):
+            async def scrape():
+                enriched = await call("enrichment", self.company_scraper.enrich_company_data, company)
+                if enriched is company:
+                    return None  # the scraper failed and handed back its input; retry on the next run
+                # Only the fields enrichment added or changed (possibly none); extraction fields come from this run
+                return {field: value for field, value in enriched.items() if company.get(field) != value}
+
+            changes = await cached("enrichment", normalize_company_name(company.get('name', '')),
+                                   fingerprint(company, ENRICHMENT_FIELDS), scrape,
+                                   lambda changes: changes is not None)
+            enriched = {**company, **(changes or {})}
+            enriched['content_fingerprint'] = fingerprint(enriched, QUALIFICATION_FIELDS)
+            publish(company, {**(changes or {}), 'content_fingerprint': enriched['content_fingerprint']})
+            return enriched
+
+        async def qualify(company: Dict):
+            # Best event among those extracted so far; events arrive sorted by
+            # relevance, so a company's first event is already its best one
+            event_context = index.best_event_for(company.get('name', ''))
+            qualification = await cached(
+                "qualification", normalize_company_name(company.get('name', '')),
+                fingerprint(company, QUALIFICATION_FIELDS, event_context, qualifier_signature),
+                lambda: call("qualification", self.lead_qualifier.qualify_lead, company, event_context),
+                lambda result: result.get('ai_assessed', True))
+            stats["companies_processed"] += 1
+            lead = None
+            if qualification.get('is_qualified', False):
+                lead = build_lead_record(company, qualification, event_context)
+                stats["qualified_leads"] += 1
+                if stats["first_lead_seconds"] is None:
+                    stats["first_lead_seconds"] = round(time.perf_counter() - started, 3)
+                sink.on_lead(lead)
+            sink.on_progress(stats)
+            return lead if include_outreach else None
+
+        async def outreach(lead: Dict):
+            result = await cached(
+                "outreach", normalize_company_name(lead['company_name']), fingerprint(lead, OUTREACH_FIELDS),
+                lambda: call("outreach", self.outreach_generator.generate_personalized_outreach, lead),
+                lambda result: result.get('success', False))
+            result['lead_id'] = lead['id']
+            if result.get('success', False):
+                stats["outreach_generated"] += 1
+                sink.on_outreach(build_outreach_record(result))
+            sink.on_progress(stats)
+
+        stages = [
+            self._source(extract, to_enrich, self.concurrency["enrichment"]),
+            self._stage("enrichment", enrich, to_enrich, to_qualify, self.concurrency["qualification"]),
+            self._stage("qualification", qualify, to_qualify, to_outreach, self.concurrency["outreach"]),
+        ]
+        if include_outreach:
+            stages.append(self._stage("outreach", outreach, to_outreach, None, 0))
+        tasks = [asyncio.ensure_future(stage) for stage in stages]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=False)
+
+        stats["stage_seconds"] = {stage: round(seconds, 3) for stage, seconds in stats["stage_seconds"].items()}
+        return stats
+
+    async def _source(self, produce, outbox: asyncio.Queue, downstream_workers: int):
+        try:
+            await produce()
+        finally:
+            for _ in range(downstream_workers):
+                await outbox.put(_DONE)
+
+    async def _stage(self, name: str, handler, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue],
+                     downstream_workers: int):
+        """Run ``concurrency[name]`` workers applying ``handler`` to items from ``inbox``"""
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                try:
+                    result = await handler(item)
+                except Exception as e:
+                    logger.error(f"Pipeline stage {name} failed for {item.get('name', item.get('id', 'item'))}: {e}")
+                    continue
+                if result is not None and outbox is not None:
+                    await outbox.put(result)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency[name])))
+        finally:
+            if outbox is not None:
+                for _ in range(downstream_workers):
+                    await outbox.put(_DONE)
@@ -0,0 +1,82 @@
+"""Columnar helpers shared by the batch (DataFrame) scorers.
+
+The per-object scorers in the scrapers and the lead qualifier loop over keyword
+lists in Python for every record. Company and event attributes (industry, size,
+revenue, technologies, ...) repeat heavily across a batch, so the batch scorers
+factorize each column, evaluate the keyword rules once per distinct value and
+broadcast the results back to every row with numpy indexing.
+"""
+import re
+from typing import Callable, Iterable, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+Records = Union[pd.DataFrame, Mapping[str, Sequence], Sequence[Mapping]]
+
+
+def to_frame(records: Records) -> pd.DataFrame:
+    """Accept a DataFrame, a dict of columns or a list of dicts"""
+    if isinstance(records, pd.DataFrame):
+        return records.reset_index(drop=True)
+    return pd.DataFrame(records)
+
+
+def keyword_pattern(keywords: Iterable[str]) -> re.Pattern:
+    """Compile keywords into one alternation (longest first) for substring search"""
+    unique = sorted({k for k in keywords if k}, key=len, reverse=True)
+    if not unique:
+        return re.compile(r"(?!)")  # never matches
+    return re.compile("|".join(re.escape(k) for k in unique))
+
+
+def factorize_text(df: pd.DataFrame, column: str) -> Tuple[np.ndarray, List[str]]:
+    """
+    Factorize a text column
+    Returns: (codes, uniques) where uniques[codes[i]] is row i as a string ('' when missing)
+    """
+    if column not in df:
+        return np.zeros(len(df), dtype=np.intp), [""]
+    codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+    values = ["" if value is None else str(value) for value in uniques]
+    values.append("")  # slot for missing values
+    return np.where(codes < 0, len(values) - 1, codes), values
+
+
+def evaluate(codes: np.ndarray, uniques: Sequence, func: Callable, dtype=float) -> np.ndarray:
+    """Apply ``func`` once per distinct value and broadcast the result to every row"""
+    table = np.array([func(value) for value in uniques], dtype=dtype)
+    return table[codes]
+
+
+def count_list_matches(df: pd.DataFrame, column: str, predicate: Callable[[str], bool]) -> np.ndarray:
+    """Count list items per row (e.g. technologies) for which ``predicate`` holds"""
+    if column not in df:
+        return np.zeros(len(df), dtype=np.int64)
+    items = df[column].explode()
+    codes, uniques = factorize_text(items.to_frame(), column)
+    matches = evaluate(codes, uniques, predicate, dtype=bool)
+    return np.bincount(items.index.to_numpy()[matches], minlength=len(df))
+
+
+def truthy(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Vectorized equivalent of ``bool(record.get(column))`` for text fields"""
+    if column not in df:
+        return np.zeros(len(df), dtype=bool)
+    values = df[column]
+    return (values.notna() & (values.astype(object) != "")).to_numpy(dtype=bool)
+
+
+def evaluate_combinations(codes: Sequence[np.ndarray], func: Callable, dtype=float) -> np.ndarray:
+    """
+    Apply ``func`` once per distinct combination of several per-row code arrays
+    (e.g. to build a rationale from industry, size and revenue) and broadcast the result.
+    """
+    codes = [np.asarray(c, dtype=np.int64) for c in codes]
+    combined = np.zeros(len(codes[0]), dtype=np.int64)
+    for column in codes:
+        # Mixed-radix key, re-densified after every column so it never overflows
+        combined, _ = pd.factorize(combined * (int(column.max(initial=0)) + 1) + column)
+    _, first_rows = np.unique(combined, return_index=True)
+    table = np.array([func(*(int(column[row]) for column in codes)) for row in first_rows], dtype=dtype)
+    return table[combined]
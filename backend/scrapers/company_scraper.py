@@ -7,6 +7,17 @@ import logging
 from dataclasses import dataclass
 from typing import List, Dict, Optional, Tuple
 import json
+import numpy as np
+from backend.scoring import vectorized
+from backend.scrapers.event_index import EventCompanyIndex, normalize_company_name
+
+# Keywords used by qualification scoring (shared by the per-company and batch scorers)
+QUALIFICATION_INDUSTRY_KEYWORDS = [
+    'graphics', 'signage', 'printing', 'specialty materials',
+    'adhesive', 'films', 'digital', 'visual communications'
+]
+QUALIFICATION_TECH_KEYWORDS = ['film', 'graphic', 'wrap', 'adhesive']
+QUALIFICATION_NEWS_KEYWORDS = ['launch', 'new', 'innovative', 'expand', 'partnership']
 
 @dataclass
 class Company:
@@ -67,8 +78,11 @@ class CompanyScraper:
         logging.basicConfig(level=logging.INFO)
         return logging.getLogger(__name__)
 
-    def extract_companies_from_event(self, event) -> List[Dict]:
-        """Extract companies from event data - NEW METHOD"""
+    def extract_companies_from_event(self, event, index: Optional[EventCompanyIndex] = None) -> List[Dict]:
+        """
+        Extract companies from event data
+        If an EventCompanyIndex is given, the event and its companies are registered in it.
+        """
         try:
             self.logger.info(f"Extracting companies from event: {event.name}")
             companies = []
@@ -111,6 +125,10 @@ class CompanyScraper:
                         'is_target_company': True
                     }
                     companies.append(company_data)
+            if index is not None:
+                event_id = index.add_event(event)
+                for company_data in companies:
+                    index.add(company_data['name'], event_id)
             self.logger.info(f"Extracted {len(companies)} companies from {event.name}")
             return companies
         except Exception as e:
@@ -156,7 +174,7 @@ class CompanyScraper:
                     exhibitors.extend(matches[:20]) # Limit results
                     if exhibitors:
                         break
-            return list(set(exhibitors)) # Remove duplicates
+            return list(dict.fromkeys(exhibitors)) # Remove duplicates, keeping page order
         except Exception as e:
             self.logger.warning(f"Could not scrape exhibitors from {event_url}: {e}")
             return []
@@ -347,12 +365,8 @@ class CompanyScraper:
         # Industry fit scoring
         industry = company_data.get('industry', '')
         if industry:
-            graphics_industries = [
-                'graphics', 'signage', 'printing', 'specialty materials',
-                'adhesive', 'films', 'digital', 'visual communications'
-            ]
             industry_lower = industry.lower()
-            for keyword in graphics_industries:
+            for keyword in QUALIFICATION_INDUSTRY_KEYWORDS:
                 if keyword in industry_lower:
                     score += 0.15
         # Company size scoring
@@ -378,14 +392,13 @@ class CompanyScraper:
         if technologies:
             relevant_tech_count = len([tech for tech in technologies
                                        if any(word in tech.lower()
-                                              for word in ['film', 'graphic', 'wrap', 'adhesive'])])
+                                              for word in QUALIFICATION_TECH_KEYWORDS)])
             score += min(relevant_tech_count * 0.1, 0.2)
         # Recent market activity
         recent_news = company_data.get('recent_news', [])
         if recent_news:
-            innovation_keywords = ['launch', 'new', 'innovative', 'expand', 'partnership']
             for news in recent_news:
-                if any(keyword in str(news).lower() for keyword in innovation_keywords):
+                if any(keyword in str(news).lower() for keyword in QUALIFICATION_NEWS_KEYWORDS):
                     score += 0.05
         # Website and digital presence
         if company_data.get('website'):
@@ -397,6 +410,49 @@ class CompanyScraper:
             score += 0.1
         return min(score, 1.0)  # Cap at 1.0
 
+    def score_companies_batch(self, companies) -> pd.Series:
+        """
+        Vectorized equivalent of _calculate_qualification_score_dict
+        Args:
+            companies: DataFrame, dict of columns or list of company dicts
+        Returns: Series of qualification scores aligned with the input rows
+        """
+        df = vectorized.to_frame(companies)
+
+        def industry_points(industry: str) -> float:
+            industry_lower = industry.lower()
+            return sum(0.15 for keyword in QUALIFICATION_INDUSTRY_KEYWORDS if keyword in industry_lower)
+
+        def size_points(size: str) -> float:
+            size_lower = size.lower()
+            if 'large' in size_lower:
+                return 0.3
+            if 'medium' in size_lower:
+                return 0.2
+            return 0.1 if 'small' in size_lower else 0.0
+
+        def revenue_points(revenue: str) -> float:
+            revenue_text = revenue.lower()
+            if 'b' in revenue_text:
+                return 0.25
+            return 0.15 if 'm' in revenue_text else 0.0
+
+        score = vectorized.evaluate(*vectorized.factorize_text(df, 'industry'), industry_points)
+        score = score + vectorized.evaluate(*vectorized.factorize_text(df, 'size'), size_points)
+        score = score + vectorized.evaluate(*vectorized.factorize_text(df, 'revenue'), revenue_points)
+        tech_pattern = vectorized.keyword_pattern(QUALIFICATION_TECH_KEYWORDS)
+        tech_count = vectorized.count_list_matches(
+            df, 'technologies', lambda tech: tech_pattern.search(tech.lower()) is not None)
+        score = score + np.minimum(tech_count * 0.1, 0.2)
+        news_pattern = vectorized.keyword_pattern(QUALIFICATION_NEWS_KEYWORDS)
+        news_count = vectorized.count_list_matches(
+            df, 'recent_news', lambda news: news_pattern.search(news.lower()) is not None)
+        score = score + news_count * 0.05
+        score = score + np.where(vectorized.truthy(df, 'website'), 0.05, 0.0)
+        score = score + np.where(vectorized.truthy(df, 'linkedin_url'), 0.05, 0.0)
+        score = score + np.where(vectorized.truthy(df, 'source_event'), 0.1, 0.0)
+        return pd.Series(np.minimum(score, 1.0), index=df.index, name='qualification_score')
+
     def search_company_website(self, company_name: str) -> Optional[str]:
         """Find company website using search"""
         try:
@@ -0,0 +1,239 @@
+"""
+Entity resolution for exhibitor names collected across events.
+
+Exhibitor lists spell the same company in many ways ("3M", "3M Company",
+"3M Commercial Solutions"). Companies are matched on, in order:
+
+1. a canonical name key (tokens, legal suffixes and generic trailing
+   descriptors stripped), used as an exact blocking key; descriptors are only
+   stripped when what remains is distinctive ("Signage Solutions" and
+   "Signage Systems" keep them);
+2. the website domain, when both records have one;
+3. MinHash/LSH over character shingles of the canonical key, verified with the
+   exact shingle Jaccard similarity and a token-by-token comparison, for
+   spelling variants.
+
+Names whose numbers differ ("Apex Displays 2-2" and "Apex Displays 22-22")
+are never merged.
+
+All three are hash lookups (LSH only compares names sharing a signature band),
+so the cost of resolving a name barely grows with the number already seen and
+the resolver can run incrementally while companies are still being extracted.
+"""
+import re
+import unicodedata
+import zlib
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "lp", "ltd", "limited", "corp", "corporation", "co", "company",
+    "gmbh", "ag", "plc", "sa", "sas", "srl", "spa", "bv", "nv", "pty", "kg", "oy", "ab",
+}
+# Trailing words that describe a division or region rather than a different company
+GENERIC_DESCRIPTORS = {
+    "solutions", "commercial", "systems", "technologies", "technology", "services", "international",
+    "global", "group", "holdings", "industries", "enterprises", "americas", "america", "usa", "us",
+    "north", "worldwide",
+}
+# Industry words that do not identify a company on their own ("Signage Solutions")
+INDUSTRY_WORDS = {
+    "and", "of", "sign", "signs", "signage", "graphic", "graphics", "print", "printing", "prints", "display",
+    "displays", "imaging", "image", "media", "film", "films", "wrap", "wraps", "digital", "vinyl", "visual",
+    "design", "designs", "coating", "coatings", "materials", "products", "marketing", "color", "colour",
+}
+# Shared hosting/social domains that say nothing about company identity
+IGNORED_DOMAINS = {"linkedin.com", "facebook.com", "twitter.com", "x.com", "instagram.com", "youtube.com",
+                   "google.com", "example.com"}
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def canonical_name(name: str) -> str:
+    """Lowercase ASCII tokens without legal suffixes (or trailing generic descriptors, if the rest is distinctive)"""
+    text = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode("ascii").lower()
+    text = text.replace("&", " and ")
+    # Join dotted initials ("D.G.A." -> "dga") before splitting on punctuation
+    text = re.sub(r"\b([a-z0-9])\.(?=[a-z0-9]\b)", r"\1", text)
+    tokens = re.sub(r"[^a-z0-9]+", " ", text).split()
+    if tokens and tokens[0] == "the" and len(tokens) > 1:
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    stem = list(tokens)
+    while len(stem) > 1 and (stem[-1] in LEGAL_SUFFIXES or stem[-1] in GENERIC_DESCRIPTORS):
+        stem.pop()
+    if any(token not in INDUSTRY_WORDS and token not in GENERIC_DESCRIPTORS for token in stem):
+        tokens = stem
+    return " ".join(tokens)
+
+
+def name_numbers(key: str) -> Tuple[str, ...]:
+    """Numeric tokens of a canonical key, in order"""
+    return tuple(token for token in key.split() if token.isdigit())
+
+
+def tokens_agree(a: str, b: str, min_ratio: float = 0.75) -> bool:
+    """
+    Token-level confirmation of a fuzzy match: the keys have the same numbers and
+    each token pairs with a similarly spelled token of the other key (or the keys
+    only differ in spacing, "avery dennison" / "averydennison")
+    """
+    if name_numbers(a) != name_numbers(b):
+        return False
+    a_tokens, b_tokens = a.split(), b.split()
+    if len(a_tokens) != len(b_tokens):
+        return a.replace(" ", "") == b.replace(" ", "")
+    unpaired = list(b_tokens)
+    for token in a_tokens:
+        match = max(unpaired, key=lambda other: SequenceMatcher(None, token, other).ratio())
+        if SequenceMatcher(None, token, match).ratio() < min_ratio:
+            return False
+        unpaired.remove(match)
+    return True
+
+
+def website_domain(url: Optional[str]) -> str:
+    """Registered host of a website URL without ``www.`` ('' if missing or not identifying)"""
+    if not url:
+        return ""
+    host = urlparse(url if "//" in url else f"//{url}").netloc.lower().split(":")[0]
+    if host.startswith("www."):
+        host = host[4:]
+    return "" if host in IGNORED_DOMAINS else host
+
+
+def shingles(key: str, size: int = 3) -> FrozenSet[str]:
+    padded = f" {key} "
+    return frozenset(padded[i:i + size] for i in range(max(len(padded) - size + 1, 1)))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class MinHasher:
+    """MinHash signatures over string shingles using vectorized universal hashing"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, items: FrozenSet[str]) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(item.encode("utf-8")) for item in items), dtype=np.uint64,
+                             count=len(items))
+        permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+
+class EntityResolver:
+    """Incrementally groups company records that refer to the same entity"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 16, seed: int = 1):
+        """
+        Args:
+            threshold: minimum shingle Jaccard similarity for a fuzzy match (also
+                confirmed token by token, see ``tokens_agree``)
+            num_perm: MinHash signature length (must be divisible by ``bands``)
+            bands: LSH bands; more bands find lower-similarity candidates
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, seed)
+        self.entities: List[Dict] = []
+        self._by_key: Dict[str, int] = {}
+        self._by_domain: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._members: List[Tuple[str, FrozenSet[str], int]] = []  # (key, shingles, entity id) per indexed key
+        self._numbers: List[Tuple[str, ...]] = []  # numeric tokens per entity
+
+    def resolve(self, company: Dict) -> Tuple[Dict, bool]:
+        """
+        Match a company against the entities seen so far
+        Returns: (representative record, True if the company is a new entity)
+        A duplicate's name is added to the representative's ``aliases`` and its
+        non-empty fields fill blanks in the representative; the merged
+        representative is a new dict, the previous one is left untouched.
+        """
+        key = canonical_name(company.get('name', ''))
+        domain = website_domain(company.get('website'))
+        entity_id = self._by_key.get(key)
+        known_key = entity_id is not None
+        if entity_id is None and domain:
+            entity_id = self._by_domain.get(domain)
+            if entity_id is not None and self._numbers[entity_id] != name_numbers(key):
+                entity_id = None
+        if not known_key:
+            key_shingles = shingles(key)
+            bands = self._bands(key_shingles)
+            if entity_id is None:
+                entity_id = self._fuzzy_match(key, key_shingles, bands)
+        is_new = entity_id is None
+        if is_new:
+            entity_id = len(self.entities)
+            self.entities.append(company)
+            self._numbers.append(name_numbers(key))
+        else:
+            self.entities[entity_id] = self._merge(self.entities[entity_id], company)
+        if not known_key:
+            self._index_key(key, key_shingles, bands, entity_id)
+        if domain:
+            self._by_domain.setdefault(domain, entity_id)
+        return self.entities[entity_id], is_new
+
+    def resolve_all(self, companies: List[Dict]) -> List[Dict]:
+        """Resolve a batch of companies, returning one representative per entity in first-seen order"""
+        first = len(self.entities)
+        for company in companies:
+            self.resolve(company)
+        return self.entities[first:]
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def _bands(self, key_shingles: FrozenSet[str]) -> List[Tuple[int, bytes]]:
+        signature = self.hasher.signature(key_shingles)
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def _fuzzy_match(self, key: str, key_shingles: FrozenSet[str], bands) -> Optional[int]:
+        best_id, best_score = None, self.threshold
+        seen = set()
+        for bucket in bands:
+            for member in self._buckets.get(bucket, ()):
+                if member in seen:
+                    continue
+                seen.add(member)
+                member_key, member_shingles, entity_id = self._members[member]
+                score = jaccard(key_shingles, member_shingles)
+                if score >= best_score and tokens_agree(key, member_key):
+                    best_id, best_score = entity_id, score
+        return best_id
+
+    def _index_key(self, key: str, key_shingles: FrozenSet[str], bands, entity_id: int):
+        self._by_key[key] = entity_id
+        member = len(self._members)
+        self._members.append((key, key_shingles, entity_id))
+        for bucket in bands:
+            self._buckets.setdefault(bucket, []).append(member)
+
+    @staticmethod
+    def _merge(representative: Dict, duplicate: Dict) -> Dict:
+        """Copy of the representative with the duplicate's alias and fields merged in
+        (the stored record may already be in use by enrichment workers)"""
+        merged = dict(representative)
+        name = duplicate.get('name', '')
+        merged['aliases'] = list(representative.get('aliases', ()))
+        if name and name != merged.get('name') and name not in merged['aliases']:
+            merged['aliases'].append(name)
+        for field, value in duplicate.items():
+            if field not in ('name', 'aliases') and value and not merged.get(field):
+                merged[field] = value
+        return merged
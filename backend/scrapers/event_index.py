@@ -0,0 +1,60 @@
+"""
+Company name keys and the event/company association index.
+
+Kept free of heavy dependencies so the API and the streaming pipeline can
+import them without loading the scrapers.
+"""
+from typing import Dict, List
+
+
+def normalize_company_name(name: str) -> str:
+    """Case- and whitespace-insensitive key used to match a company across events"""
+    return " ".join((name or "").lower().split())
+
+
+class EventCompanyIndex:
+    """
+    Association between events and the companies extracted from them
+    Built once during extraction (normalized company name -> event ids) so later
+    stages can look up a company's events in O(1) instead of scanning every event.
+    """
+    def __init__(self):
+        self.events = []
+        self._event_ids: Dict[str, List[int]] = {}
+
+    def add_event(self, event) -> int:
+        """Register an event and return its id"""
+        self.events.append(event)
+        return len(self.events) - 1
+
+    def add(self, company_name: str, event_id: int):
+        """Associate a company with an event (a company may attend several events)"""
+        event_ids = self._event_ids.setdefault(normalize_company_name(company_name), [])
+        if event_id not in event_ids:
+            event_ids.append(event_id)
+
+    def merge(self, company_name: str, into: str):
+        """Move a company's events to another name (used when entity resolution finds a duplicate)"""
+        source = normalize_company_name(company_name)
+        target = normalize_company_name(into)
+        if source == target or source not in self._event_ids:
+            return
+        for event_id in self._event_ids.pop(source):
+            self.add(into, event_id)
+
+    def events_for(self, company_name: str) -> List:
+        """All events a company was found at, in extraction order"""
+        return [self.events[event_id] for event_id in self._event_ids.get(normalize_company_name(company_name), [])]
+
+    def best_event_for(self, company_name: str):
+        """The most relevant event for a company (highest relevance_score, first on ties), or None"""
+        events = self.events_for(company_name)
+        if not events:
+            return None
+        return max(events, key=lambda event: getattr(event, 'relevance_score', 0.0) or 0.0)
+
+    def __contains__(self, company_name: str) -> bool:
+        return normalize_company_name(company_name) in self._event_ids
+
+    def __len__(self) -> int:
+        return len(self._event_ids)
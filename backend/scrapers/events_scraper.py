@@ -12,6 +12,16 @@ import logging
 from dataclasses import dataclass
 from typing import List, Dict, Optional
 import re
+import numpy as np
+from backend.scoring import vectorized
+
+# Keywords used by relevance scoring (shared by the per-event and batch scorers)
+GRAPHICS_KEYWORDS = [
+    'sign', 'signage', 'graphics', 'printing', 'wrap', 'vinyl',
+    'digital', 'wide format', 'display', 'advertising', 'visual'
+]
+IMPORTANCE_KEYWORDS = ['expo', 'international', 'global', 'summit', 'united']
+MAJOR_MARKETS = ['las vegas', 'chicago', 'atlanta', 'miami', 'new york']
 
 @dataclass
 class Event:
@@ -25,10 +35,12 @@ class Event:
     relevance_score: float = 0.0
 
 class EventsScraper:
-    def __init__(self):
+    def __init__(self, request_delay: float = 1.0):
         self.logger = self._setup_logging()
         self.driver = None
         self.events = []
+        # Pause between event sources to be polite to the scraped sites
+        self.request_delay = request_delay
 
     def _setup_logging(self):
         logging.basicConfig(level=logging.INFO)
@@ -199,7 +211,7 @@ class EventsScraper:
                         continue
                 if exhibitors:
                     break
-            return list(set(exhibitors))
+            return list(dict.fromkeys(exhibitors))
         except Exception as e:
             self.logger.warning(f"Could not scrape exhibitors from {event_url}: {e}")
             return []
@@ -221,37 +233,58 @@ class EventsScraper:
     def calculate_relevance_score(self, event: Event) -> float:
         """Calculate relevance score for DuPont Tedlar Graphics team"""
         score = 0.0
-        graphics_keywords = [
-            'sign', 'signage', 'graphics', 'printing', 'wrap', 'vinyl',
-            'digital', 'wide format', 'display', 'advertising', 'visual'
-        ]
         text_to_analyze = f"{event.name} {event.description}".lower()
-        for keyword in graphics_keywords:
+        for keyword in GRAPHICS_KEYWORDS:
             if keyword in text_to_analyze:
                 score += 0.1
-        importance_keywords = ['expo', 'international', 'global', 'summit', 'united']
-        for keyword in importance_keywords:
+        for keyword in IMPORTANCE_KEYWORDS:
             if keyword in text_to_analyze:
                 score += 0.15
-        major_markets = ['las vegas', 'chicago', 'atlanta', 'miami', 'new york']
-        if any(market in event.location.lower() for market in major_markets):
+        if any(market in event.location.lower() for market in MAJOR_MARKETS):
             score += 0.1
         return min(score, 1.0)
 
-    def scrape_all_events(self) -> List[Event]:
-        """Scrape events from all sources"""
-        self.logger.info("Starting comprehensive event scraping...")
-        all_events = []
-        sources = [
+    def score_events_batch(self, events) -> pd.Series:
+        """
+        Vectorized equivalent of calculate_relevance_score
+        Args:
+            events: DataFrame, dict of columns or list of event dicts
+        Returns: Series of relevance scores aligned with the input rows
+        """
+        df = vectorized.to_frame(events)
+        market_pattern = vectorized.keyword_pattern(MAJOR_MARKETS)
+
+        def keyword_points(text: str) -> float:
+            text = text.lower()
+            return (sum(0.1 for keyword in GRAPHICS_KEYWORDS if keyword in text)
+                    + sum(0.15 for keyword in IMPORTANCE_KEYWORDS if keyword in text))
+
+        name_codes, names = vectorized.factorize_text(df, 'name')
+        description_codes, descriptions = vectorized.factorize_text(df, 'description')
+        score = vectorized.evaluate_combinations(
+            [name_codes, description_codes],
+            lambda name, description: keyword_points(f"{names[name]} {descriptions[description]}"))
+        score = score + vectorized.evaluate(*vectorized.factorize_text(df, 'location'),
+                                            lambda location: 0.1 if market_pattern.search(location.lower()) else 0.0)
+        return pd.Series(np.minimum(score, 1.0), index=df.index, name='relevance_score')
+
+    def _event_sources(self) -> List:
+        """Scraper functions queried by scrape_all_events"""
+        return [
             self.scrape_isa_sign_expo,
             self.scrape_sgia_events,
             self.scrape_specialty_graphics_events
         ]
-        for scraper_func in sources:
+
+    def scrape_all_events(self) -> List[Event]:
+        """Scrape events from all sources"""
+        self.logger.info("Starting comprehensive event scraping...")
+        all_events = []
+        for scraper_func in self._event_sources():
             try:
                 events = scraper_func()
                 all_events.extend(events)
-                time.sleep(1)
+                time.sleep(self.request_delay)
             except Exception as e:
                 self.logger.error(f"Error in scraper {scraper_func.__name__}: {e}")
         for event in all_events:
@@ -0,0 +1,81 @@
+"""
+Benchmark dashboard and list queries as closed leads accumulate.
+
+Fills the leads table with a mostly closed history, times get_lead_stats and
+a page of get_leads over all statuses, then archives the closed leads with
+DatabaseManager.archive_leads and times the same calls again on the smaller
+leads table (the lead counts in get_lead_stats stay the same).
+
+Usage:
+    python -m benchmarks.bench_archive --leads 1000000 --closed-fraction 0.8
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.database.models import DatabaseManager
+
+STATUSES = ["new", "qualified", "contacted", "responded"]
+PRIORITIES = ["high", "medium", "low"]
+
+
+def populate(db: DatabaseManager, leads: int, closed_fraction: float, seed: int = 13):
+    rng = random.Random(seed)
+    with db.get_connection() as conn:
+        conn.executemany("INSERT INTO companies (name) VALUES (?)", ((f"Company {i}",) for i in range(1000)))
+        conn.executemany("""
+            INSERT INTO leads (company_id, status, priority, overall_score, rationale) VALUES (?, ?, ?, ?, ?)
+        """, ((rng.randint(1, 1000), "closed" if rng.random() < closed_fraction else rng.choice(STATUSES),
+               rng.choice(PRIORITIES), rng.random(), "Prints vehicle wraps") for _ in range(leads)))
+        conn.execute("ANALYZE")
+        conn.commit()
+
+
+def measure(db: DatabaseManager, repeat: int = 5) -> dict:
+    """Best-of-``repeat`` milliseconds per call"""
+    calls = {
+        "lead_stats": db.get_lead_stats,
+        "leads_page": lambda: db.get_leads(limit=50, after_score=0.5, after_id=0),
+        "leads_page_with_archive": lambda: db.get_leads(limit=50, after_score=0.5, after_id=0, include_archived=True),
+    }
+    result = {}
+    for name, call in calls.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+        result[name] = min(timings) * 1000
+    return result
+
+
+def run_benchmark(leads: int = 200000, closed_fraction: float = 0.8) -> dict:
+    with tempfile.TemporaryDirectory() as scratch:
+        db = DatabaseManager(os.path.join(scratch, "archive.db"))
+        populate(db, leads, closed_fraction)
+        before = measure(db)
+        started = time.perf_counter()
+        archived = db.archive_leads(closed_after_days=0, stale_after_days=None, batch_size=5000)
+        archive_seconds = time.perf_counter() - started
+        return {"before": before, "after": measure(db), "archived": archived["closed"],
+                "archive_seconds": archive_seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=200000)
+    parser.add_argument("--closed-fraction", type=float, default=0.8)
+    args = parser.parse_args()
+    result = run_benchmark(args.leads, args.closed_fraction)
+    print(f"{args.leads} leads, archived {result['archived']} closed in {result['archive_seconds']:.1f}s:")
+    for name in result["before"]:
+        print(f"  {name:<24} {result['before'][name]:8.1f}ms -> {result['after'][name]:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark vectorized batch scoring against the per-object scorers.
+
+Usage:
+    python -m benchmarks.bench_batch_scoring --size 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import pandas as pd
+
+from backend.ai_engine.lead_qualifier import LeadQualifier
+from backend.database.models import Company
+from backend.scrapers.company_scraper import CompanyScraper
+
+INDUSTRIES = ["Graphics & Signage", "Digital Printing Equipment", "Chemicals", "Visual Display", ""]
+SIZES = ["Large (1000+ employees)", "Medium (100-500 employees)", "Small (10 employees)", "500+", ""]
+REVENUES = ["$8.2B", "$120M", "$55M", "$12M", "unknown", ""]
+TECHNOLOGIES = ["Vehicle Wraps", "Protective Films", "UV Protection", "Inkjet", "Outdoor Signage"]
+NEWS = ["Launched new line", "Quarterly results", "Expanded into Canada", "New partnership"]
+
+
+def make_companies(size: int, seed: int = 7) -> pd.DataFrame:
+    rng = random.Random(seed)
+    return pd.DataFrame({
+        "name": [f"Company {i}" for i in range(size)],
+        "industry": [rng.choice(INDUSTRIES) for _ in range(size)],
+        "size": [rng.choice(SIZES) for _ in range(size)],
+        "revenue": [rng.choice(REVENUES) for _ in range(size)],
+        "website": [f"https://company{i}.com" if i % 3 else "" for i in range(size)],
+        "linkedin_url": ["https://linkedin.com/company/x" if i % 2 else "" for i in range(size)],
+        "technologies": [rng.sample(TECHNOLOGIES, rng.randint(0, 3)) for _ in range(size)],
+        "recent_news": [rng.sample(NEWS, rng.randint(0, 2)) for _ in range(size)],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=20_000, help="rows scored one at a time")
+    args = parser.parse_args()
+
+    df = make_companies(args.size)
+    qualifier = LeadQualifier(api_key="benchmark")
+    scraper = CompanyScraper()
+    sample = df.head(args.sample).to_dict("records")
+
+    start = time.perf_counter()
+    for record in sample:
+        qualifier._calculate_base_score(Company(**record))
+    per_object = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    qualifier.score_companies_batch(df)
+    batch_elapsed = time.perf_counter() - start
+    print(f"LeadQualifier base score: per-object ~{per_object * args.size:.1f}s (extrapolated), "
+          f"batch {batch_elapsed:.2f}s for {args.size:,} companies")
+
+    start = time.perf_counter()
+    for record in sample:
+        scraper._calculate_qualification_score_dict(record)
+    per_object = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    scraper.score_companies_batch(df)
+    batch_elapsed = time.perf_counter() - start
+    print(f"CompanyScraper qualification score: per-object ~{per_object * args.size:.1f}s (extrapolated), "
+          f"batch {batch_elapsed:.2f}s for {args.size:,} companies")
+
+
+if __name__ == "__main__":
+    main()
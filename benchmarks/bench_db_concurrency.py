@@ -0,0 +1,183 @@
+"""
+Benchmark concurrent API reads from the leads database.
+
+Serves the API with uvicorn in a subprocess and sends requests for random
+keyset pages of leads (with each lead's top decision maker) from many
+concurrent clients, against two servers:
+- blocking: an ``async def`` endpoint calling DatabaseManager directly, so every
+  query runs on the event loop thread and holds up all other requests;
+- async: ``/api/db/leads``, which awaits AsyncDatabase (reader thread pool, WAL).
+Reports page throughput and latency, and the latency of health checks (``/``)
+sent alongside, which shows how long unrelated requests wait behind queries.
+
+Usage:
+    python -m benchmarks.bench_db_concurrency --leads 1000000 --clients 100 --db /tmp/leads-1m.db
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+from fastapi import FastAPI
+
+from backend.api.responses import FastJSONResponse
+from backend.database.models import DatabaseManager
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+STATUSES = ["new", "qualified", "contacted", "responded", "closed"]
+
+
+def populate(db: DatabaseManager, leads: int, seed: int = 5):
+    """Leads spread over leads/10 companies with two stakeholders each (skipped if already populated)"""
+    with db.get_connection() as conn:
+        if conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0] >= leads:
+            return
+        rng = random.Random(seed)
+        companies = max(leads // 10, 1)
+        conn.executemany("INSERT INTO companies (name, qualification_score) VALUES (?, ?)",
+                         ((f"Company {i}", rng.random()) for i in range(companies)))
+        conn.executemany("""
+            INSERT INTO stakeholders (company_id, name, title, decision_maker_score) VALUES (?, ?, ?, ?)
+        """, ((company_id, f"Contact {company_id}-{n}", "Director", rng.random())
+              for company_id in range(1, companies + 1) for n in range(2)))
+        conn.executemany("""
+            INSERT INTO leads (company_id, status, overall_score, rationale) VALUES (?, ?, ?, ?)
+        """, ((rng.randint(1, companies), rng.choice(STATUSES), rng.random(), "Prints vehicle wraps")
+              for _ in range(leads)))
+        conn.execute("ANALYZE")
+        conn.commit()
+
+
+def blocking_app() -> FastAPI:
+    """The /api/db/leads endpoint without the async facade (uvicorn --factory)"""
+    db = DatabaseManager(os.environ["LEADS_DB_PATH"])
+    app = FastAPI()
+
+    @app.get("/")
+    async def root():
+        return {"status": "online"}
+
+    @app.get("/api/db/leads")
+    async def list_database_leads(status: str = None, limit: int = 50, after_score: float = None,
+                                  after_id: int = None, with_decision_maker: bool = False):
+        page = db.get_leads(status=status, limit=limit, after_score=after_score, after_id=after_id,
+                            with_decision_maker=with_decision_maker)
+        return FastJSONResponse({"leads": page, "next_cursor": page.next_cursor})
+    return app
+
+
+SERVERS = {
+    "blocking": ["benchmarks.bench_db_concurrency:blocking_app", "--factory"],
+    "async": ["backend.api.main:app"],
+}
+
+
+def start_server(mode: str, db_path: str, readers: int):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    env = dict(os.environ, LEADS_DB_PATH=db_path, DB_READER_THREADS=str(readers),
+               OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "benchmark"))
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", *SERVERS[mode], "--port", str(port),
+                                "--log-level", "warning"], cwd=ROOT, env=env)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(200):
+        try:
+            httpx.get(url + "/").raise_for_status()
+            return process, url
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+def percentile(samples, fraction: float) -> float:
+    samples = sorted(samples)
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)] * 1000
+
+
+async def drive(url: str, requests: int, clients: int, leads: int, seed: int = 11) -> dict:
+    rng = random.Random(seed)
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait({"status": rng.choice(STATUSES), "limit": 50, "after_score": round(rng.random(), 4),
+                          "after_id": rng.randint(1, leads), "with_decision_maker": "true"})
+    latencies = []
+    health = []
+    done = asyncio.Event()
+
+    async def client(http: httpx.AsyncClient):
+        while not queue.empty():
+            params = queue.get_nowait()
+            started = time.perf_counter()
+            response = await http.get("/api/db/leads", params=params)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    async def health_checks(http: httpx.AsyncClient):
+        while not done.is_set():
+            started = time.perf_counter()
+            (await http.get("/")).raise_for_status()
+            health.append(time.perf_counter() - started)
+            await asyncio.sleep(0.05)
+
+    # Uncompressed, so both servers do the same work per response
+    async with httpx.AsyncClient(base_url=url, headers={"Accept-Encoding": "identity"}, timeout=120,
+                                 limits=httpx.Limits(max_connections=clients + 1)) as http:
+        probe = asyncio.ensure_future(health_checks(http))
+        started = time.perf_counter()
+        await asyncio.gather(*[client(http) for _ in range(clients)])
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe
+    return {
+        "requests_per_second": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": percentile(latencies, 0.95),
+        "health_p50_ms": statistics.median(health) * 1000,
+        "health_p95_ms": percentile(health, 0.95),
+    }
+
+
+def run_benchmark(db_path: str, leads: int, clients: int = 100, requests: int = 2000, readers: int = 4) -> dict:
+    populate(DatabaseManager(db_path), leads)
+    result = {}
+    for mode in SERVERS:
+        process, url = start_server(mode, db_path, readers)
+        try:
+            result[mode] = asyncio.run(drive(url, requests, clients, leads))
+        finally:
+            process.terminate()
+            process.wait()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=100000)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--db", help="database file to populate once and reuse (default: temporary)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as scratch:
+        db_path = args.db or os.path.join(scratch, "leads.db")
+        result = run_benchmark(db_path, args.leads, args.clients, args.requests, args.readers)
+    print(f"{args.clients} clients, {args.requests} requests, {args.leads} leads:")
+    for mode, stats in result.items():
+        print(f"  {mode:<9} {stats['requests_per_second']:6.0f} req/s  p50 {stats['p50_ms']:6.1f}ms  "
+              f"p95 {stats['p95_ms']:6.1f}ms  health check p50 {stats['health_p50_ms']:6.1f}ms "
+              f"p95 {stats['health_p95_ms']:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark per-company rule scoring: legacy nested keyword loops vs the compiled ICP matcher.
+
+Usage:
+    python -m benchmarks.bench_icp_matcher --size 50000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from backend.ai_engine.lead_qualifier import LeadQualifier, GRAPHICS_KEYWORDS, INNOVATION_KEYWORDS
+from backend.database.models import Company
+from benchmarks.bench_batch_scoring import make_companies
+
+
+def legacy_keyword_hits(qualifier: LeadQualifier, company: Company):
+    """The keyword matching _calculate_base_score did before the ICP matcher"""
+    industry_hit = False
+    if company.industry:
+        for target_industry in qualifier.icp_criteria["target_industries"]:
+            if any(word in company.industry.lower() for word in target_industry.lower().split()):
+                industry_hit = True
+                break
+        if not industry_hit:
+            any(word in company.industry.lower() for word in GRAPHICS_KEYWORDS)
+    tech_hits = 0
+    for tech in company.technologies:
+        for focus_area in qualifier.icp_criteria["technology_focus"]:
+            if any(word in tech.lower() for word in focus_area.lower().split()):
+                tech_hits += 1
+                break
+    news_hits = sum(1 for news in company.recent_news
+                    if any(keyword in news.lower() for keyword in INNOVATION_KEYWORDS))
+    return industry_hit, tech_hits, news_hits
+
+
+def compiled_keyword_hits(qualifier: LeadQualifier, company: Company):
+    matcher = qualifier.icp_matcher
+    industry_hit = bool(company.industry) and matcher.industry_level(company.industry) == 2
+    tech_hits = sum(1 for tech in company.technologies if matcher.is_focus_technology(tech))
+    news_hits = sum(1 for news in company.recent_news if matcher.is_innovation_news(news))
+    return industry_hit, tech_hits, news_hits
+
+
+def timed(label: str, func, qualifier, companies):
+    start = time.perf_counter()
+    for company in companies:
+        func(qualifier, company)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:7.3f}s  ({elapsed / len(companies) * 1e6:6.2f} us/company)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    qualifier = LeadQualifier(api_key="benchmark")
+    companies = [Company(**record) for record in make_companies(args.size).to_dict("records")]
+
+    legacy = timed("legacy keyword loops", legacy_keyword_hits, qualifier, companies)
+    compiled = timed("compiled ICP matcher", compiled_keyword_hits, qualifier, companies)
+    timed("full base score (compiled)", lambda q, c: q._calculate_base_score(c), qualifier, companies)
+    print(f"keyword matching speedup: {legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
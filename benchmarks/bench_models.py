@@ -0,0 +1,126 @@
+"""
+Benchmark materializing DatabaseManager rows as model objects.
+
+Compares the previous mapping (sqlite3.Row lookups by column name into
+dict-backed dataclasses, JSON columns decoded eagerly) with the current one
+(positional tuple rows into slotted dataclasses, JSON columns decoded on first
+use), reporting wall time and peak traced memory for leads and companies.
+
+Usage:
+    python -m benchmarks.bench_models --leads 1000000 --companies 100000
+"""
+import argparse
+import dataclasses
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.database.models import Company, DatabaseManager, Lead
+
+STATUSES = ["new", "qualified", "contacted", "responded", "closed"]
+TECHNOLOGIES = ["vinyl graphics", "vehicle wraps", "digital printing", "wide format", "protective films"]
+
+
+def dict_backed(model):
+    """``model`` as a regular dataclass with a per-instance __dict__ (the models before __slots__)"""
+    return dataclasses.make_dataclass(model.__name__, [(field.name, field.type, dataclasses.field(default=field.default))
+                                                       for field in dataclasses.fields(model)])
+
+
+LegacyLead = dict_backed(Lead)
+LegacyCompany = dict_backed(Company)
+
+
+def legacy_leads(db: DatabaseManager):
+    """The row mapping get_leads did before positional row factories"""
+    with db.get_connection() as conn:
+        rows = conn.execute("""
+            SELECT l.*, e.name as event_name, c.name as company_name, s.name as stakeholder_name
+            FROM leads l
+            LEFT JOIN events e ON l.event_id = e.id
+            LEFT JOIN companies c ON l.company_id = c.id
+            LEFT JOIN stakeholders s ON l.stakeholder_id = s.id
+            ORDER BY l.overall_score DESC, l.id
+        """).fetchall()
+        names = [field.name for field in dataclasses.fields(LegacyLead)]
+        # Fields added since (archived_at, decision_maker_*) were not selected then
+        selected = set(rows[0].keys()) if rows else set()
+        return [LegacyLead(**{name: row[name] if name in selected else None for name in names}) for row in rows]
+
+
+def legacy_companies(db: DatabaseManager):
+    """The row mapping get_companies did before lazily decoded JSON columns"""
+    with db.get_connection() as conn:
+        rows = conn.execute("SELECT * FROM companies ORDER BY qualification_score DESC, id").fetchall()
+        companies = []
+        for row in rows:
+            values = {name: row[name] for name in row.keys()}
+            values["technologies"] = json.loads(row["technologies"] or "[]")
+            values["recent_news"] = json.loads(row["recent_news"] or "[]")
+            companies.append(LegacyCompany(**values))
+        return companies
+
+
+def populate(db: DatabaseManager, leads: int, companies: int, seed: int = 3):
+    rng = random.Random(seed)
+    with db.get_connection() as conn:
+        conn.executemany("""
+            INSERT INTO companies (name, industry, description, technologies, recent_news, qualification_score)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, ((f"Company {i}", "Graphics & Signage", f"Company {i} makes large format graphics",
+               json.dumps(rng.sample(TECHNOLOGIES, 3)), json.dumps([f"Company {i} opens a new plant"]), rng.random())
+              for i in range(companies)))
+        conn.executemany("""
+            INSERT INTO leads (company_id, status, overall_score, rationale, outreach_subject)
+            VALUES (?, ?, ?, ?, ?)
+        """, ((rng.randint(1, companies), rng.choice(STATUSES), rng.random(), "Prints vehicle wraps",
+               "Extending graphic lifespan") for _ in range(leads)))
+        conn.commit()
+
+
+def measure(func):
+    """(seconds, peak traced MB) of one call, timed without tracing"""
+    gc.collect()
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return seconds, peak / 2 ** 20
+
+
+def run_benchmark(leads: int = 100000, companies: int = 10000) -> dict:
+    with tempfile.TemporaryDirectory() as scratch:
+        db = DatabaseManager(os.path.join(scratch, "bench.db"))
+        populate(db, leads, companies)
+        return {
+            "leads": {"legacy": measure(lambda: legacy_leads(db)), "current": measure(db.get_leads)},
+            "companies": {"legacy": measure(lambda: legacy_companies(db)), "current": measure(db.get_companies)},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=100000)
+    parser.add_argument("--companies", type=int, default=10000)
+    args = parser.parse_args()
+    result = run_benchmark(args.leads, args.companies)
+    for table, count in (("leads", args.leads), ("companies", args.companies)):
+        print(f"{count} {table}: " + ", ".join(f"{name} {seconds:.2f}s {peak:.0f}MB"
+                                                for name, (seconds, peak) in result[table].items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+End-to-end benchmark of run_lead_generation_pipeline against local stand-ins.
+
+Event and company websites are served by the fixture web server and every LLM
+call goes to the fake OpenAI server (seeded latency and error distribution), so
+runs need no network access and API call counts are reproducible. Reports
+per-stage busy time, time to first lead, throughput, peak memory and API call
+counts per size, and can compare against a saved baseline to catch regressions.
+
+Usage:
+    python -m benchmarks.bench_pipeline --sizes 10 100 1000 10000
+    python -m benchmarks.bench_pipeline --sizes 10 100 --save-baseline pipeline_baseline.json
+    python -m benchmarks.bench_pipeline --sizes 10 100 --baseline pipeline_baseline.json --tolerance 0.25
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from backend.ai_engine.lead_qualifier import LeadQualifier
+from backend.ai_engine.outreach_generator import OutreachGenerator
+from backend.api import main
+from backend.devtools.fake_openai_server import FakeOpenAIServer
+from backend.devtools.fixture_web_server import FixtureWebServer, route_session_to
+from backend.scrapers.company_scraper import CompanyScraper
+from backend.scrapers.events_scraper import Event, EventsScraper, MAJOR_MARKETS
+
+# Lower is better for every compared metric
+COMPARED_METRICS = ["wall_seconds", "peak_memory_mb", "llm_calls", "web_requests"]
+
+
+class FixtureEventsScraper(EventsScraper):
+    """EventsScraper whose only source is a set of generated events hosted on the fixture server"""
+
+    def __init__(self, event_count: int):
+        super().__init__(request_delay=0)
+        self.event_count = event_count
+
+    def _event_sources(self) -> List:
+        return [self.scrape_fixture_events]
+
+    def scrape_fixture_events(self) -> List[Event]:
+        return [
+            Event(
+                name=f"Fixture Sign Expo {i}",
+                date="May 1-3, 2025",
+                location=f"{MAJOR_MARKETS[i % len(MAJOR_MARKETS)].title()}",
+                industry="Signage & Graphics",
+                website=FixtureWebServer.event_url(i),
+                description="Trade show for the sign, graphics and display industry"
+            )
+            for i in range(self.event_count)
+        ]
+
+
+@contextmanager
+def environ(**values):
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@contextmanager
+def pipeline_components(size: int, llm_server: FakeOpenAIServer, web_server: FixtureWebServer,
+                        retry_backoff: float):
+    """Point main's module-level components at the local servers for the duration of a run"""
+    names = ["events_scraper", "company_scraper", "lead_qualifier", "outreach_generator"]
+    original = {name: getattr(main, name) for name in names}
+    with environ(OPENAI_BASE_URL=llm_server.base_url):
+        lead_qualifier = LeadQualifier("benchmark")
+        outreach_generator = OutreachGenerator("benchmark", request_delay=0)
+    lead_qualifier.llm.backoff_seconds = retry_backoff
+    outreach_generator.llm.backoff_seconds = retry_backoff
+    company_scraper = CompanyScraper()
+    route_session_to(company_scraper.session, web_server)
+    main.events_scraper = FixtureEventsScraper(math.ceil(size / web_server.exhibitors_per_event))
+    main.company_scraper = company_scraper
+    main.lead_qualifier = lead_qualifier
+    main.outreach_generator = outreach_generator
+    for storage in (main.leads_storage, main.events_storage, main.companies_storage, main.outreach_storage):
+        storage.clear()
+    main.stage_cache.clear()
+    try:
+        yield
+    finally:
+        for name, component in original.items():
+            setattr(main, name, component)
+
+
+def run_once(size: int, llm_latency: float = 0.0, llm_jitter: float = 0.0, error_rate: float = 0.0,
+             seed: int = 7, retry_backoff: float = 0.0, measure_memory: bool = False) -> Dict:
+    """Run the pipeline once for ``size`` companies and collect its measurements"""
+    with FakeOpenAIServer(latency=llm_latency, latency_jitter=llm_jitter, error_rate=error_rate, seed=seed) \
+            as llm_server, FixtureWebServer() as web_server:
+        with pipeline_components(size, llm_server, web_server, retry_backoff):
+            if measure_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            asyncio.run(main.run_lead_generation_pipeline(["Signage"], size, "Medium", True))
+            wall = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if measure_memory else 0
+            if measure_memory:
+                tracemalloc.stop()
+        status = main.task_status
+        if status["status"] != "completed":
+            raise RuntimeError(f"Pipeline failed at size {size}: {status['message']}")
+        results = status["results"]
+        return {
+            "companies_discovered": results["companies_analyzed"],
+            "wall_seconds": round(wall, 3),
+            "throughput_companies_per_second": round(min(size, results["companies_analyzed"]) / wall, 2),
+            "stage_seconds": results["stage_seconds"],
+            "first_lead_seconds": results["first_lead_seconds"],
+            "peak_memory_mb": round(peak / 2 ** 20, 2),
+            "llm_calls": llm_server.request_counts.get("POST /v1/chat/completions", 0),
+            "llm_retries": results["llm_usage"]["retries"],
+            "llm_errors": results["llm_usage"]["errors"],
+            "web_requests": sum(web_server.request_counts.values()),
+            "qualified_leads": results["qualified_leads"],
+            "outreach_generated": results["outreach_generated"],
+        }
+
+
+def run_benchmark(size: int, repeat: int = 1, measure_memory: bool = True, **options) -> Dict:
+    """Median timings over ``repeat`` runs, plus one separate traced run for peak memory"""
+    runs = [run_once(size, **options) for _ in range(repeat)]
+    result = dict(runs[len(runs) // 2])
+    result["wall_seconds"] = round(statistics.median(run["wall_seconds"] for run in runs), 3)
+    result["stage_seconds"] = {stage: round(statistics.median(run["stage_seconds"][stage] for run in runs), 3)
+                               for stage in result["stage_seconds"]}
+    result["throughput_companies_per_second"] = round(
+        min(size, result["companies_discovered"]) / result["wall_seconds"], 2) if result["wall_seconds"] else 0.0
+    if measure_memory:
+        result["peak_memory_mb"] = run_once(size, measure_memory=True, **options)["peak_memory_mb"]
+    return result
+
+
+def compare_to_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Describe every metric that is worse than the baseline by more than ``tolerance`` (a fraction)"""
+    regressions = []
+    for size, result in results.items():
+        expected = baseline.get(size)
+        if not expected:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in expected or not result.get(metric):
+                continue
+            limit = expected[metric] * (1 + tolerance)
+            if result[metric] > limit:
+                regressions.append(f"size {size}: {metric} {result[metric]} > {expected[metric]} "
+                                   f"(+{tolerance:.0%} tolerance)")
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size (median wall time is reported)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="mean mock LLM latency in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="std deviation of mock LLM latency")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="fraction of mock LLM calls failing")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak memory run")
+    parser.add_argument("--baseline", help="JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression as a fraction")
+    parser.add_argument("--save-baseline", help="write the results to this JSON file")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    options = dict(llm_latency=args.llm_latency, llm_jitter=args.llm_jitter, error_rate=args.error_rate,
+                   seed=args.seed)
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = result = run_benchmark(size, repeat=args.repeat, measure_memory=not args.no_memory,
+                                                    **options)
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in result["stage_seconds"].items())
+        print(f"{size:>6} companies: {result['wall_seconds']:.2f}s "
+              f"({result['throughput_companies_per_second']:.1f}/s, first lead {result['first_lead_seconds']}s) "
+              f"[{stages}] "
+              f"peak {result['peak_memory_mb']:.1f}MB, {result['llm_calls']} LLM calls "
+              f"({result['llm_retries']} retries), {result['web_requests']} web requests")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
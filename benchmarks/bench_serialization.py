@@ -0,0 +1,175 @@
+"""
+Benchmark JSON encoding and compression of large lead exports.
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps) with the fast
+encoder in backend/api/responses.py: cold, with cached per-lead encodings, and
+with the whole export array cached between writes. Also reports response bytes
+raw, gzipped and (if installed) brotli-compressed, and compares a page of
+/api/leads in the full and compact views.
+
+Usage:
+    python -m benchmarks.bench_serialization --sizes 1000 10000
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.api import main as api
+from backend.api import responses
+from backend.api.compression import brotli
+from backend.api.responses import dumps, json_array, with_encoded_field
+from backend.api.storage import RecordStore, field_key
+from backend.pipeline.streaming import make_lead_id
+
+INDUSTRIES = ["Graphics & Signage", "Digital Printing Equipment", "Visual Display", "Vehicle Wraps"]
+SIZES = ["Large (1000+ employees)", "Medium (100-500 employees)", "Small (10-50 employees)"]
+
+
+def make_leads(size: int, seed: int = 7) -> RecordStore:
+    rng = random.Random(seed)
+    leads = RecordStore(field_key("id"), cache_encoded=True)
+    for i in range(size):
+        name = f"Company {i}"
+        leads.upsert({
+            "id": make_lead_id(name, "ISA Sign Expo"),
+            "company_name": name,
+            "company_description": f"{name} manufactures large format graphics and protective films. " * 3,
+            "company_size": rng.choice(SIZES),
+            "industry": rng.choice(INDUSTRIES),
+            "revenue": f"${rng.randint(5, 900)}M",
+            "website": f"https://company{i}.com",
+            "qualification_score": round(rng.random(), 3),
+            "qualification_reasons": ["Industry alignment", "Company size", "Event participation"],
+            "industry_alignment": rng.choice(INDUSTRIES),
+            "event_context": "ISA Sign Expo",
+            "contact_name": f"Contact {i}",
+            "contact_title": "Director, Product Management",
+            "contact_linkedin": f"https://www.linkedin.com/in/contact-{i}/",
+            "created_at": datetime(2025, 1, 1).isoformat(),
+        })
+    return leads
+
+
+def envelope(leads) -> dict:
+    return {"export_type": "leads", "exported_at": datetime.now().isoformat(), "count": len(leads)}
+
+
+def timed(func, repeat: int) -> float:
+    """Median seconds per call"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def run_benchmark(size: int, repeat: int = 5) -> dict:
+    leads = make_leads(size)
+
+    def default_path():
+        return json.dumps(jsonable_encoder({**envelope(leads), "data": leads}), ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8")
+
+    def stdlib_path():
+        encoder = responses.orjson
+        responses.orjson = None
+        try:
+            return dumps({**envelope(leads), "data": leads})
+        finally:
+            responses.orjson = encoder
+
+    def fast_path():
+        return dumps({**envelope(leads), "data": leads})
+
+    def cached_rows_path():
+        return with_encoded_field(envelope(leads), "data", json_array(leads.encoded()))
+
+    def cached_array_path():
+        return with_encoded_field(envelope(leads), "data", leads.encoded_array())
+
+    cached_array_path()  # warm the per-lead and whole-array encodings
+    body = fast_path()
+    result = {
+        "leads": size,
+        "encode_seconds": {
+            "jsonable_encoder+json": timed(default_path, repeat),
+            "stdlib_json": timed(stdlib_path, repeat),
+            "fast_json": timed(fast_path, repeat) if responses.orjson is not None else None,
+            "cached_rows": timed(cached_rows_path, repeat),
+            "cached_array": timed(cached_array_path, repeat),
+        },
+        "bytes": {"raw": len(body), "gzip": len(gzip.compress(body, compresslevel=6))},
+        "compress_seconds": {"gzip": timed(lambda: gzip.compress(body, compresslevel=6), repeat)},
+    }
+    if brotli is not None:
+        result["bytes"]["br"] = len(brotli.compress(body, quality=4))
+        result["compress_seconds"]["br"] = timed(lambda: brotli.compress(body, quality=4), repeat)
+    return result
+
+
+def make_outreach(lead: dict) -> dict:
+    follow_ups = [{"sequence_number": n, "days_after": 3 * n, "subject_line": f"Following up ({n})",
+                   "message": f"Hi {lead['contact_name']}, following up on my note about Tedlar films. " * 8}
+                  for n in (1, 2, 3)]
+    return {
+        "id": f"outreach_{lead['id']}", "lead_id": lead["id"],
+        "subject_line": f"Extending graphic lifespan for {lead['company_name']}",
+        "primary_message": f"Hi {lead['contact_name']}, I came across {lead['company_name']}. " * 20,
+        "follow_up_sequence": follow_ups,
+        "personalization_elements": {"company_reference": lead["company_name"], "event_mention": "ISA Sign Expo"},
+        "generated_at": datetime(2025, 1, 1).isoformat(), "status": "generated",
+    }
+
+
+def run_page_benchmark(page_size: int = 100, repeat: int = 20) -> dict:
+    """Encode one /api/leads page (leads with outreach) in the full and compact views"""
+    api.leads_storage.clear()
+    api.outreach_storage.clear()
+    for lead in make_leads(page_size):
+        api.leads_storage.upsert(lead)
+        api.outreach_storage.upsert(make_outreach(lead))
+    page = list(api.leads_storage)
+    compact = list(api.LEAD_LIST_FIELDS) + ["has_outreach"]
+    views = {
+        "full": lambda: json_array([api._lead_list_row(lead, row, None)
+                                    for lead, row in zip(page, api.leads_storage.encoded(page))]),
+        "compact": lambda: json_array([api._lead_list_row(lead, None, compact) for lead in page]),
+    }
+    result = {view: {"seconds": timed(encode, repeat), "bytes": len(encode())} for view, encode in views.items()}
+    api.leads_storage.clear()
+    api.outreach_storage.clear()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=100, help="leads per /api/leads page")
+    args = parser.parse_args()
+    for size in args.sizes:
+        result = run_benchmark(size, args.repeat)
+        timings = ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in result["encode_seconds"].items()
+                            if seconds is not None)
+        sizes = ", ".join(f"{name} {count / 1024:.0f}KB" for name, count in result["bytes"].items())
+        compress = ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in result["compress_seconds"].items())
+        print(f"{size:>6} leads: encode [{timings}] size [{sizes}] compress [{compress}]")
+    page = run_page_benchmark(args.page_size)
+    print(f"/api/leads page of {args.page_size}: " + ", ".join(
+        f"{view} {result['seconds'] * 1000:.2f}ms {result['bytes'] / 1024:.0f}KB" for view, result in page.items()))
+
+
+if __name__ == "__main__":
+    main()
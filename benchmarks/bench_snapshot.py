@@ -0,0 +1,107 @@
+"""
+Benchmark exporting leads for analytics.
+
+Compares loading every lead into pandas the way analysts do today (the whole
+table materialized as dicts, encoded as one JSON document like
+``/api/export/leads``, decoded and turned into a DataFrame) with a columnar
+snapshot (DatabaseManager.export_snapshot written in chunks from the cursor,
+then load_snapshot). Also times an incremental snapshot after 1% of the leads
+change. Reports wall time, peak traced memory and bytes on the wire/disk.
+
+Usage:
+    python -m benchmarks.bench_snapshot --leads 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas
+
+from backend.api.responses import dumps
+from backend.database import snapshot
+from backend.database.models import DatabaseManager
+
+STATUSES = ["new", "qualified", "contacted", "responded", "closed"]
+
+
+def populate(db: DatabaseManager, leads: int, seed: int = 17):
+    rng = random.Random(seed)
+    with db.get_connection() as conn:
+        conn.executemany("INSERT INTO companies (name) VALUES (?)", ((f"Company {i}",) for i in range(1000)))
+        conn.executemany("""
+            INSERT INTO leads (company_id, status, overall_score, rationale, outreach_subject, updated_at)
+            VALUES (?, ?, ?, ?, ?, '2025-01-01 00:00:00')
+        """, ((rng.randint(1, 1000), rng.choice(STATUSES), rng.random(), "Prints vehicle wraps for fleets",
+               "Extending graphic lifespan") for _ in range(leads)))
+        conn.commit()
+
+
+def json_export(db: DatabaseManager):
+    """The JSON export path: all leads as dicts, one document, decoded into a DataFrame"""
+    body = dumps({"data": db.export_leads_to_dict()})
+    return pandas.DataFrame(json.loads(body)["data"]), len(body)
+
+
+def snapshot_export(db: DatabaseManager, directory: str, since=None):
+    manifest = db.export_snapshot("leads", directory, since=since)
+    size = os.path.getsize(os.path.join(directory, manifest["file"]))
+    return snapshot.load_snapshot(manifest["manifest"]), size, manifest
+
+
+def measure(func):
+    """(seconds, peak traced MB, result) of one call, timed without tracing"""
+    gc.collect()
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 2 ** 20, result
+
+
+def run_benchmark(leads: int = 100000, changed: float = 0.01) -> dict:
+    with tempfile.TemporaryDirectory() as scratch:
+        db = DatabaseManager(os.path.join(scratch, "snapshot.db"))
+        populate(db, leads)
+        out = os.path.join(scratch, "snapshots")
+        seconds, peak, (_, size) = measure(lambda: json_export(db))
+        result = {"json": {"seconds": seconds, "peak_mb": peak, "bytes": size, "rows": leads}}
+        seconds, peak, (_, size, manifest) = measure(lambda: snapshot_export(db, out))
+        result["snapshot"] = {"seconds": seconds, "peak_mb": peak, "bytes": size, "rows": manifest["rows"]}
+        with db.get_connection() as conn:
+            conn.execute("UPDATE leads SET status = 'contacted', updated_at = ? WHERE id % ? = 0",
+                         (manifest["watermark"], int(1 / changed)))
+            conn.commit()
+        time.sleep(1)  # so the refresh's watermark is past the changed rows' updated_at
+        seconds, peak, (_, size, delta) = measure(lambda: snapshot_export(db, out, since=manifest["watermark"]))
+        result["incremental"] = {"seconds": seconds, "peak_mb": peak, "bytes": size, "rows": delta["rows"]}
+        result["format"] = manifest["format"]
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=100000)
+    parser.add_argument("--changed", type=float, default=0.01, help="fraction of leads changed before the refresh")
+    args = parser.parse_args()
+    result = run_benchmark(args.leads, args.changed)
+    print(f"{args.leads} leads into pandas (snapshot format: {result.pop('format')}):")
+    for mode, stats in result.items():
+        print(f"  {mode:<12} {stats['rows']:8d} rows  {stats['seconds']:6.2f}s  peak {stats['peak_mb']:6.0f}MB  "
+              f"{stats['bytes'] / 2 ** 20:6.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
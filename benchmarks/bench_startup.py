@@ -0,0 +1,77 @@
+"""
+Benchmark API cold start with ``python -X importtime``.
+
+Imports ``backend.api.main`` in fresh interpreters and reports the median
+cumulative import time, the slowest top-level imports and whether any of the
+heavy dependencies that should only load on first use (scrapers, pandas,
+openai) were imported.
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Dependencies the API must not import until a component needs them
+DEFERRED_MODULES = ["pandas", "numpy", "openai", "bs4", "selenium", "requests",
+                    "backend.scrapers.events_scraper", "backend.scrapers.company_scraper",
+                    "backend.ai_engine.lead_qualifier", "backend.ai_engine.outreach_generator"]
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_profile(module: str = "backend.api.main") -> Dict[str, Tuple[int, int, int]]:
+    """{module: (self microseconds, cumulative microseconds, nesting depth)} for a fresh import"""
+    env = dict(os.environ, OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "benchmark"))
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    profile = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            profile[name] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return profile
+
+
+def deferred_imports(profile: Dict[str, Tuple[int, int, int]]) -> List[str]:
+    """Heavy modules that were imported although they should load lazily"""
+    return [module for module in DEFERRED_MODULES if module in profile]
+
+
+def run_benchmark(module: str = "backend.api.main", repeat: int = 5) -> Dict:
+    profiles = [import_profile(module) for _ in range(repeat)]
+    last = profiles[-1]
+    top_level = sorted(((name, cumulative) for name, (_, cumulative, depth) in last.items() if depth == 1),
+                       key=lambda item: item[1], reverse=True)
+    return {
+        "module": module,
+        "import_seconds": statistics.median(profile[module][1] for profile in profiles) / 1e6,
+        "slowest_imports": [(name, cumulative / 1e6) for name, cumulative in top_level[:8]],
+        "deferred_imports": deferred_imports(last),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="backend.api.main")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    result = run_benchmark(args.module, args.repeat)
+    print(f"import {result['module']}: {result['import_seconds'] * 1000:.0f}ms (median of {args.repeat})")
+    for name, seconds in result["slowest_imports"]:
+        print(f"  {name:<40} {seconds * 1000:7.1f}ms")
+    if result["deferred_imports"]:
+        print("Imported eagerly (should load on first use): " + ", ".join(result["deferred_imports"]))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
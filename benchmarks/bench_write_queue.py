@@ -0,0 +1,101 @@
+"""
+Benchmark sustained pipeline writes from parallel workers.
+
+Producer threads (standing in for enrichment/qualification workers) each save
+companies and their leads, against two write paths on the same WAL database:
+- legacy: DatabaseManager.create_company/create_lead, one commit per row, with
+  every producer contending for SQLite's write lock;
+- queue: WriteBehindQueue, a single writer thread committing queued rows in
+  groups, producers waiting for each acknowledgement at the end.
+Reports rows written per second and writes that failed (e.g. "database is locked").
+
+Usage:
+    python -m benchmarks.bench_write_queue --producers 8 --rows 2000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.database.models import Company, DatabaseManager, Lead
+from backend.database.write_queue import WriteBehindQueue
+
+
+def records(producer: int, rows: int):
+    """``rows`` (company, lead) pairs for one producer"""
+    for i in range(rows):
+        name = f"Company {producer}-{i}"
+        yield (Company(name=name, industry="Graphics & Signage", technologies=["vinyl graphics"]),
+               Lead(company_name=name, overall_score=(i % 100) / 100, rationale="Prints vehicle wraps",
+                    external_id=f"lead_{producer}_{i}"))
+
+
+def legacy_producer(db: DatabaseManager, producer: int, rows: int, errors: list):
+    for company, lead in records(producer, rows):
+        try:
+            lead.company_id = db.create_company(company)
+            db.create_lead(lead)
+        except Exception as e:
+            errors.append(e)
+
+
+def queue_producer(queue: WriteBehindQueue, producer: int, rows: int, errors: list):
+    futures = []
+    for company, lead in records(producer, rows):
+        futures.append(queue.create_company(company))
+        futures.append(queue.create_lead(lead))
+    for future in futures:
+        if future.exception() is not None:
+            errors.append(future.exception())
+
+
+def run_producers(target, sink, producers: int, rows: int) -> dict:
+    errors = []
+    threads = [threading.Thread(target=target, args=(sink, producer, rows, errors)) for producer in range(producers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    return {"seconds": seconds, "rows_per_second": 2 * producers * rows / seconds, "errors": len(errors)}
+
+
+def run_benchmark(producers: int = 8, rows: int = 1000, max_batch: int = 256, max_delay: float = 0.02) -> dict:
+    with tempfile.TemporaryDirectory() as scratch:
+        legacy_db = DatabaseManager(os.path.join(scratch, "legacy.db"))
+        legacy_db.enable_wal()
+        queue_db = DatabaseManager(os.path.join(scratch, "queue.db"))
+        queue_db.enable_wal()
+        queue = WriteBehindQueue(queue_db, max_batch=max_batch, max_delay=max_delay)
+        try:
+            result = {
+                "legacy": run_producers(legacy_producer, legacy_db, producers, rows),
+                "queue": run_producers(queue_producer, queue, producers, rows),
+            }
+        finally:
+            queue.close()
+        result["queue"]["batches"] = queue.stats["batches"]
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--producers", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=1000, help="companies (each with a lead) per producer")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-delay", type=float, default=0.02)
+    args = parser.parse_args()
+    result = run_benchmark(args.producers, args.rows, args.max_batch, args.max_delay)
+    print(f"{args.producers} producers x {args.rows} companies and leads:")
+    for mode, stats in result.items():
+        print(f"  {mode:<7} {stats['rows_per_second']:8.0f} rows/s  {stats['seconds']:6.2f}s  "
+              f"{stats['errors']} failed writes" + (f"  {stats['batches']} commits" if "batches" in stats else ""))
+
+
+if __name__ == "__main__":
+    main()
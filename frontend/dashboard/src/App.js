@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import {
   Users,
   TrendingUp,
@@ -81,6 +81,26 @@ const mockTaskStatus = {
   }
 };
 
+// Page size of /api/leads, used when live leads are merged into the list
+const LEADS_PAGE_SIZE = 20;
+
+// Insert a lead pushed by /api/stream into the current page, keeping the API's sort order
+const insertLead = (leads, lead, sortBy, minScore) => {
+  // Lead ids are stable across runs, so a known id is an update of that lead
+  const others = leads.filter(existing => existing.id !== lead.id);
+  if ((lead.qualification_score || 0) < minScore) {
+    return others.length === leads.length ? leads : others;
+  }
+  const descending = sortBy !== 'company_name';
+  const sorted = [...others, { ...leads.find(existing => existing.id === lead.id), ...lead }].sort((a, b) => {
+    const x = a[sortBy] ?? '';
+    const y = b[sortBy] ?? '';
+    const order = x < y ? -1 : x > y ? 1 : 0;
+    return descending ? -order : order;
+  });
+  return sorted.slice(0, LEADS_PAGE_SIZE);
+};
+
 const App = () => {
   const [activeTab, setActiveTab] = useState('dashboard');
   const [dashboardStats, setDashboardStats] = useState(mockDashboardStats);
@@ -117,6 +137,22 @@ const fetchLeads = useCallback(async () => {
   }
 }, [sortBy, scoreFilter]);
 
+// The list holds compact leads; the modal loads the full record on open
+const openLead = useCallback(async (lead) => {
+  setSelectedLead(lead);
+  try {
+    const response = await fetch(`${API_BASE}/api/leads/${lead.id}`);
+    if (response.ok) {
+      const data = await response.json();
+      setSelectedLead(current => (current && current.id === lead.id
+        ? { ...current, ...data.lead, has_outreach: data.outreach.length > 0, outreach: data.outreach[0] }
+        : current));
+    }
+  } catch (error) {
+    console.log('Using list data for lead details');
+  }
+}, []);
+
 const fetchTaskStatus = useCallback(async () => {
   try {
     const response = await fetch(`${API_BASE}/api/task-status`);
@@ -142,26 +178,9 @@ const fetchTaskStatus = useCallback(async () => {
         include_outreach: true
       })
     });
-    if (response.ok) {
-      // Start polling for status updates
-      const pollStatus = setInterval(async () => {
-        try {
-          const statusResponse = await fetch(`${API_BASE}/api/task-status`);
-          if (statusResponse.ok) {
-            const statusData = await statusResponse.json();
-            setTaskStatus(statusData); // <-- update progress bar
-            if (statusData.status === 'completed' || statusData.status === 'error') {
-              clearInterval(pollStatus);
-              setIsLoading(false);
-              await fetchDashboardStats();
-              await fetchLeads();
-            }
-          }
-        } catch (error) {
-          clearInterval(pollStatus);
-          setIsLoading(false);
-        }
-      }, 2000);
+    // Progress, new leads and dashboard updates arrive over /api/stream
+    if (!response.ok) {
+      setIsLoading(false);
     }
   } catch (error) {
     console.error('Error starting lead generation:', error);
@@ -175,14 +194,44 @@ const fetchTaskStatus = useCallback(async () => {
   fetchTaskStatus();
 }, [sortBy, scoreFilter, fetchDashboardStats, fetchLeads, fetchTaskStatus]);
 
+  // Latest filters and fetchers for the stream handlers (avoids reconnecting on every filter change)
+  const latest = useRef({});
+  latest.current = { sortBy, scoreFilter, fetchDashboardStats, fetchLeads, fetchTaskStatus };
+
+  // Live updates pushed by the API instead of polling /api/task-status
   useEffect(() => {
-    if (taskStatus.status === 'running') {
-      const interval = setInterval(() => {
-        fetchTaskStatus();
-      }, 2000);
-      return () => clearInterval(interval);
+    if (typeof EventSource === 'undefined') {
+      return undefined;
     }
-  }, [taskStatus.status, fetchTaskStatus]);
+    const source = new EventSource(`${API_BASE}/api/stream`);
+    const parse = (event) => JSON.parse(event.data);
+    source.addEventListener('progress', (event) => {
+      const status = parse(event);
+      setTaskStatus(status);
+      if (status.status === 'completed' || status.status === 'error') {
+        setIsLoading(false);
+      }
+    });
+    source.addEventListener('dashboard', (event) => {
+      const delta = parse(event);
+      setDashboardStats(prev => ({ ...prev, ...delta }));
+    });
+    source.addEventListener('lead', (event) => {
+      const lead = parse(event);
+      const { sortBy: currentSort, scoreFilter: minScore } = latest.current;
+      setLeads(prev => insertLead(prev, lead, currentSort, minScore));
+    });
+    source.addEventListener('outreach', (event) => {
+      const { lead_id: leadId } = parse(event);
+      setLeads(prev => prev.map(lead => (lead.id === leadId ? { ...lead, has_outreach: true } : lead)));
+    });
+    source.addEventListener('resync', () => {
+      latest.current.fetchDashboardStats();
+      latest.current.fetchLeads();
+      latest.current.fetchTaskStatus();
+    });
+    return () => source.close();
+  }, []);
 
   // Filter leads based on search term
   const filteredLeads = leads.filter(lead =>
@@ -314,6 +363,8 @@ const fetchTaskStatus = useCallback(async () => {
         industry_context: lead.industry_alignment
       }
     };
+    // Generated outreach once the detail request has loaded it
+    const outreachMessage = lead.outreach || mockOutreach;
 
     return (
       <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center z-50 p-4">
@@ -419,18 +470,18 @@ const fetchTaskStatus = useCallback(async () => {
                 <div className="bg-gray-50 rounded-lg p-4 space-y-4">
                   <div>
                     <label className="text-sm font-medium text-gray-700">Subject Line:</label>
-                    <p className="mt-1 text-gray-900">{mockOutreach.subject_line}</p>
+                    <p className="mt-1 text-gray-900">{outreachMessage.subject_line}</p>
                   </div>
                   <div>
                     <label className="text-sm font-medium text-gray-700">Message:</label>
                     <div className="mt-1 whitespace-pre-wrap text-gray-900 bg-white rounded border p-3">
-                      {mockOutreach.primary_message}
+                      {outreachMessage.primary_message}
                     </div>
                   </div>
                   <div>
                     <label className="text-sm font-medium text-gray-700">Personalization Elements:</label>
                     <div className="mt-2 flex flex-wrap gap-2">
-                      {Object.entries(mockOutreach.personalization_elements).map(([key, value]) => (
+                      {Object.entries(outreachMessage.personalization_elements || {}).map(([key, value]) => (
                         <span key={key} className="px-2 py-1 bg-blue-100 text-blue-800 text-xs rounded-full">
                           {key.replace('_', ' ')}: {value}
                         </span>
@@ -579,7 +630,7 @@ const fetchTaskStatus = useCallback(async () => {
           <LeadCard
             key={lead.id}
             lead={lead}
-            onClick={setSelectedLead}
+            onClick={openLead}
           />
         ))}
       </div>
@@ -0,0 +1,70 @@
+"""Fake pipeline collaborators shared by the streaming pipeline tests"""
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.pipeline.streaming import PipelineSink, StreamingLeadPipeline
+from backend.scrapers.events_scraper import Event
+
+# Sorted by relevance, as EventsScraper returns them
+EVENTS = [
+    Event(name="Wrap Summit", date="", location="", industry="Signage", website="",
+          exhibitors=["Company 0", "company  1"], relevance_score=0.8),
+    Event(name="Sign Expo", date="", location="", industry="Signage", website="",
+          exhibitors=[f"Company {i}" for i in range(20)], relevance_score=0.3),
+]
+
+class FakeEventsScraper:
+    def scrape_industry_events(self, industries):
+        return EVENTS
+
+class FakeCompanyScraper:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def extract_companies_from_event(self, event, index=None):
+        from backend.scrapers.company_scraper import CompanyScraper
+        return CompanyScraper.extract_companies_from_event(self, event, index)
+
+    def enrich_company_data(self, company):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        return dict(company, description="enriched")
+
+class FakeQualifier:
+    def qualify_lead(self, company, event):
+        index = int(company['name'].split()[-1])
+        return {"score": 0.9, "is_qualified": index % 2 == 0, "industry_alignment": event.name if event else ""}
+
+class FakeOutreach:
+    def generate_personalized_outreach(self, lead):
+        return {"success": True, "data": {"subject_line": "Hi", "primary_message": "Hello",
+                                          "follow_up_sequence": [], "personalization_elements": {},
+                                          "generated_at": ""}}
+
+class RecordingSink(PipelineSink):
+    def __init__(self):
+        self.companies, self.leads, self.outreach = [], [], []
+
+    def on_company(self, company):
+        self.companies.append(company)
+
+    def on_lead(self, lead):
+        self.leads.append(lead)
+
+    def on_outreach(self, outreach):
+        self.outreach.append(outreach)
+
+def make_pipeline(company_scraper, **kwargs):
+    import logging
+    company_scraper.logger = logging.getLogger("test")
+    company_scraper.target_companies = []
+    return StreamingLeadPipeline(FakeEventsScraper(), company_scraper, FakeQualifier(), FakeOutreach(), **kwargs)
@@ -0,0 +1,77 @@
+import sys
+import os
+import asyncio
+import threading
+import time
+import pytest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+pytest_plugins = ("pytest_asyncio",)
+
+from backend.database.async_db import AsyncDatabase
+from backend.database.models import Company, DatabaseManager, Lead
+
+@pytest.fixture
+def db(tmp_path):
+    db = AsyncDatabase(DatabaseManager(str(tmp_path / "async.db"), connection_per_thread=True), readers=2)
+    yield db
+    db.close()
+
+@pytest.mark.asyncio
+async def test_methods_are_awaitable(db):
+    assert db.wal_enabled
+    company_id = await db.create_company(Company(name="AsyncCo"))
+    await db.create_lead(Lead(company_id=company_id, overall_score=0.5))
+    leads = await db.get_leads(limit=10)
+    assert [lead.company_name for lead in leads] == ["AsyncCo"]
+    assert db.db_path == db.manager.db_path
+
+@pytest.mark.asyncio
+async def test_reads_and_writes_run_on_their_own_threads(db):
+    def current_thread():
+        return threading.current_thread().name
+    writers = await asyncio.gather(*[db.write(current_thread) for _ in range(5)])
+    readers = await asyncio.gather(*[db.read(current_thread) for _ in range(5)])
+    assert len(set(writers)) == 1 and writers[0].startswith("db-writer")
+    assert all(name.startswith("db-reader") for name in readers)
+    # Each reader thread keeps its connection
+    connections = await asyncio.gather(*[db.read(lambda: id(db.manager.get_connection())) for _ in range(4)])
+    assert len(set(connections)) <= 2
+
+@pytest.mark.asyncio
+async def test_slow_queries_do_not_block_the_event_loop(db):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.ensure_future(ticker())
+    await db.read(time.sleep, 0.3)
+    task.cancel()
+    assert ticks >= 10
+
+@pytest.mark.asyncio
+async def test_readers_see_committed_writes_during_wal(db):
+    company_id = await db.create_company(Company(name="First"))
+    await asyncio.gather(*[db.create_lead(Lead(company_id=company_id, overall_score=i / 10)) for i in range(10)],
+                         *[db.get_leads() for _ in range(10)])
+    assert len(await db.get_leads()) == 10
+
+@pytest.mark.asyncio
+async def test_archive_scheduler(db):
+    from backend.database.archive import ArchiveScheduler
+    lead_id = await db.create_lead(Lead(overall_score=0.5))
+    await db.update_lead_status(lead_id, "closed")
+    scheduler = ArchiveScheduler(db, interval=3600, closed_after_days=0)
+    scheduler.start()
+    for _ in range(100):
+        if scheduler.last_result is not None:
+            break
+        await asyncio.sleep(0.01)
+    await scheduler.stop()
+    assert scheduler.last_result == {"closed": 1, "stale": 0}
+    assert await db.get_leads() == [] and len(await db.get_leads(include_archived=True)) == 1
@@ -0,0 +1,82 @@
+import sys
+import os
+import json
+import openai
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.ai_engine.batch_runner import LLMBatchRunner
+from backend.ai_engine.lead_qualifier import LeadQualifier
+from backend.ai_engine.llm_client import InstrumentedLLMClient, track_llm_usage
+from backend.ai_engine.outreach_generator import OutreachGenerator
+from backend.devtools.fake_openai_server import FakeOpenAIServer
+from backend.monitoring.metrics import MetricsRegistry
+
+@pytest.fixture
+def server():
+    with FakeOpenAIServer(fail_custom_ids={"company-1", "primary-1"}) as fake:
+        yield fake
+
+def make_runner(server, component, max_requests_per_file=50000):
+    client = openai.OpenAI(api_key="fake", base_url=server.base_url, max_retries=0)
+    llm = InstrumentedLLMClient(client, component, registry=MetricsRegistry())
+    return LLMBatchRunner(llm, poll_interval=0.01, timeout=10, max_requests_per_file=max_requests_per_file)
+
+def test_build_batch_file():
+    lines = LLMBatchRunner.build_batch_file([("a", {"model": "gpt-4", "messages": []})]).decode().splitlines()
+    assert json.loads(lines[0]) == {"custom_id": "a", "method": "POST", "url": "/v1/chat/completions",
+                                    "body": {"model": "gpt-4", "messages": []}}
+
+def test_run_merges_results_by_custom_id_across_files(server):
+    runner = make_runner(server, "test", max_requests_per_file=2)
+    requests = [(f"r{i}", {"model": "gpt-4", "messages": [{"role": "user", "content": f"hello {i}"}]})
+                for i in range(5)]
+    with track_llm_usage() as usage:
+        results = runner.run(requests, call_site="greet")
+    assert set(results) == {f"r{i}" for i in range(5)}
+    assert all(results.values())
+    assert server.request_counts["POST /v1/batches"] == 3
+    summary = usage.to_dict()
+    assert summary["calls"] == 5
+    assert summary["prompt_tokens"] > 0
+    assert "test.greet.batch" in summary["by_call_site"]
+
+def test_qualify_leads_batch(server):
+    qualifier = LeadQualifier(api_key="fake")
+    companies = [
+        {"name": "Avery Graphics", "industry": "Signage & Graphics", "size": "Large", "revenue": "$5B"},
+        {"name": "Acme Films", "industry": "Specialty Films", "size": "Medium"},
+    ]
+    results = qualifier.qualify_leads_batch(companies, runner=make_runner(server, "lead_qualifier"))
+    base = qualifier.score_companies_batch(companies)
+    assert len(results) == 2
+    assert "Strong fit" in results[0]["rationale"]
+    # company-1 fails in the fake server and falls back to the neutral AI score
+    assert results[1]["score"] == pytest.approx(base["score"][1] * 0.4 + 0.5 * 0.6)
+    assert results[1]["rationale"].startswith("AI analysis unavailable")
+
+def test_qualify_leads_batch_survives_malformed_scores():
+    class StubRunner:
+        def run(self, requests, call_site):
+            return {"company-0": '{"score": 0.9, "rationale": "Strong fit"}', "company-1": '{"score": "high"}',
+                    "company-2": '{"score": null}', "company-3": '{"score": 0.8, "rationale": "Good fit"}'}
+    qualifier = LeadQualifier(api_key="fake")
+    companies = [{"name": f"Company {i}", "industry": "Signage & Graphics"} for i in range(4)]
+    results = qualifier.qualify_leads_batch(companies, runner=StubRunner())
+    base = qualifier.score_companies_batch(companies)
+    assert len(results) == 4
+    for i in (1, 2):
+        assert results[i]["score"] == pytest.approx(base["score"][i] * 0.4 + 0.5 * 0.6)
+    assert results[3]["score"] == pytest.approx(base["score"][3] * 0.4 + 0.8 * 0.6)
+
+def test_generate_bulk_outreach_batch(server):
+    generator = OutreachGenerator(api_key="fake")
+    leads = [{"id": "lead_a", "company_name": "Avery Graphics"}, {"id": "lead_b", "company_name": "Acme Films"}]
+    results = generator.generate_bulk_outreach_batch(leads, runner=make_runner(server, "outreach_generator"))
+    assert [r["lead_id"] for r in results] == ["lead_a", "lead_b"]
+    assert results[0]["success"]
+    assert results[0]["data"]["subject_line"] == "Extending graphic lifespan"
+    assert len(results[0]["data"]["follow_up_sequence"]) == 2
+    # primary-1 fails in the fake server
+    assert not results[1]["success"]
+    assert "Acme Films" in results[1]["fallback_message"]
@@ -0,0 +1,33 @@
+import sys
+import os
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.bench_pipeline import compare_to_baseline, run_once
+from backend.api import main
+from backend.devtools.fixture_web_server import FixtureWebServer, exhibitor_name, route_session_to
+
+def test_fixture_server_serves_events_and_company_pages():
+    with FixtureWebServer(exhibitors_per_event=3) as server:
+        session = route_session_to(requests.Session(), server)
+        event_page = session.get(FixtureWebServer.event_url(2)).text
+        company_page = session.get("https://acme.com").text
+    assert exhibitor_name(2, 0) in event_page
+    assert "sales@acme.com" in company_page
+    assert server.request_counts == {"event_page": 1, "company_page": 1}
+
+def test_pipeline_benchmark_is_reproducible():
+    original_qualifier = main.lead_qualifier
+    first = run_once(10, error_rate=0.1)
+    second = run_once(10, error_rate=0.1)
+    assert main.lead_qualifier is original_qualifier
+    assert set(first["stage_seconds"]) == {"events", "companies", "enrichment", "qualification", "outreach"}
+    for metric in ("llm_calls", "llm_retries", "web_requests", "qualified_leads"):
+        assert first[metric] == second[metric]
+    assert first["llm_calls"] > 10
+
+def test_compare_to_baseline():
+    baseline = {"100": {"wall_seconds": 1.0, "llm_calls": 300}}
+    assert compare_to_baseline({"100": {"wall_seconds": 1.2, "llm_calls": 300}}, baseline, 0.25) == []
+    regressions = compare_to_baseline({"100": {"wall_seconds": 1.5, "llm_calls": 301}}, baseline, 0.25)
+    assert len(regressions) == 1 and "wall_seconds" in regressions[0]
@@ -0,0 +1,24 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.bench_startup import deferred_imports, import_profile
+
+# Importing the API took ~2.1s when the scrapers and LLM clients were built at import time
+STARTUP_BUDGET_SECONDS = 1.5
+
+def test_api_import_defers_heavy_dependencies():
+    profile = import_profile("backend.api.main")
+    assert deferred_imports(profile) == []
+    assert profile["backend.api.main"][1] / 1e6 < STARTUP_BUDGET_SECONDS
+
+def test_components_are_built_on_first_use():
+    from backend.api import main
+    qualifier = main.component("lead_qualifier")
+    assert main.lead_qualifier is qualifier
+    replacement = object()
+    main.lead_qualifier = replacement
+    try:
+        assert main.component("lead_qualifier") is replacement
+    finally:
+        main.lead_qualifier = qualifier
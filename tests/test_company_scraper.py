@@ -47,4 +47,35 @@ def test_save_companies_to_csv(tmp_path, company_scraper):
     file_path = tmp_path / "companies_test.csv"
     assert file_path.exists()
     with open(file_path) as f:
-        assert "Test Corp" in f.read()
\ No newline at end of file
+        assert "Test Corp" in f.read()
+
+
+def test_batch_qualification_scores_match(company_scraper):
+    companies = [
+        {"name": "A", "industry": "Graphics and Signage Films", "size": "Large", "revenue": "$2B",
+         "technologies": ["Vehicle Wraps", "Protective Films", "Adhesive Films"],
+         "recent_news": ["Launched new line", "Opened office"], "website": "https://a.com",
+         "linkedin_url": "https://linkedin.com/company/a", "source_event": "ISA Sign Expo 2025"},
+        {"name": "B", "industry": "", "size": "Small", "revenue": "$20M"},
+        {"name": "C"},
+    ]
+    batch = company_scraper.score_companies_batch(companies)
+    for idx, company in enumerate(companies):
+        assert batch[idx] == pytest.approx(company_scraper._calculate_qualification_score_dict(company))
+
+
+def test_event_company_index_keeps_all_events(company_scraper):
+    from backend.scrapers.company_scraper import EventCompanyIndex
+    from backend.scrapers.events_scraper import Event
+    index = EventCompanyIndex()
+    expo = Event(name="Sign Expo", date="", location="", industry="Signage", website="",
+                 exhibitors=["Acme Graphics", "Orafol Americas"], relevance_score=0.4)
+    summit = Event(name="Wrap Summit", date="", location="", industry="Signage", website="",
+                   exhibitors=["ACME  graphics"], relevance_score=0.9)
+    for event in (expo, summit):
+        company_scraper.extract_companies_from_event(event, index)
+    assert [event.name for event in index.events_for("acme graphics")] == ["Sign Expo", "Wrap Summit"]
+    assert index.best_event_for("Acme Graphics") is summit
+    assert index.best_event_for("Orafol Americas") is expo
+    assert index.best_event_for("Unknown Co") is None
+    assert len(index) == 2
@@ -0,0 +1,59 @@
+import sys
+import os
+import random
+import string
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.scrapers.entity_resolution import EntityResolver, canonical_name, website_domain
+
+def test_canonical_name_strips_suffixes_and_descriptors():
+    assert canonical_name("3M Commercial Solutions") == canonical_name("3M Company") == canonical_name("3M") == "3m"
+    assert canonical_name("Roland D.G.A. Corporation") == "roland dga"
+    assert canonical_name("Orafol Americas, Inc.") == "orafol"
+    assert canonical_name("Global Imaging Inc") == "global imaging"
+    assert website_domain("https://www.3m.com/graphics") == "3m.com"
+    assert website_domain("linkedin.com/company/3m") == ""
+
+def test_resolver_merges_variants():
+    resolver = EntityResolver()
+    names = ["3M Commercial Solutions", "Avery Dennison Graphics Solutions", "3M Company", "Apple Signs",
+             "Avery Denison Graphics", "Apple", "3M"]
+    representatives = resolver.resolve_all([{"name": name} for name in names])
+    assert [company["name"] for company in representatives] == [
+        "3M Commercial Solutions", "Avery Dennison Graphics Solutions", "Apple Signs", "Apple"]
+    assert representatives[0]["aliases"] == ["3M Company", "3M"]
+
+def test_resolver_matches_on_domain_and_fills_blanks():
+    resolver = EntityResolver()
+    first, _ = resolver.resolve({"name": "3M", "website": ""})
+    resolver.resolve({"name": "3M Company", "website": "https://3m.com"})
+    same, is_new = resolver.resolve({"name": "Scotchprint Graphics", "website": "http://www.3m.com"})
+    assert not is_new and same is resolver.entities[0]
+    assert same["website"] == "https://3m.com" and same["aliases"] == ["3M Company", "Scotchprint Graphics"]
+    # Merging copies the representative rather than mutating it
+    assert first == {"name": "3M", "website": ""}
+
+def test_resolver_keeps_distinct_names_apart():
+    rng = random.Random(0)
+    words = {"".join(rng.choice(string.ascii_lowercase) for _ in range(8)) for _ in range(2000)}
+    resolver = EntityResolver()
+    assert len(resolver.resolve_all([{"name": f"{word} Inc"} for word in words])) == len(words)
+
+
+def test_fixture_exhibitors_stay_distinct():
+    from backend.devtools.fixture_web_server import exhibitor_name
+    names = [exhibitor_name(event_index, position) for event_index in range(200) for position in range(50)]
+    assert len(set(names)) == 10000
+    assert len(EntityResolver().resolve_all([{"name": name} for name in names])) == 10000
+
+
+def test_numbers_and_generic_stems_block_merges():
+    names = ["Apex Displays 2-2 LLC", "Apex Displays 22-22 LLC", "Apex Displays 22-26 Inc", "Apex Displays 26-26",
+             "Signage Solutions Inc", "Signage Systems LLC", "Graphic Solutions Group", "Graphic Technologies"]
+    assert len(EntityResolver().resolve_all([{"name": name} for name in names])) == len(names)
+    assert canonical_name("Signage Solutions Inc") == "signage solutions"
+    # A shared website still merges descriptor variants of a generic name
+    resolver = EntityResolver()
+    resolver.resolve({"name": "Signage Solutions Inc", "website": "https://signage.example"})
+    _, is_new = resolver.resolve({"name": "Signage Systems", "website": "signage.example"})
+    assert not is_new
@@ -50,4 +50,11 @@ def test_event_csv_save(tmp_path, scraper):
     assert file_path.exists()
     with open(file_path) as f:
         content = f.read()
-        assert "Test Expo" in content
\ No newline at end of file
+        assert "Test Expo" in content
+
+
+def test_batch_relevance_scores_match(scraper):
+    events = scraper.scrape_sgia_events() + scraper.scrape_specialty_graphics_events()
+    batch = scraper.score_events_batch([event.__dict__ for event in events])
+    for idx, event in enumerate(events):
+        assert batch[idx] == pytest.approx(scraper.calculate_relevance_score(event))
@@ -0,0 +1,27 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.ai_engine.icp_matcher import KeywordAutomaton, ICPMatcher
+
+def test_automaton_finds_overlapping_keywords():
+    keywords = ["sign", "signage", "age", "graphics", "&"]
+    automaton = KeywordAutomaton(keywords)
+    text = "outdoor signage & graphics"
+    assert automaton.find_all(text) == {k for k in keywords if k in text}
+
+def test_automaton_matches_naive_substring_search():
+    keywords = ["film", "films", "ilm", "wrap", "uv", "protect", "protection"]
+    automaton = KeywordAutomaton(keywords)
+    for text in ["uv protection films", "vehicle wraps", "filmmaking", "", "nothing here"]:
+        assert automaton.find_all(text) == {k for k in keywords if k in text}
+
+def test_icp_matcher_levels():
+    criteria = {"target_industries": ["Vehicle Wraps"], "technology_focus": ["UV Protection"]}
+    matcher = ICPMatcher(criteria, ["graphics"], ["launch"])
+    assert matcher.industry_level("Vehicle Graphics") == 2
+    assert matcher.industry_level("Commercial Graphics") == 1
+    assert matcher.industry_level("Chemicals") == 0
+    assert matcher.is_focus_technology("Protection Films")
+    assert matcher.is_innovation_news("Launched a new line")
@@ -79,4 +79,32 @@ def test_identify_decision_makers_mock(monkeypatch, sample_company):
 
     assert isinstance(stakeholders, list)
     assert stakeholders[0].title == "VP Product Development"
-    assert stakeholders[0].decision_maker_score == 0.9
\ No newline at end of file
+    assert stakeholders[0].decision_maker_score == 0.9
+
+def test_batch_scoring_matches_base_score(sample_company):
+    qualifier = LeadQualifier(api_key="fake")
+    companies = [
+        sample_company,
+        Company(name="Empty Co"),
+        Company(name="PrintCo", industry="Commercial Printing", size="500+ staff",
+                revenue="$75 million", website="https://printco.com",
+                linkedin_url="https://linkedin.com/company/printco",
+                technologies=["Outdoor Applications", "Inkjet"], recent_news=["New plant", "Quiet quarter"]),
+        Company(name="BigCo", industry="Chemicals", size="Medium", revenue="$2B"),
+    ]
+    batch = qualifier.score_companies_batch([c.__dict__ for c in companies])
+    for idx, company in enumerate(companies):
+        score, rationale = qualifier._calculate_base_score(company)
+        assert batch.loc[idx, "score"] == pytest.approx(score)
+        assert batch.loc[idx, "rationale"] == rationale
+
+def test_icp_matcher_recompiles_when_criteria_change():
+    qualifier = LeadQualifier(api_key="fake")
+    company = Company(name="Boats Inc", industry="Marine Engines")
+    assert "industry" not in qualifier._calculate_base_score(company)[1].lower()
+
+    qualifier.icp_criteria["target_industries"].append("Marine")
+    assert "Strong industry alignment" in qualifier._calculate_base_score(company)[1]
+
+    qualifier.icp_criteria = {"target_industries": [], "technology_focus": []}
+    assert "industry" not in qualifier._calculate_base_score(company)[1].lower()
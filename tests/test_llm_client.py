@@ -0,0 +1,57 @@
+import sys
+import os
+import httpx
+import openai
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.ai_engine.llm_client import InstrumentedLLMClient, track_llm_usage, estimate_cost
+from backend.monitoring.metrics import MetricsRegistry
+
+class FakeUsage:
+    prompt_tokens = 120
+    completion_tokens = 30
+
+class FakeResponse:
+    usage = FakeUsage()
+    choices = []
+
+class FlakyCompletions:
+    """Fails with a connection error ``failures`` times, then succeeds"""
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+        return FakeResponse()
+
+class FakeClient:
+    def __init__(self, failures=0):
+        self.chat = type("Chat", (), {})()
+        self.chat.completions = FlakyCompletions(failures)
+
+def test_records_tokens_latency_and_retries():
+    registry = MetricsRegistry()
+    llm = InstrumentedLLMClient(FakeClient(failures=1), "test", backoff_seconds=0, registry=registry)
+    with track_llm_usage() as usage:
+        llm.chat_completion("score", model="gpt-4", messages=[])
+    summary = usage.to_dict()
+    assert summary["calls"] == 1
+    assert summary["retries"] == 1
+    assert summary["prompt_tokens"] == 120
+    assert summary["estimated_cost_usd"] == pytest.approx(estimate_cost("gpt-4", 120, 30))
+    assert summary["by_call_site"]["test.score"]["completion_tokens"] == 30
+    assert registry.counter("llm_tokens_total", "").value(model="gpt-4", call_site="test.score", type="prompt") == 120
+    rendered = registry.render()
+    assert 'llm_request_duration_seconds_count{model="gpt-4",call_site="test.score",status="success"} 1.0' in rendered
+    assert 'llm_retries_total{model="gpt-4",call_site="test.score"} 1.0' in rendered
+
+def test_gives_up_after_max_retries():
+    registry = MetricsRegistry()
+    llm = InstrumentedLLMClient(FakeClient(failures=5), "test", max_retries=2, backoff_seconds=0, registry=registry)
+    with pytest.raises(openai.APIConnectionError):
+        llm.chat_completion("score", model="gpt-4", messages=[])
+    assert registry.counter("llm_requests_total", "").value(model="gpt-4", call_site="test.score", status="error") == 1
@@ -63,4 +63,198 @@ async def test_generate_leads_trigger():
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         res = await ac.post("/api/generate-leads", json=payload)
         assert res.status_code == 200
-        assert res.json()["status"] == "initiated"
\ No newline at end of file
+        assert res.json()["status"] == "initiated"
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        res = await ac.get("/metrics")
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("text/plain")
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_pushes_new_leads():
+    from backend.api import main
+
+    class FakeRequest:
+        headers = {}
+
+        async def is_disconnected(self):
+            return True
+
+    main.progress_broker.reset()
+    response = await main.stream_progress(FakeRequest())
+    assert response.media_type == "text/event-stream"
+    body = response.body_iterator
+    assert (await body.__anext__()).startswith("id: ")  # progress snapshot
+    assert "event: dashboard" in await body.__anext__()
+    main.StorageSink(10).on_lead({"id": "lead_x", "company_name": "Acme", "qualification_score": 0.9})
+    assert "event: lead" in await body.__anext__()
+    assert '"total_leads": ' in await body.__anext__()
+    await body.aclose()
+    leads_storage.clear()
+    main.progress_broker.reset()
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_returns_304_until_data_changes():
+    from backend.api import main
+    main.data_version.modified_at -= 1  # Last-Modified is only sent once the last write's second is over
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        for path in ("/api/dashboard", "/api/leads", "/api/events"):
+            res = await ac.get(path)
+            assert res.status_code == 200
+            etag = res.headers["etag"]
+            res = await ac.get(path, headers={"If-None-Match": etag})
+            assert res.status_code == 304
+            assert res.content == b""
+            res = await ac.get(path, headers={"If-Modified-Since": res.headers["last-modified"]})
+            assert res.status_code == 304
+        main.StorageSink(10).on_lead({"id": "lead_etag", "company_name": "Acme", "qualification_score": 0.9})
+        res = await ac.get("/api/dashboard", headers={"If-None-Match": etag})
+        assert res.status_code == 200
+        assert res.json()["total_leads"] == len(leads_storage)
+        assert res.headers["etag"] != etag
+        # A write in the same second as the last one is not hidden behind If-Modified-Since
+        assert "last-modified" not in res.headers
+    leads_storage.clear()
+    main.progress_broker.reset()
+
+
+def test_data_version_validators():
+    from starlette.requests import Request
+    from backend.api.conditional import DataVersion, is_not_modified
+
+    def request(**headers):
+        return Request({"type": "http", "method": "GET",
+                        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]})
+    version = DataVersion()
+    version.modified_at -= 5
+    last_modified = version.headers()["Last-Modified"]
+    assert is_not_modified(request(if_modified_since=last_modified), version)
+    version.bump()
+    assert not is_not_modified(request(if_modified_since=last_modified), version)
+    assert "Last-Modified" not in version.headers()
+    # Counters of different processes never produce the same tag
+    assert DataVersion().etag != DataVersion().etag
+    assert is_not_modified(request(if_none_match=version.etag), version)
+
+
+@pytest.mark.asyncio
+async def test_leads_list_views():
+    leads_storage.upsert({"id": "lead_a", "company_name": "Acme", "qualification_score": 0.9, "status": "new",
+                          "company_description": "long text", "contact_linkedin": "https://linkedin.com/in/a"})
+    outreach_storage.upsert({"id": "outreach_lead_a", "lead_id": "lead_a", "primary_message": "Hello " * 200})
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        compact = (await ac.get("/api/leads")).json()["leads"][0]
+        # Only list fields (those the lead has) plus the outreach flag
+        assert set(compact) == {"id", "company_name", "qualification_score", "status", "has_outreach"}
+        assert compact["has_outreach"] is True and "outreach_data" not in compact
+        full = (await ac.get("/api/leads?view=full")).json()["leads"][0]
+        assert full["outreach_data"]["primary_message"].startswith("Hello")
+        assert full["company_description"] == "long text"
+        projected = (await ac.get("/api/leads?fields=id,qualification_score")).json()["leads"][0]
+        assert projected == {"id": "lead_a", "qualification_score": 0.9}
+    leads_storage.clear()
+    outreach_storage.clear()
+
+
+@pytest.fixture
+def database(tmp_path):
+    """A scratch leads database set as the API's database components"""
+    from backend.api import main
+    from backend.database.async_db import AsyncDatabase
+    from backend.database.models import DatabaseManager
+    database = DatabaseManager(str(tmp_path / "leads.db"), connection_per_thread=True)
+    # Set the lazily built components directly so the default database is never opened
+    previous = {name: main.__dict__.get(name) for name in ("database", "async_database")}
+    main.database = database
+    main.async_database = AsyncDatabase(database, readers=2)
+    yield database
+    main.async_database.close()
+    for name, component in previous.items():
+        if component is None:
+            delattr(main, name)
+        else:
+            setattr(main, name, component)
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint(database):
+    from backend.database.models import Company, Lead
+    company_id = database.create_company(Company(name="WrapCo", description="Vehicle wrap films"))
+    database.create_lead(Lead(company_id=company_id, rationale="Prints fleet wraps"))
+    database.create_lead(Lead(company_id=company_id, rationale="Also wraps trailers"))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/api/search", params={"q": "wrap", "limit": 2})
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["results"]) == 2
+        assert body["pagination"] == {"page": 1, "limit": 2, "has_more": True}
+        response = await ac.get("/api/search", params={"q": "wrap", "type": "leads", "page": 2, "limit": 1})
+        body = response.json()
+        assert [result["type"] for result in body["results"]] == ["lead"]
+        assert body["pagination"]["has_more"] is False
+        assert (await ac.get("/api/search", params={"q": "wrap", "type": "events"})).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_database_leads_endpoint(database):
+    from backend.database.models import Company, Lead, Stakeholder
+    for i, score in enumerate([0.9, 0.7, 0.5]):
+        company_id = database.create_company(Company(name=f"DbCo {i}"))
+        database.create_stakeholder(Stakeholder(company_id=company_id, name=f"VP {i}", decision_maker_score=0.8))
+        database.create_lead(Lead(company_id=company_id, overall_score=score))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        body = (await ac.get("/api/db/leads", params={"limit": 2, "with_decision_maker": True})).json()
+        assert [lead["company_name"] for lead in body["leads"]] == ["DbCo 0", "DbCo 1"]
+        assert body["leads"][0]["decision_maker_name"] == "VP 0"
+        body = (await ac.get("/api/db/leads", params={"limit": 2, **body["next_cursor"]})).json()
+        assert [lead["company_name"] for lead in body["leads"]] == ["DbCo 2"]
+        assert body["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_archive_database_leads_endpoint(database):
+    from backend.database.models import Company, Lead
+    company_id = database.create_company(Company(name="ClosedCo"))
+    closed_id = database.create_lead(Lead(company_id=company_id, overall_score=0.9))
+    database.update_lead_status(closed_id, "closed")
+    database.create_lead(Lead(company_id=company_id, overall_score=0.5))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.post("/api/db/leads/archive", params={"closed_after_days": 0})
+        assert response.json() == {"archived": {"closed": 1, "stale": 0}}
+        body = (await ac.get("/api/db/leads")).json()
+        assert [lead["overall_score"] for lead in body["leads"]] == [0.5]
+        body = (await ac.get("/api/db/leads", params={"include_archived": True})).json()
+        assert [lead["archived_at"] is not None for lead in body["leads"]] == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_database_snapshot_endpoint(database, tmp_path, monkeypatch):
+    import csv, gzip, io, json
+    from backend.database import snapshot
+    from backend.database.models import Company
+    monkeypatch.setenv("SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(snapshot, "SETTLE_SECONDS", -1)
+    database.create_company(Company(name="SnapCo", qualification_score=0.5))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get("/api/db/snapshots/companies", params={"format": "csv"})
+        assert response.status_code == 200 and response.headers["x-snapshot-rows"] == "1"
+        assert json.loads(response.headers["x-snapshot-schema"])["qualification_score"] == "float"
+        rows = list(csv.reader(io.StringIO(gzip.decompress(response.content).decode())))
+        assert rows[1][1] == "SnapCo"
+        since = {"since": response.headers["x-snapshot-watermark"], "format": "csv"}
+        assert (await ac.get("/api/db/snapshots/companies", params=since)).headers["x-snapshot-rows"] == "0"
+        assert (await ac.get("/api/db/snapshots/stakeholders")).status_code == 422
+        assert (await ac.get("/api/db/snapshots/leads", params={"since": "yesterday"})).status_code == 400
+        if snapshot.pyarrow is None:
+            assert (await ac.get("/api/db/snapshots/leads", params={"format": "parquet"})).status_code == 400
+    # Snapshots are removed once sent
+    assert os.listdir(tmp_path / "snapshots") == []
@@ -1,9 +1,13 @@
 import sys
 import os
+import json
+import sqlite3
+from dataclasses import asdict
+from datetime import datetime
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import pytest
-from backend.database.models import DatabaseManager, Company, Event, Stakeholder, Lead
+from backend.database.models import DatabaseManager, Company, Event, Stakeholder, Lead, EncodedJSON
 
 def test_pytest_collection_works():
     assert True
@@ -82,4 +86,229 @@ def test_create_lead(db):
     lead_id = db.create_lead(lead)
     assert lead_id > 0
     leads = db.get_leads()
-    assert leads[0].status == "qualified"
\ No newline at end of file
+    assert leads[0].status == "qualified"
+
+
+def test_create_company_upserts_by_name(db):
+    first_id = db.create_company(Company(name="UpsertCo", description="old"))
+    second_id = db.create_company(Company(name="UpsertCo", description="new"))
+    assert first_id == second_id
+    assert db.get_company_by_name("UpsertCo").description == "new"
+
+
+def test_search_ranks_and_tracks_updates(db):
+    company_id = db.create_company(Company(name="WrapCo", description="Vehicle wrap films for fleets"))
+    db.create_company(Company(name="InkCo", description="Solvent inks"))
+    lead_id = db.create_lead(Lead(company_id=company_id, rationale="Uses wrap films daily",
+                                  outreach_message="Tedlar protects wraps outdoors"))
+    found = db.search("wrap")
+    assert {(result["type"], result["id"]) for result in found["results"]} == {("company", company_id),
+                                                                                ("lead", lead_id)}
+    lead_result = next(result for result in found["results"] if result["type"] == "lead")
+    assert lead_result["title"] == "WrapCo" and "<mark>" in lead_result["snippet"]
+    assert db.search("wrap", kinds=["leads"], limit=1) == {"results": [lead_result], "has_more": False}
+    # Prefix match on the last word; FTS syntax in user input is treated as text
+    assert db.search("vehic")["results"][0]["id"] == company_id
+    assert db.search('solvent" OR (')["results"] == []
+    # Triggers keep the index in sync with updates and deletes
+    db.create_company(Company(name="WrapCo", description="Printing presses"))
+    assert [result["type"] for result in db.search("vehicle")["results"]] == []
+    db.update_lead_status(lead_id, "contacted", notes="Asked about fleet wraps")
+    assert db.search("fleet")["results"][0]["id"] == lead_id
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM leads WHERE id = ?", (lead_id,))
+    assert db.search("fleet")["results"] == []
+
+
+def test_search_escapes_snippets_and_pages_kinds_in_sequence(db):
+    company_id = db.create_company(Company(name="TagCo", description="<b>Wrap</b> films & <script>"))
+    lead_ids = [db.create_lead(Lead(company_id=company_id, rationale=f"Wrap job {i}")) for i in range(3)]
+    [company] = db.search("wrap", kinds=["companies"])["results"]
+    assert company["snippet"] == "&lt;b&gt;<mark>Wrap</mark>&lt;/b&gt; films &amp; &lt;script&gt;"
+    # BM25 ranks of different indexes are not compared: companies first, then leads
+    pages = [db.search("wrap", limit=2, offset=offset) for offset in (0, 2)]
+    results = [(result["type"], result["id"]) for page in pages for result in page["results"]]
+    assert results[0] == ("company", company_id)
+    assert sorted(results[1:]) == [("lead", lead_id) for lead_id in lead_ids]
+    assert [page["has_more"] for page in pages] == [True, False]
+
+
+def test_keyset_pagination(db):
+    company_ids = [db.create_company(Company(name=f"Paged {i}", qualification_score=score))
+                   for i, score in enumerate([0.9, 0.5, 0.5, 0.5, 0.1])]
+    for company_id, status in zip(company_ids, ["new", "new", "won", "new", "new"]):
+        db.create_lead(Lead(company_id=company_id, status=status, overall_score=0.7))
+
+    pages = []
+    page = db.get_companies(limit=2)
+    pages.append([company.name for company in page])
+    while page.next_cursor:
+        page = db.get_companies(limit=2, **page.next_cursor)
+        pages.append([company.name for company in page])
+    # Ties on score keep id order and are split across pages without loss or repeats
+    assert pages == [["Paged 0", "Paged 1"], ["Paged 2", "Paged 3"], ["Paged 4"]]
+    assert db.get_companies(limit=5).next_cursor is None
+    assert isinstance(db.get_companies(), list) and db.get_companies().next_cursor is None
+
+    first = db.get_leads(status="new", limit=3)
+    assert first.next_cursor == {"after_score": 0.7, "after_id": first[-1].id}
+    rest = db.get_leads(status="new", limit=3, **first.next_cursor)
+    assert [lead.company_name for lead in first + rest] == ["Paged 0", "Paged 1", "Paged 3", "Paged 4"]
+    assert rest.next_cursor is None
+
+
+def test_rows_map_onto_slotted_models(db):
+    company_id = db.create_company(Company(name="SlotCo", technologies=["Adhesive Films"], recent_news=["Opened plant"]))
+    db.create_stakeholder(Stakeholder(company_id=company_id, name="Jane Doe", decision_maker_score=0.9))
+    db.create_lead(Lead(company_id=company_id, overall_score=0.6, rationale="Fits"))
+    company = db.get_company_by_name("SlotCo")
+    with pytest.raises(AttributeError):
+        company.unknown_field = 1
+    # JSON columns decode into plain lists on first access
+    assert type(Company.technologies.slot.__get__(company)) is EncodedJSON
+    assert company.technologies == ["Adhesive Films"] and company.recent_news == ["Opened plant"]
+    assert type(company.technologies) is list and type(Company.technologies.slot.__get__(company)) is list
+    assert json.loads(json.dumps(asdict(db.get_company_by_name("SlotCo"))))["technologies"] == ["Adhesive Films"]
+    assert company.key_contacts is None and company.id == company_id
+    assert db.get_stakeholders_by_company(company_id)[0].name == "Jane Doe"
+    lead = db.get_leads()[0]
+    assert (lead.company_name, lead.rationale, lead.status, lead.overall_score) == ("SlotCo", "Fits", "new", 0.6)
+
+
+def test_filter_companies_by_technology_and_news(db):
+    wrap_id = db.create_company(Company(name="WrapCo", technologies=["Vehicle Wraps", "Inkjet"],
+                                        recent_news=["Opened plant"], qualification_score=0.4))
+    db.create_company(Company(name="SignCo", technologies=["vehicle wraps"], qualification_score=0.8))
+    db.create_company(Company(name="InkCo", technologies=["Inkjet"], recent_news=["Old news"]))
+    with db.get_connection() as conn:
+        conn.execute("UPDATE company_news SET recorded_at = '2020-01-01 00:00:00' WHERE headline = 'Old news'")
+
+    assert [c.name for c in db.get_companies(technology="VEHICLE WRAPS")] == ["SignCo", "WrapCo"]
+    first = db.get_companies(technology="vehicle wraps", limit=1)
+    assert [c.name for c in db.get_companies(technology="vehicle wraps", limit=1, **first.next_cursor)] == ["WrapCo"]
+    assert [c.name for c in db.get_companies(news_since="2024-01-01 00:00:00")] == ["WrapCo"]
+    assert [c.name for c in db.get_companies(technology="inkjet", news_since=datetime(2019, 1, 1))] == ["WrapCo", "InkCo"]
+
+    # Updates keep the normalized rows in sync: dropped values go, scores follow, headlines keep their first sighting
+    with db.get_connection() as conn:
+        recorded = conn.execute("SELECT recorded_at FROM company_news WHERE company_id = ?", (wrap_id,)).fetchone()[0]
+    db.create_company(Company(name="WrapCo", technologies=["Vehicle Wraps"], recent_news=["Opened plant", "Hired CTO"],
+                              qualification_score=0.9))
+    assert [c.name for c in db.get_companies(technology="vehicle wraps")] == ["WrapCo", "SignCo"]
+    assert [c.name for c in db.get_companies(technology="inkjet")] == ["InkCo"]
+    with db.get_connection() as conn:
+        news = dict(conn.execute("SELECT headline, recorded_at FROM company_news WHERE company_id = ?", (wrap_id,)))
+        assert news["Opened plant"] == recorded and set(news) == {"Opened plant", "Hired CTO"}
+        conn.execute("DELETE FROM companies WHERE id = ?", (wrap_id,))
+    assert db.get_companies(technology="vehicle wraps")[0].name == "SignCo"
+    assert db.get_companies(news_since="2024-01-01 00:00:00") == []
+
+
+def test_existing_companies_are_normalized_on_upgrade(tmp_path):
+    path = str(tmp_path / "old.db")
+    DatabaseManager(path)
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE company_technologies")
+    conn.execute("DROP TABLE company_news")
+    for trigger in ("attributes_insert", "technologies_update", "news_update", "score_update", "attributes_delete"):
+        conn.execute(f"DROP TRIGGER companies_{trigger}")
+    conn.execute("""INSERT INTO companies (name, technologies, recent_news) VALUES ('Legacy', '["Inkjet"]', 'not json')""")
+    conn.commit()
+    conn.close()
+    db = DatabaseManager(path)
+    assert [c.name for c in db.get_companies(technology="inkjet")] == ["Legacy"]
+
+
+def test_lead_page_with_decision_makers_in_few_queries(tmp_path):
+    from backend.devtools.query_plans import TracingDatabaseManager
+    db = TracingDatabaseManager(str(tmp_path / "views.db"))
+    company_ids = [db.create_company(Company(name=f"Co {i}")) for i in range(100)]
+    for company_id in company_ids[:-1]:
+        db.create_stakeholders([Stakeholder(company_id=company_id, name=f"Rep {company_id}", decision_maker_score=0.3),
+                                Stakeholder(company_id=company_id, name=f"VP {company_id}", title="VP Product",
+                                            decision_maker_score=0.9)])
+        db.create_lead(Lead(company_id=company_id, overall_score=company_id / 100))
+    db.statements.clear()
+
+    leads = db.get_leads(limit=50, with_decision_maker=True)
+    stakeholders = db.get_stakeholders_for_companies([lead.company_id for lead in leads] + [company_ids[-1]])
+    assert len([sql for sql in db.statements if sql.lstrip().startswith("SELECT")]) == 2
+    top = leads[0]
+    assert (top.company_name, top.decision_maker_name, top.decision_maker_title) == (
+        "Co 98", f"VP {top.company_id}", "VP Product")
+    assert [s.name for s in stakeholders[top.company_id]] == [f"VP {top.company_id}", f"Rep {top.company_id}"]
+    assert stakeholders[company_ids[-1]] == [] and len(stakeholders) == 51
+    assert db.get_leads(limit=1)[0].decision_maker_name is None
+    assert db.get_stakeholders_for_companies([]) == {}
+
+
+def test_archive_closed_and_stale_leads(db):
+    company_id = db.create_company(Company(name="ArchiveCo"))
+    ids = [db.create_lead(Lead(company_id=company_id, overall_score=score, rationale="Wraps fleet vans"))
+           for score in [0.9, 0.8, 0.7, 0.6]]
+    db.update_lead_status(ids[0], "closed")
+    db.update_lead_status(ids[1], "closed")
+    with db.get_connection() as conn:
+        conn.execute("UPDATE leads SET updated_at = '2000-01-01 00:00:00' WHERE id IN (?, ?)", (ids[1], ids[2]))
+        conn.commit()
+    before = db.get_lead_stats()
+
+    assert db.archive_leads(closed_after_days=0, stale_after_days=365, batch_size=1) == {"closed": 2, "stale": 1}
+    assert db.archive_leads() == {"closed": 0, "stale": 0}
+    assert [lead.id for lead in db.get_leads()] == [ids[3]]
+    assert db.search("wraps", kinds=["leads"])["results"][0]["id"] == ids[3]
+    archived = db.get_leads(include_archived=True)
+    assert [lead.id for lead in archived] == ids
+    assert [lead.archived_at is not None for lead in archived] == [True, True, True, False]
+    assert archived[0].company_name == "ArchiveCo" and archived[0].status == "closed"
+    page = db.get_leads(status="closed", limit=1, include_archived=True)
+    assert [lead.id for lead in page] == [ids[0]]
+    assert [lead.id for lead in db.get_leads(status="closed", include_archived=True, **page.next_cursor)] == [ids[1]]
+    stats = db.get_lead_stats()
+    assert stats["archived_leads"] == 3
+    for key in ("total_leads", "status_breakdown", "priority_breakdown"):
+        assert stats[key] == before[key]
+
+
+def test_null_scores_do_not_end_pagination(db):
+    company_id = db.create_company(Company(name="NullCo", technologies=["vinyl"]))
+    for score in (0.9, None, None, 0.4, None):
+        db.create_lead(Lead(company_id=company_id, overall_score=score))
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO leads (company_id, overall_score) VALUES (?, NULL)", (company_id,))
+        conn.execute("UPDATE companies SET qualification_score = NULL WHERE id = ?", (company_id,))
+        conn.commit()
+    seen, cursor = [], {}
+    while True:
+        page = db.get_leads(limit=2, **cursor)
+        seen.extend(lead.id for lead in page)
+        if page.next_cursor is None:
+            break
+        assert page.next_cursor["after_score"] is not None
+        cursor = page.next_cursor
+    assert len(seen) == len(set(seen)) == 6
+    assert [company.qualification_score for company in db.get_companies(technology="vinyl", limit=1)] == [0.0]
+
+
+def test_rerun_after_archiving_does_not_duplicate_leads(db):
+    company_id = db.create_company(Company(name="RerunCo"))
+    closed_id = db.create_lead(Lead(company_id=company_id, overall_score=0.9, external_id="lead_closed"))
+    stale_id = db.create_lead(Lead(company_id=company_id, overall_score=0.5, external_id="lead_stale"))
+    db.update_lead_status(closed_id, "closed", notes="Signed")
+    db.update_lead_status(stale_id, "contacted", notes="Left voicemail")
+    with db.get_connection() as conn:
+        conn.execute("UPDATE leads SET updated_at = '2000-01-01 00:00:00' WHERE id = ?", (stale_id,))
+        conn.commit()
+    assert db.archive_leads(closed_after_days=0) == {"closed": 1, "stale": 1}
+
+    # The pipeline runs again and finds both leads
+    assert db.create_lead(Lead(company_id=company_id, overall_score=0.95, external_id="lead_closed")) == closed_id
+    assert db.create_lead(Lead(company_id=company_id, overall_score=0.7, external_id="lead_stale")) == stale_id
+    [restored] = db.get_leads()
+    assert (restored.id, restored.status, restored.notes, restored.overall_score) == \
+        (stale_id, "contacted", "Left voicemail", 0.7)
+    [closed] = [lead for lead in db.get_leads(include_archived=True) if lead.archived_at is not None]
+    assert (closed.id, closed.status, closed.notes, closed.overall_score) == (closed_id, "closed", "Signed", 0.9)
+    stats = db.get_lead_stats()
+    assert (stats["total_leads"], stats["archived_leads"]) == (2, 1)
+    assert stats["status_breakdown"] == {"closed": 1, "contacted": 1}
@@ -0,0 +1,118 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.pipeline.cache import QUALIFICATION_FIELDS, FingerprintCache, fingerprint
+from pipeline_fakes import (
+    FakeCompanyScraper, FakeQualifier, RecordingSink, make_pipeline
+)
+
+class CountingQualifier(FakeQualifier):
+    def __init__(self):
+        self.calls = 0
+
+    def qualify_lead(self, company, event):
+        self.calls += 1
+        return dict(super().qualify_lead(company, event), ai_assessed=True)
+
+def test_fingerprint_depends_only_on_listed_fields():
+    company = {"name": "Acme", "industry": "Signage", "key_contacts": [{"name": "Jo"}]}
+    assert fingerprint(company, QUALIFICATION_FIELDS) == fingerprint(dict(company, source_events=["x"]),
+                                                                     QUALIFICATION_FIELDS)
+    assert fingerprint(company, QUALIFICATION_FIELDS) != fingerprint(dict(company, industry="Print"),
+                                                                     QUALIFICATION_FIELDS)
+
+def test_lookup_outcomes():
+    now = [0.0]
+    cache = FingerprintCache(ttl_seconds={"qualification": 10}, clock=lambda: now[0])
+    assert cache.lookup("qualification", "acme", "a") == (None, "misses")
+    cache.store("qualification", "acme", "a", {"score": 0.9})
+    assert cache.lookup("qualification", "acme", "a") == ({"score": 0.9}, "hits")
+    assert cache.lookup("qualification", "acme", "b") == (None, "changed")
+    now[0] = 11
+    assert cache.lookup("qualification", "acme", "a") == (None, "expired")
+
+def test_rerun_reuses_unchanged_companies():
+    cache = FingerprintCache()
+    qualifier = CountingQualifier()
+
+    def run():
+        company_scraper = FakeCompanyScraper()
+        pipeline = make_pipeline(company_scraper, cache=cache)
+        pipeline.lead_qualifier = qualifier
+        sink = RecordingSink()
+        return asyncio.run(pipeline.run(["Signage"], 10, True, sink)), sink
+
+    first, _ = run()
+    assert first["cache"]["qualification"]["misses"] == 10
+    assert qualifier.calls == 10
+    second, sink = run()
+    assert qualifier.calls == 10
+    assert second["cache"]["enrichment"]["hits"] == 10
+    assert second["cache"]["qualification"]["hits"] == 10
+    assert second["cache"]["outreach"]["hits"] == 5
+    assert second["qualified_leads"] == len(sink.leads) == 5
+    assert {o["lead_id"] for o in sink.outreach} == {lead["id"] for lead in sink.leads}
+    assert all(lead["company_name"] for lead in sink.leads)
+
+def test_rule_based_fallback_is_not_cached():
+    cache = FingerprintCache()
+    asyncio.run(make_pipeline(FakeCompanyScraper(), cache=cache).run(["Signage"], 4, False))
+    second = asyncio.run(make_pipeline(FakeCompanyScraper(), cache=cache).run(["Signage"], 4, False))
+    # FakeQualifier results carry no ai_assessed flag and are treated as cacheable
+    assert second["cache"]["qualification"]["hits"] == 4
+    qualifier = FakeQualifier()
+    qualifier.qualify_lead = lambda company, event: {"score": 0.5, "is_qualified": False, "ai_assessed": False}
+    cache.clear()
+    for _ in range(2):
+        pipeline = make_pipeline(FakeCompanyScraper(), cache=cache)
+        pipeline.lead_qualifier = qualifier
+        stats = asyncio.run(pipeline.run(["Signage"], 4, False))
+    assert stats["cache"]["qualification"]["misses"] == 4
+
+
+def test_icp_criteria_change_invalidates_qualifications():
+    cache = FingerprintCache()
+    qualifier = CountingQualifier()
+
+    def run(signature):
+        qualifier.qualification_signature = signature
+        pipeline = make_pipeline(FakeCompanyScraper(), cache=cache)
+        pipeline.lead_qualifier = qualifier
+        return asyncio.run(pipeline.run(["Signage"], 4, False))
+
+    run("icp-v1")
+    assert run("icp-v1")["cache"]["qualification"]["hits"] == 4
+    assert run("icp-v2")["cache"]["qualification"]["changed"] == 4
+    assert qualifier.calls == 8
+
+
+def test_qualification_signature_tracks_criteria():
+    from backend.ai_engine.lead_qualifier import LeadQualifier
+    qualifier = LeadQualifier(api_key="test")
+    before = qualifier.qualification_signature
+    assert qualifier.qualification_signature == before
+    qualifier.icp_criteria["target_industries"].append("Marine Graphics")
+    assert qualifier.qualification_signature != before
+
+
+def test_empty_enrichment_is_cached_but_failures_are_not():
+    class UnchangedScraper(FakeCompanyScraper):
+        def enrich_company_data(self, company):
+            self.calls = getattr(self, "calls", 0) + 1
+            return dict(company)
+
+    class FailingScraper(FakeCompanyScraper):
+        def enrich_company_data(self, company):
+            return company  # CompanyScraper's fallback on errors
+
+    cache = FingerprintCache()
+    for _ in range(2):
+        scraper = UnchangedScraper()
+        stats = asyncio.run(make_pipeline(scraper, cache=cache).run(["Signage"], 4, False))
+    assert stats["cache"]["enrichment"]["hits"] == 4 and not hasattr(scraper, "calls")
+    cache.clear()
+    for _ in range(2):
+        stats = asyncio.run(make_pipeline(FailingScraper(), cache=cache).run(["Signage"], 4, False))
+    assert stats["cache"]["enrichment"]["misses"] == 4
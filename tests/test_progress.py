@@ -0,0 +1,80 @@
+import sys
+import os
+import asyncio
+import json
+import threading
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+pytest_plugins = ("pytest_asyncio",)
+
+from backend.api.progress import ProgressBroker, format_sse
+
+def parse(chunk):
+    fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+    return int(fields["id"]), fields["event"], json.loads(fields["data"])
+
+def test_format_sse():
+    assert format_sse((3, "lead", {"id": "a"})) == 'id: 3\nevent: lead\ndata: {"id": "a"}\n\n'
+
+@pytest.mark.asyncio
+async def test_publish_fans_out_to_subscribers():
+    broker = ProgressBroker()
+    first, second = broker.subscribe(), broker.subscribe()
+    broker.publish("lead", {"id": "lead_1"})
+    # Publishing from a worker thread is delivered on the subscriber's loop
+    thread = threading.Thread(target=broker.publish, args=("progress", {"progress": 50}))
+    thread.start()
+    thread.join()
+    for subscription in (first, second):
+        assert (await subscription.queue.get())[1:] == ("lead", {"id": "lead_1"})
+        assert (await asyncio.wait_for(subscription.queue.get(), 1))[1:] == ("progress", {"progress": 50})
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_missed_messages_or_resyncs():
+    broker = ProgressBroker(history_size=3)
+    for i in range(5):
+        broker.publish("lead", {"n": i})
+    replay = broker.subscribe(last_event_id=3)
+    assert [replay.queue.get_nowait()[2]["n"] for _ in range(2)] == [3, 4]
+    assert broker.subscribe(last_event_id=1).queue.get_nowait()[1] == "resync"
+    assert broker.subscribe(last_event_id=99).queue.get_nowait()[1] == "resync"
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_resync():
+    broker = ProgressBroker(queue_size=2)
+    subscription = broker.subscribe()
+    for i in range(3):
+        broker.publish("lead", {"n": i})
+    assert subscription.queue.qsize() == 1
+    assert subscription.queue.get_nowait()[1] == "resync"
+
+def test_publish_delta_sends_changed_fields_only():
+    broker = ProgressBroker()
+    assert broker.publish_delta("dashboard", {"total_leads": 1, "events": 2})[2] == {"total_leads": 1, "events": 2}
+    assert broker.publish_delta("dashboard", {"total_leads": 2, "events": 2}) is None  # throttled
+    assert broker.publish_delta("dashboard", {"total_leads": 2, "events": 2}, force=True)[2] == {"total_leads": 2}
+
+def test_publish_delta_computes_snapshot_only_when_due():
+    broker = ProgressBroker()
+    calls = []
+
+    def snapshot():
+        calls.append(1)
+        return {"total_leads": len(calls)}
+    assert broker.publish_delta("dashboard", snapshot)[2] == {"total_leads": 1}
+    for _ in range(100):
+        assert broker.publish_delta("dashboard", snapshot) is None  # throttled, not computed
+    assert len(calls) == 1
+    assert broker.publish_delta("dashboard", snapshot, force=True)[2] == {"total_leads": 2}
+
+@pytest.mark.asyncio
+async def test_stream_sends_snapshot_then_messages_and_unsubscribes():
+    broker = ProgressBroker()
+    subscription = broker.subscribe()
+    stream = broker.stream(subscription, [("progress", {"status": "idle"})])
+    assert parse(await stream.__anext__())[1:] == ("progress", {"status": "idle"})
+    broker.publish("lead", {"id": "lead_1"})
+    assert parse(await stream.__anext__()) == (1, "lead", {"id": "lead_1"})
+    await stream.aclose()
+    assert broker.subscriber_count == 0
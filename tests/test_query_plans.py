@@ -0,0 +1,65 @@
+import sys
+import os
+import sqlite3
+import pytest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.database.models import DatabaseManager
+from backend.devtools.query_plans import audit, explain, plan_problems
+
+@pytest.fixture(scope="module")
+def report():
+    return audit()
+
+def test_audit_covers_every_query_method(report):
+    statements = " ".join(entry["sql"] for entry in report)
+    for fragment in ("FROM events ORDER BY relevance_score", "FROM companies ORDER BY qualification_score",
+                     "FROM companies WHERE name", "FROM stakeholders WHERE company_id",
+                     "WHERE l.status", "UPDATE leads", "GROUP BY status", "GROUP BY priority", "companies_fts MATCH"):
+        assert fragment in statements
+
+def test_no_query_scans_or_sorts(report):
+    flagged = {entry["sql"]: entry["problems"] for entry in report if entry["problems"]}
+    assert flagged == {}
+
+def test_hot_queries_use_composite_indexes(report):
+    plans = {entry["sql"]: " ".join(entry["plan"]) for entry in report}
+    leads_by_status = next(plan for sql, plan in plans.items() if "WHERE l.status" in sql)
+    assert "idx_leads_status_score (status=?)" in leads_by_status
+    stakeholders = next(plan for sql, plan in plans.items() if "FROM stakeholders WHERE company_id" in sql)
+    assert "idx_stakeholders_company_score (company_id=?)" in stakeholders
+    by_technology = next(plan for sql, plan in plans.items() if "WHERE t.technology = 'vehicle wraps' ORDER BY" in sql)
+    assert by_technology.startswith("SEARCH t USING COVERING INDEX idx_company_technologies_lookup (technology=?)")
+    # Keyset pages seek in the score index instead of skipping the earlier rows
+    next_page = next(plan for sql, plan in plans.items() if "l.status = 'new' AND l.overall_score <=" in sql)
+    assert "idx_leads_status_score (status=? AND overall_score<?)" in next_page
+
+def test_single_column_indexes_are_flagged(tmp_path):
+    # The pre-composite schema: filter index only, so ORDER BY needs a temp B-tree
+    path = str(tmp_path / "old.db")
+    DatabaseManager(path)
+    conn = sqlite3.connect(path)
+    conn.execute("DROP INDEX idx_stakeholders_company_score")
+    conn.execute("CREATE INDEX idx_stakeholders_company ON stakeholders(company_id)")
+    conn.execute("DROP INDEX idx_events_relevance")
+    sql = "SELECT * FROM stakeholders WHERE company_id = 1 ORDER BY decision_maker_score DESC"
+    assert plan_problems(explain(conn, sql), sql) == ["USE TEMP B-TREE FOR ORDER BY"]
+    sql = "SELECT * FROM events ORDER BY relevance_score DESC"
+    assert plan_problems(explain(conn, sql), sql) == ["SCAN events", "USE TEMP B-TREE FOR ORDER BY"]
+    assert plan_problems(explain(conn, "SELECT COUNT(*) FROM events"), "SELECT COUNT(*) FROM events") == []
+    conn.close()
+
+def test_obsolete_indexes_are_dropped(tmp_path):
+    path = str(tmp_path / "upgrade.db")
+    DatabaseManager(path)
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE INDEX idx_leads_status ON leads(status)")
+    conn.commit()
+    conn.close()
+    DatabaseManager(path)
+    conn = sqlite3.connect(path)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+    assert "idx_leads_status" not in indexes and "idx_leads_status_score" in indexes
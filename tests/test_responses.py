@@ -0,0 +1,77 @@
+import sys
+import os
+import gzip
+import json
+import pytest
+from dataclasses import dataclass
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from httpx import AsyncClient, ASGITransport
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+pytest_plugins = ("pytest_asyncio",)
+
+from backend.api import responses
+from backend.api.compression import CompressionMiddleware, accepted_encodings
+from backend.api.responses import FastJSONResponse, dumps, json_array, merge_encoded, with_encoded_field
+
+@dataclass
+class Row:
+    name: str
+    tags: list
+
+def test_dumps_matches_stdlib_fallback(monkeypatch):
+    content = {"rows": [Row("a", ["x"])], "score": 0.5, "name": "Café"}
+    fast = json.loads(dumps(content))
+    monkeypatch.setattr(responses, "orjson", None)
+    assert json.loads(dumps(content)) == fast == {"rows": [{"name": "a", "tags": ["x"]}], "score": 0.5,
+                                                  "name": "Café"}
+
+def test_dumps_lazy_json_columns(monkeypatch):
+    from backend.database.models import Company, EncodedJSON
+    company = Company(name="a", technologies=EncodedJSON('["vinyl"]'))
+    fast = json.loads(dumps(company))
+    monkeypatch.setattr(responses, "orjson", None)
+    assert json.loads(dumps(company)) == fast
+    assert fast["technologies"] == ["vinyl"] and fast["recent_news"] == []
+
+def test_splice_pre_encoded_rows():
+    rows = [merge_encoded(dumps({"id": i}), {"has_outreach": False}) for i in range(2)]
+    body = with_encoded_field({"count": 2}, "data", json_array(rows))
+    assert json.loads(body) == {"count": 2, "data": [{"id": 0, "has_outreach": False},
+                                                     {"id": 1, "has_outreach": False}]}
+    assert json.loads(with_encoded_field({}, "data", json_array([]))) == {"data": []}
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip;q=0, br, deflate;q=0.5") == {"gzip": 0.0, "br": 1.0, "deflate": 0.5}
+
+@pytest.mark.asyncio
+async def test_compression_middleware():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/big")
+    async def big():
+        return {"data": ["lead"] * 100}
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter(["data: x\n\n"] * 100), media_type="text/event-stream")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        res = await ac.get("/big", headers={"Accept-Encoding": "gzip"})
+        assert res.headers["content-encoding"] == "gzip"
+        assert int(res.headers["content-length"]) < len(dumps({"data": ["lead"] * 100}))
+        assert res.json() == {"data": ["lead"] * 100}
+        assert "Accept-Encoding" in res.headers["vary"]
+        res = await ac.get("/big", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in res.headers
+        res = await ac.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in res.headers
+        res = await ac.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in res.headers
+        assert res.text.count("data: x") == 100
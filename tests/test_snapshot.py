@@ -0,0 +1,69 @@
+import sys
+import os
+import csv
+import gzip
+import json
+import pytest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.database import snapshot
+from backend.database.models import Company, DatabaseManager, Event, Lead
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "SETTLE_SECONDS", 0)
+    db = DatabaseManager(str(tmp_path / "snapshot.db"))
+    event_id = db.create_event(Event(name="Sign Expo"))
+    for i, score in enumerate([0.9, 0.4]):
+        company_id = db.create_company(Company(name=f"Snap {i}", technologies=["Vinyl"], qualification_score=score))
+        db.create_lead(Lead(event_id=event_id, company_id=company_id, overall_score=score, rationale="Wraps, vans\nand trucks"))
+    with db.get_connection() as conn:
+        conn.execute("UPDATE leads SET updated_at = '2020-01-01 00:00:00'")
+        conn.execute("UPDATE companies SET updated_at = '2020-01-01 00:00:00'")
+        conn.commit()
+    return db
+
+def read_csv(manifest):
+    path = os.path.join(os.path.dirname(manifest["manifest"]), manifest["file"])
+    with gzip.open(path, "rt", newline="") as f:
+        return list(csv.reader(f))
+
+def test_incremental_csv_snapshots(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "SETTLE_SECONDS", 60)
+    full = db.export_snapshot("leads", str(tmp_path / "out"), format="csv", chunk_size=1)
+    rows = read_csv(full)
+    assert rows[0] == [column["name"] for column in full["columns"]] and full["rows"] == len(rows) - 1 == 2
+    assert {row[5] for row in rows[1:]} == {"Snap 0", "Snap 1"} and rows[1][3] == "Sign Expo"
+    assert json.load(open(full["manifest"]))["watermark"] == full["watermark"] and full["since"] is None
+
+    # Rows changed at or after the watermark go into the next snapshot, and only those
+    with db.get_connection() as conn:
+        conn.execute("UPDATE leads SET status = 'contacted', updated_at = ? WHERE id = 1", (full["watermark"],))
+        conn.commit()
+    db.archive_leads(closed_after_days=None, stale_after_days=365)
+    monkeypatch.setattr(snapshot, "SETTLE_SECONDS", 0)
+    delta = db.export_snapshot("leads", str(tmp_path / "out"), since=full["watermark"], format="csv")
+    assert [(row[0], row[7], row[-1]) for row in read_csv(delta)[1:]] == [("1", "contacted", "")]
+    # Archived leads stay in full snapshots
+    rows = read_csv(db.export_snapshot("leads", str(tmp_path / "out"), format="csv"))
+    assert sorted((row[0], bool(row[-1])) for row in rows[1:]) == [("1", False), ("2", True)]
+
+def test_load_snapshot_types(db, tmp_path):
+    manifest = db.export_snapshot("companies", str(tmp_path), format="csv")
+    frame = snapshot.load_snapshot(manifest["manifest"])
+    assert list(frame["name"]) == ["Snap 0", "Snap 1"] and json.loads(frame["technologies"][0]) == ["Vinyl"]
+    assert str(frame["id"].dtype) == "Int64" and str(frame["qualification_score"].dtype) == "float64"
+    assert str(frame["updated_at"].dtype).startswith("datetime64") and str(frame["location"].dtype) == "string"
+
+def test_snapshot_arguments(db, tmp_path):
+    with pytest.raises(ValueError):
+        db.export_snapshot("stakeholders", str(tmp_path))
+    if snapshot.pyarrow is None:
+        assert db.export_snapshot("leads", str(tmp_path))["format"] == "csv"
+        with pytest.raises(ValueError):
+            db.export_snapshot("leads", str(tmp_path), format="parquet")
+    else:
+        manifest = db.export_snapshot("leads", str(tmp_path), format="parquet")
+        assert list(snapshot.load_snapshot(manifest["manifest"])["id"]) == [1, 2]
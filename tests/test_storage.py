@@ -0,0 +1,55 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.api.storage import RecordStore, field_key
+from backend.pipeline.streaming import build_lead_record, make_lead_id
+from backend.scrapers.events_scraper import Event
+
+def test_upsert_replaces_existing_record():
+    store = RecordStore(field_key("id"), preserve=("created_at",))
+    assert store.upsert({"id": "a", "score": 0.7, "created_at": "day 1"})
+    store.append({"id": "b", "score": 0.8})
+    assert not store.upsert({"id": "a", "score": 0.9, "created_at": "day 2"})
+    assert len(store) == 2
+    assert store[0] == {"id": "a", "score": 0.9, "created_at": "day 1"}
+    assert store.get("b")["score"] == 0.8
+    store.clear()
+    assert store == [] and store.get("a") is None
+
+def test_lead_ids_are_stable_across_runs():
+    event = Event(name="Sign Expo", date="", location="", industry="Signage", website="")
+    first = build_lead_record({"name": "Acme  Corp"}, {"score": 0.9}, event)
+    second = build_lead_record({"name": "acme corp"}, {"score": 0.8}, event)
+    assert first["id"] == second["id"] == make_lead_id("Acme Corp", "Sign Expo")
+    assert make_lead_id("Acme Corp", "Wrap Summit") != first["id"]
+    store = RecordStore(field_key("id"))
+    store.extend([first, second])
+    assert store == [second]
+
+def test_encoded_rows_are_cached_until_replaced():
+    import json
+    store = RecordStore(field_key("id"), cache_encoded=True)
+    store.upsert({"id": "a", "score": 0.7})
+    first = store.encoded()
+    assert store.encoded()[0] is first[0]
+    store.upsert({"id": "a", "score": 0.9})
+    assert json.loads(store.encoded()[0]) == {"id": "a", "score": 0.9}
+    # Records that are not the stored ones are encoded but not cached
+    assert json.loads(store.encoded([{"id": "a", "score": 0.1}])[0])["score"] == 0.1
+    assert json.loads(store.encoded()[0])["score"] == 0.9
+
+
+def test_index_breaking_mutators_raise():
+    import pytest
+    store = RecordStore(field_key("id"), cache_encoded=True)
+    store.extend([{"id": "a"}, {"id": "b"}])
+    store += [{"id": "b", "score": 1}, {"id": "c"}]
+    assert [record["id"] for record in store] == ["a", "b", "c"] and store.get("b") == {"id": "b", "score": 1}
+    for mutate in (lambda: store.insert(0, {"id": "d"}), lambda: store.remove(store[0]), store.pop, store.sort,
+                   store.reverse, lambda: store.__delitem__(0), lambda: store.__setitem__(slice(0, 1), []),
+                   lambda: store.__imul__(2)):
+        with pytest.raises(TypeError):
+            mutate()
+    assert [record["id"] for record in store] == ["a", "b", "c"]
+    assert [store.get(key)["id"] for key in "abc"] == ["a", "b", "c"]
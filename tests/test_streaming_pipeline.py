@@ -0,0 +1,53 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from backend.scrapers.events_scraper import Event
+from pipeline_fakes import FakeCompanyScraper, FakeEventsScraper, RecordingSink, make_pipeline
+
+def test_streams_companies_through_all_stages():
+    company_scraper = FakeCompanyScraper()
+    sink = RecordingSink()
+    stats = asyncio.run(make_pipeline(company_scraper, queue_size=2).run(["Signage"], 10, True, sink))
+    assert stats["companies_analyzed"] == 20
+    assert stats["companies_processed"] == 10
+    assert stats["qualified_leads"] == len(sink.leads) == 5
+    assert stats["outreach_generated"] == len(sink.outreach) == 5
+    assert stats["first_lead_seconds"] is not None
+    assert company_scraper.max_active > 1
+    # Multi-event companies keep every event and are qualified with the most relevant one
+    latest = {company["name"]: company for company in sink.companies}
+    assert latest["Company 0"]["source_events"] == ["Wrap Summit", "Sign Expo"]
+    # ...and the sink's latest record has both the merged events and what enrichment found
+    assert latest["Company 0"]["description"] == "enriched"
+    contexts = {lead["company_name"]: lead["event_context"] for lead in sink.leads}
+    assert contexts["Company 0"] == "Wrap Summit"
+    assert contexts["Company 4"] == "Sign Expo"
+
+def test_without_outreach():
+    sink = RecordingSink()
+    stats = asyncio.run(make_pipeline(FakeCompanyScraper()).run(["Signage"], 4, False, sink))
+    assert stats["qualified_leads"] == 2
+    assert sink.outreach == []
+
+def test_name_variants_are_processed_once():
+    class VariantEventsScraper(FakeEventsScraper):
+        def scrape_industry_events(self, industries):
+            return [Event(name="Wrap Summit", date="", location="", industry="Signage", website="",
+                          exhibitors=["Company 0", "Company 2"], relevance_score=0.8),
+                    Event(name="Sign Expo", date="", location="", industry="Signage", website="",
+                          exhibitors=["Company 0 LLC", "Company 2 Corporation"], relevance_score=0.3)]
+
+    pipeline = make_pipeline(FakeCompanyScraper())
+    pipeline.events_scraper = VariantEventsScraper()
+    sink = RecordingSink()
+    stats = asyncio.run(pipeline.run(["Signage"], 10, False, sink))
+    assert stats["companies_analyzed"] == 2
+    assert stats["companies_merged"] == 2
+    latest = {company["name"]: company for company in sink.companies}
+    assert latest["Company 0"]["aliases"] == ["Company 0 LLC"]
+    assert latest["Company 0"]["source_events"] == ["Wrap Summit", "Sign Expo"]
+    # Merges update a copy; the record already handed to the sink/enrichment is unchanged
+    assert "aliases" not in sink.companies[0]
+    assert [lead["event_context"] for lead in sink.leads] == ["Wrap Summit", "Wrap Summit"]
@@ -0,0 +1,125 @@
+import sys
+import os
+import threading
+import time
+import pytest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.database.models import Company, DatabaseManager, Lead
+from backend.database.write_queue import WriteBehindQueue
+from backend.pipeline.persistence import DatabaseSink
+from backend.pipeline.streaming import PipelineSink
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "queue.db"))
+    manager.enable_wal()
+    return manager
+
+@pytest.fixture
+def write_queue(manager):
+    write_queue = WriteBehindQueue(manager, max_batch=64, max_delay=0.05)
+    yield write_queue
+    write_queue.close()
+
+def test_parallel_writes_are_group_committed(manager, write_queue):
+    def produce(worker):
+        futures = [write_queue.create_company(Company(name=f"Company {worker}-{i}")) for i in range(50)]
+        for future in futures:
+            assert future.result(timeout=10) > 0
+    producers = [threading.Thread(target=produce, args=(worker,)) for worker in range(4)]
+    for thread in producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    # Acknowledged writes are committed: visible on another connection
+    assert len(manager.get_companies(limit=1000)) == 200
+    assert write_queue.stats["writes"] == 200 and write_queue.stats["failed"] == 0
+    assert write_queue.stats["batches"] < 200
+
+def test_failed_write_only_fails_its_own_future(manager, write_queue):
+    def fail(conn):
+        conn.execute("INSERT INTO companies (name) VALUES ('Rolled back')")
+        raise ValueError("bad row")
+    before = write_queue.create_company(Company(name="Before"))
+    failed = write_queue.submit(fail)
+    after = write_queue.create_company(Company(name="After"))
+    with pytest.raises(ValueError):
+        failed.result(timeout=10)
+    assert before.result(timeout=10) and after.result(timeout=10)
+    assert sorted(c.name for c in manager.get_companies()) == ["After", "Before"]
+
+def test_close_commits_queued_writes(manager):
+    write_queue = WriteBehindQueue(manager, max_delay=1.0)
+    future = write_queue.create_company(Company(name="Queued"))
+    write_queue.close()
+    assert future.done() and manager.get_company_by_name("Queued") is not None
+    with pytest.raises(RuntimeError):
+        write_queue.create_company(Company(name="Late"))
+
+def test_lead_upsert_by_external_id(manager, write_queue):
+    write_queue.create_company(Company(name="Wrap Co"))
+    first = write_queue.create_lead(Lead(company_name="Wrap Co", overall_score=0.5, external_id="lead_1"))
+    lead_id = first.result(timeout=10)
+    manager.update_lead_status(lead_id, "contacted", "called")
+    write_queue.update_lead_outreach("lead_1", "Subject", "Message")
+    again = write_queue.create_lead(Lead(company_name="Wrap Co", overall_score=0.9, external_id="lead_1"))
+    assert again.result(timeout=10) == lead_id
+    assert write_queue.update_lead_outreach("missing", "s", "m").result(timeout=10) is False
+    [lead] = manager.get_leads()
+    assert (lead.company_name, lead.overall_score, lead.status, lead.notes) == ("Wrap Co", 0.9, "contacted", "called")
+    assert (lead.outreach_subject, lead.outreach_message) == ("Subject", "Message")
+
+def test_database_sink(manager, write_queue):
+    class Recorder(PipelineSink):
+        def __init__(self):
+            self.leads = []
+
+        def on_lead(self, lead):
+            self.leads.append(lead["id"])
+    recorder = Recorder()
+    sink = DatabaseSink(write_queue, recorder)
+    sink.on_company({"name": "Sign Co", "technologies": ["vinyl"], "website": "https://sign.example"})
+    sink.on_lead({"id": "lead_abc", "company_name": "Sign Co", "qualification_score": 0.8,
+                  "qualification_reasons": ["Uses vinyl", "Large fleet"], "status": "new"})
+    sink.on_outreach({"lead_id": "lead_abc", "subject_line": "Hello", "primary_message": "Body"})
+    sink.flush().result(timeout=10)
+    assert recorder.leads == ["lead_abc"]
+    assert manager.get_company_by_name("Sign Co").technologies == ["vinyl"]
+    [lead] = manager.get_leads()
+    assert (lead.external_id, lead.company_name, lead.rationale, lead.outreach_subject) == \
+        ("lead_abc", "Sign Co", "Uses vinyl; Large fleet", "Hello")
+
+
+def test_pipeline_run_persists_enriched_companies_and_rationale(manager, write_queue):
+    import asyncio
+    from pipeline_fakes import FakeCompanyScraper, FakeQualifier, make_pipeline
+
+    class RationaleQualifier(FakeQualifier):
+        def qualify_lead(self, company, event):
+            return dict(super().qualify_lead(company, event), rationale="Strong industry alignment")
+
+    for _ in range(2):  # a rerun keeps what the first run stored
+        pipeline = make_pipeline(FakeCompanyScraper())
+        pipeline.lead_qualifier = RationaleQualifier()
+        sink = DatabaseSink(write_queue)
+        asyncio.run(pipeline.run(["Signage"], 10, False, sink))
+        sink.flush().result(timeout=10)
+    leads = manager.get_leads()
+    assert len(leads) == 5 and {lead.rationale for lead in leads} == {"Strong industry alignment"}
+    assert {result["type"] for result in manager.search("alignment")["results"]} == {"lead"}
+    assert manager.get_company_by_name("Company 0").description == "enriched"
+    assert len(manager.search("enriched", kinds=["companies"], limit=100)["results"]) == 10
+
+
+def test_waits_for_another_connections_write(manager, write_queue):
+    other = manager._connect()
+    other.execute("BEGIN IMMEDIATE")
+    future = write_queue.create_company(Company(name="Waiting Co"))
+    time.sleep(0.2)
+    assert not future.done()
+    other.rollback()
+    other.close()
+    assert future.result(timeout=10) > 0